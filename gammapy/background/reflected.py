@@ -189,29 +189,71 @@ class ReflectedRegionsFinder(object):
             self._angle + Angle("360deg") - self._min_ang - self.min_distance_input
         )
 
-        # Distance image
-        self._distance_image = _compute_distance_image(self.exclusion_mask)
+        # Distance image, only recomputed if the exclusion mask changed
+        if getattr(self, "_distance_mask", None) is not self.exclusion_mask:
+            self._distance_image = _compute_distance_image(self.exclusion_mask)
+            self._distance_mask = self.exclusion_mask
 
     def find_regions(self):
-        """Find reflected regions."""
-        curr_angle = self._angle + self._min_ang + self.min_distance_input
+        """Find reflected regions.
+
+        Regions are placed greedily: starting from the input region, the
+        test angle is increased by the minimal angle between two regions
+        whenever a region can be placed, and by ``angle_increment``
+        otherwise. All test angles that can be reached this way are
+        checked against the exclusion mask in one vectorised lookup.
+        """
+        angle_start = self._angle + self._min_ang + self.min_distance_input
+        angle_range = (self._max_angle - angle_start).rad
+        increment = self.angle_increment.rad
+        min_ang = self._min_ang.rad
+
         reflected_regions = []
-        while curr_angle < self._max_angle:
-            test_pos = self._compute_xy(self._pix_center, self._offset, curr_angle)
-            test_reg = CirclePixelRegion(test_pos, self._pix_region.radius)
-            if not self._is_inside_exclusion(test_reg, self._distance_image):
-                refl_region = test_reg.to_sky(self.exclusion_mask.geom.wcs)
-                log.debug("Placing reflected region\n{}".format(refl_region))
-                reflected_regions.append(refl_region)
-                curr_angle = curr_angle + self._min_ang
-                if self.max_region_number <= len(reflected_regions):
-                    break
-            else:
-                curr_angle = curr_angle + self.angle_increment
+        if angle_range > 0:
+            # Test angle after i increments and j placed regions
+            n_inc = int(np.ceil(angle_range / increment)) + 1
+            n_reg = min(int(np.ceil(angle_range / min_ang)) + 1, self.max_region_number)
+            angles = (
+                angle_start.rad
+                + increment * np.arange(n_inc)[:, np.newaxis]
+                + min_ang * np.arange(n_reg)
+            )
+            is_free = ~self._is_inside_exclusion_array(angles)
+
+            i, j = 0, 0
+            while j < n_reg and i < n_inc and angles[i, j] < self._max_angle.rad:
+                if is_free[i, j]:
+                    test_pos = self._compute_xy(
+                        self._pix_center, self._offset, angles[i, j]
+                    )
+                    test_reg = CirclePixelRegion(test_pos, self._pix_region.radius)
+                    refl_region = test_reg.to_sky(self.exclusion_mask.geom.wcs)
+                    log.debug("Placing reflected region\n{}".format(refl_region))
+                    reflected_regions.append(refl_region)
+                    j += 1
+                else:
+                    i += 1
 
         log.debug("Found {} reflected regions".format(len(reflected_regions)))
         self.reflected_regions = reflected_regions
 
+    def _is_inside_exclusion_array(self, angles):
+        """Test if circles at the given position angles overlap with the exclusion mask.
+
+        Circles with centers outside the exclusion mask image are not excluded.
+        """
+        x = self._pix_center.x + self._offset * np.sin(angles)
+        y = self._pix_center.y + self._offset * np.cos(angles)
+        ix, iy = np.round(x).astype(int), np.round(y).astype(int)
+
+        data = self._distance_image.data
+        ny, nx = data.shape
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+
+        excluded = np.zeros(angles.shape, dtype=bool)
+        excluded[inside] = data[iy[inside], ix[inside]] < self._pix_region.radius
+        return excluded
+
     def plot(self, fig=None, ax=None):
         """Standard debug plot.
 
@@ -240,20 +282,6 @@ class ReflectedRegionsFinder(object):
 
         return fig, ax
 
-    @staticmethod
-    def _is_inside_exclusion(pixreg, distance_image):
-        """Test if a `~regions.PixRegion` overlaps with an exclusion mask.
-
-        If the regions is outside the exclusion mask, return 'False'
-        """
-        x, y = pixreg.center.x, pixreg.center.y
-        try:
-            val = distance_image.data[np.round(y).astype(int), np.round(x).astype(int)]
-        except IndexError:
-            return False
-        else:
-            return val < pixreg.radius
-
     @staticmethod
     def _compute_xy(pix_center, offset, angle):
         """Compute x, y position for a given position angle and offset.
@@ -316,8 +344,13 @@ class ReflectedRegionsBackgroundEstimator(object):
         self.finder.center = obs.pointing_radec
         self.finder.run()
         off_region = self.finder.reflected_regions
-        off_events = obs.events.select_circular_region(off_region)
-        on_events = obs.events.select_circular_region(self.on_region)
+
+        # Classify the events in the ON and all OFF regions in one pass
+        events = obs.events
+        index = events.circular_region_indices([self.on_region] + off_region)
+        on_events = events.select_row_subset(index[0])
+        off_index = np.unique(np.concatenate([[]] + index[1:])).astype(int)
+        off_events = events.select_row_subset(off_index)
         a_on = 1
         a_off = len(off_region)
         return BackgroundEstimate(
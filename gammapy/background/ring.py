@@ -5,7 +5,7 @@ from itertools import product
 import numpy as np
 from astropy.convolution import Ring2DKernel, Tophat2DKernel
 from astropy.coordinates import Angle
-from ..image.utils import scale_cube
+from ..utils.cache import LRUCache
 
 __all__ = ["AdaptiveRingBackgroundEstimator", "RingBackgroundEstimator"]
 
@@ -59,6 +59,13 @@ class AdaptiveRingBackgroundEstimator(object):
     See Also
     --------
     RingBackgroundEstimator, gammapy.detect.KernelBackgroundEstimator
+
+    Notes
+    -----
+    The Fourier transforms of the ring kernels and of the tophat kernel are
+    cached per map shape, pixel scale and ring parameters, so that they are
+    computed only once when the estimator is run on many maps with the same
+    geometry. Each input map is convolved with all ring kernels at once.
     """
 
     def __init__(
@@ -86,6 +93,7 @@ class AdaptiveRingBackgroundEstimator(object):
             "theta": Angle(theta),
             "method": method,
         }
+        self._kernel_fft_cache = LRUCache(maxsize=4)
 
     @property
     def parameters(self):
@@ -130,6 +138,70 @@ class AdaptiveRingBackgroundEstimator(object):
 
         return kernels
 
+    def _tophat(self, image):
+        """Tophat kernel of radius theta."""
+        scale = image.geom.pixel_scales[0].to("deg")
+        theta = self.parameters["theta"] * scale
+
+        tophat = Tophat2DKernel(theta.value)
+        tophat.normalize("peak")
+        return tophat
+
+    def _kernel_ffts(self, image):
+        """Fourier transforms of the ring kernels and the tophat kernel.
+
+        Cached per map shape, pixel scale and parameters.
+        """
+        p = self.parameters
+        names = ["r_in", "r_out_max", "width", "stepsize", "theta"]
+        scale = float(np.round(image.geom.pixel_scales[0].to("deg").value, 10))
+        key = (image.data.shape, scale, p["method"])
+        key += tuple(float(p[_].to("deg").value) for _ in names)
+        return self._kernel_fft_cache.get_or_compute(
+            key, lambda: self._compute_kernel_ffts(image)
+        )
+
+    def _compute_kernel_ffts(self, image):
+        from scipy.fftpack import next_fast_len
+
+        arrays = [kernel.array for kernel in self.kernels(image)]
+        arrays.append(self._tophat(image).array)
+
+        # Pad all kernels to the same shape, keeping the kernel centers
+        kshape = tuple(max(_.shape[axis] for _ in arrays) for axis in [0, 1])
+        stack = np.zeros((len(arrays),) + kshape)
+        for array, padded in zip(arrays, stack):
+            start = [(k - 1) // 2 - (n - 1) // 2 for k, n in zip(kshape, array.shape)]
+            padded[
+                start[0] : start[0] + array.shape[0],
+                start[1] : start[1] + array.shape[1],
+            ] = array
+
+        fshape = tuple(
+            next_fast_len(n + k - 1) for n, k in zip(image.data.shape, kshape)
+        )
+        ffts = np.fft.rfftn(stack, fshape, axes=(-2, -1))
+        return {
+            "kshape": kshape,
+            "fshape": fshape,
+            "rings": ffts[:-1],
+            "tophat": ffts[-1:],
+        }
+
+    @staticmethod
+    def _convolve(data, kernel_ffts, ffts):
+        """Convolve image with all kernels at once.
+
+        Same as `scipy.signal.fftconvolve` with ``mode="same"`` for every
+        kernel, the result has shape ``(n_kernels,) + data.shape``.
+        """
+        fshape = ffts["fshape"]
+        data_fft = np.fft.rfftn(data, fshape)
+        conv = np.fft.irfftn(data_fft * kernel_ffts, fshape, axes=(-2, -1))
+        start = [(k - 1) // 2 for k in ffts["kshape"]]
+        ny, nx = data.shape
+        return conv[:, start[0] : start[0] + ny, start[1] : start[1] + nx]
+
     @staticmethod
     def _alpha_approx_cube(cubes):
         """Compute alpha as on_exposure / off_exposure.
@@ -138,68 +210,53 @@ class AdaptiveRingBackgroundEstimator(object):
         """
         exposure_on = cubes["exposure_on"]
         exposure_off = cubes["exposure_off"]
-        alpha_approx = np.where(exposure_off > 0, exposure_on / exposure_off, np.inf)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha_approx = np.where(
+                exposure_off > 0, exposure_on / exposure_off, np.inf
+            )
         return alpha_approx
 
-    @staticmethod
-    def _exposure_off_cube(exposure_on, exclusion, kernels):
+    def _exposure_off_cube(self, exposure_on, exclusion, ffts):
         """Compute off exposure cube.
 
-        The on exposure is convolved with different
-        ring kernels and stacking the data along the third dimension.
+        The on exposure is convolved with the different ring kernels,
+        stacked along the first dimension.
         """
-        exposure = exposure_on.data
-        exclusion = exclusion.data
-        return scale_cube(exposure * exclusion, kernels)
+        data = exposure_on.data * exclusion.data
+        return self._convolve(data, ffts["rings"], ffts)
 
-    def _exposure_on_cube(self, exposure_on, kernels):
+    def _exposure_on_cube(self, exposure_on, ffts):
         """Compute on exposure cube.
 
-        Calculated by convolving the on exposure with a tophat
-        of radius theta, and stacking all images along the third dimension.
+        Calculated by convolving the on exposure with a tophat of radius
+        theta. The cube has length one along the first dimension, it is the
+        same for all ring kernels.
         """
-        scale = exposure_on.geom.pixel_scales[0].to("deg")
-        theta = self.parameters["theta"] * scale
-
-        tophat = Tophat2DKernel(theta.value)
-        tophat.normalize("peak")
-        exposure_on = exposure_on.convolve(tophat.array)
-        exposure_on_cube = np.repeat(
-            exposure_on.data[:, :, np.newaxis], len(kernels), axis=2
-        )
-        return exposure_on_cube
+        return self._convolve(exposure_on.data, ffts["tophat"], ffts)
 
-    @staticmethod
-    def _off_cube(counts, exclusion, kernels):
+    def _off_cube(self, counts, exclusion, ffts):
         """Compute off cube.
 
-        Calculated by convolving the raw counts with different ring kernels
-        and stacking the data along the third dimension.
+        Calculated by convolving the raw counts with the different ring
+        kernels, stacked along the first dimension.
         """
-        return scale_cube(counts.data * exclusion.data, kernels)
+        return self._convolve(counts.data * exclusion.data, ffts["rings"], ffts)
 
     def _reduce_cubes(self, cubes):
         """Compute off and off exposure map.
 
-        Calulated by reducing the cubes. The data is
-        iterated along the third axis (i.e. increasing ring sizes), the value
-        with the first approximate alpha < threshold is taken.
+        For each pixel the first ring (i.e. the smallest ring size along the
+        first axis) with approximate alpha < threshold is taken.
         """
         threshold = self._parameters["threshold_alpha"]
 
-        alpha_approx_cube = cubes["alpha_approx"]
-        off_cube = cubes["off"]
-        exposure_off_cube = cubes["exposure_off"]
-
-        shape = alpha_approx_cube.shape[:2]
-        off = np.tile(np.nan, shape)
-        exposure_off = np.tile(np.nan, shape)
-
-        for idx in np.arange(alpha_approx_cube.shape[-1]):
-            mask = (alpha_approx_cube[:, :, idx] <= threshold) & np.isnan(off)
-            off[mask] = off_cube[:, :, idx][mask]
-            exposure_off[mask] = exposure_off_cube[:, :, idx][mask]
+        mask = cubes["alpha_approx"] <= threshold
+        idx = np.argmax(mask, axis=0)
+        has_ring = mask.any(axis=0)
+        iy, ix = np.indices(idx.shape)
 
+        off = np.where(has_ring, cubes["off"][idx, iy, ix], np.nan)
+        exposure_off = np.where(has_ring, cubes["exposure_off"][idx, iy, ix], np.nan)
         return exposure_off, off
 
     def run(self, images):
@@ -221,11 +278,11 @@ class AdaptiveRingBackgroundEstimator(object):
         if not counts.geom.is_image:
             raise ValueError("Only 2D maps are supported")
 
-        kernels = self.kernels(counts)
+        ffts = self._kernel_ffts(counts)
         cubes = {
-            "exposure_on": self._exposure_on_cube(exposure_on, kernels),
-            "exposure_off": self._exposure_off_cube(exposure_on, exclusion, kernels),
-            "off": self._off_cube(counts, exclusion, kernels),
+            "exposure_on": self._exposure_on_cube(exposure_on, ffts),
+            "exposure_off": self._exposure_off_cube(exposure_on, exclusion, ffts),
+            "off": self._off_cube(counts, exclusion, ffts),
         }
         cubes["alpha_approx"] = self._alpha_approx_cube(cubes)
 
@@ -110,3 +110,29 @@ class TestReflectedRegionBackgroundEstimator:
             self.bg_maker.plot()
             self.bg_maker.plot(idx=1)
             self.bg_maker.plot(idx=[0, 1])
+
+
+@requires_dependency("scipy")
+def test_reflected_regions_finder_distance_image_cache(mask, on_region):
+    finder = ReflectedRegionsFinder(
+        center=SkyCoord(83.2, 22.5, unit="deg"),
+        region=on_region,
+        exclusion_mask=mask,
+        min_distance_input=Angle("0 deg"),
+    )
+    finder.run()
+    distance_image = finder._distance_image
+    assert len(finder.reflected_regions) == 15
+
+    finder.center = SkyCoord(83.9, 22.4, unit="deg")
+    finder.run()
+    assert finder._distance_image is distance_image
+
+    geom = mask.geom
+    for region in finder.reflected_regions:
+        region_mask = geom.region_mask([region])
+        assert mask.data[region_mask].all()
+
+    finder.exclusion_mask = mask.copy()
+    finder.run()
+    assert finder._distance_image is not distance_image
@@ -97,3 +97,22 @@ class TestAdaptiveRingBackgroundEstimator:
         assert_allclose(result["alpha"].data[0, 0], 0.008928571428571418)
         assert_allclose(result["exposure_off"].data[0, 0], 112 * 1e10)
         assert_allclose(result["off"].data[0, 0], 112)
+
+    def test_kernel_fft_cache(self):
+        ring = AdaptiveRingBackgroundEstimator(
+            r_in=0.22 * u.deg, r_out_max=0.8 * u.deg, width=0.1 * u.deg
+        )
+        result = ring.run(self.images)
+        assert len(ring._kernel_fft_cache) == 1
+
+        images = dict(self.images)
+        images["counts"] = self.images["counts"].copy(
+            data=2 * self.images["counts"].data
+        )
+        result_2 = ring.run(images)
+        assert len(ring._kernel_fft_cache) == 1
+        assert_allclose(result_2["off"].data, 2 * result["off"].data)
+
+        ring.parameters["width"] = 0.2 * u.deg
+        ring.run(self.images)
+        assert len(ring._kernel_fft_cache) == 2
@@ -248,9 +248,7 @@ class MapEvaluator(object):
 
     def apply_edisp(self, data):
         """Convolve map data with energy dispersion."""
-        data = np.rollaxis(data, 0, 3)
-        data = np.dot(data, self.edisp.pdf_matrix)
-        return np.rollaxis(data, 2, 0)
+        return self.edisp.apply(data).value
 
     def compute_npred(self):
         """Evaluate model predicted counts.
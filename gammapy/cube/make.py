@@ -24,9 +24,11 @@ class MapMaker(object):
         Maximum offset angle
     exclusion_mask : `~gammapy.maps.Map`
         Exclusion mask
+    irf_cache : `~gammapy.irf.IRFReductionCache`, optional
+        Cache used to load IRFs shared between observations only once.
     """
 
-    def __init__(self, geom, offset_max, exclusion_mask=None):
+    def __init__(self, geom, offset_max, exclusion_mask=None, irf_cache=None):
         if not isinstance(geom, WcsGeom):
             raise ValueError("MapMaker only works with WcsGeom")
 
@@ -35,6 +37,7 @@ class MapMaker(object):
 
         self.geom = geom
         self.offset_max = Angle(offset_max)
+        self.irf_cache = irf_cache
         self.maps = {}
 
         # Some background estimation methods need an exclusion mask.
@@ -103,6 +106,7 @@ class MapMaker(object):
             geom=cutout_map.geom,
             fov_mask=fov_mask,
             exclusion_mask=exclusion_mask,
+            irf_cache=self.irf_cache,
         ).run(selection)
 
         # Stack observation maps to total
@@ -150,13 +154,16 @@ class MapMakerObs(object):
         Mask to select pixels in field of view
     exclusion_mask : `~gammapy.maps.Map`
         Exclusion mask (used by some background estimators)
+    irf_cache : `~gammapy.irf.IRFReductionCache`, optional
+        Cache used to load IRFs shared between observations only once.
     """
 
-    def __init__(self, obs, geom, fov_mask=None, exclusion_mask=None):
+    def __init__(self, obs, geom, fov_mask=None, exclusion_mask=None, irf_cache=None):
         self.obs = obs
         self.geom = geom
         self.fov_mask = fov_mask
         self.exclusion_mask = exclusion_mask
+        self.irf_cache = irf_cache
         self.maps = {}
 
     def run(self, selection=None):
@@ -178,6 +185,11 @@ class MapMakerObs(object):
 
         return self.maps
 
+    def _load_irf(self, hdu_type):
+        if self.irf_cache is None:
+            return getattr(self.obs, hdu_type)
+        return self.irf_cache.load(self.obs, hdu_type)
+
     def _make_counts(self):
         counts = Map.from_geom(self.geom)
         fill_map_counts(counts, self.obs.events)
@@ -189,7 +201,7 @@ class MapMakerObs(object):
         exposure = make_map_exposure_true_energy(
             pointing=self.obs.pointing_radec,
             livetime=self.obs.observation_live_time_duration,
-            aeff=self.obs.aeff,
+            aeff=self._load_irf("aeff"),
             geom=self.geom,
         )
         if self.fov_mask is not None:
@@ -200,7 +212,7 @@ class MapMakerObs(object):
         background = make_map_background_irf(
             pointing=self.obs.pointing_radec,
             livetime=self.obs.observation_live_time_duration,
-            bkg=self.obs.bkg,
+            bkg=self._load_irf("bkg"),
             geom=self.geom,
         )
         if self.fov_mask is not None:
@@ -19,6 +19,12 @@ __all__ = ["EventListBase", "EventList", "EventListLAT"]
 log = logging.getLogger(__name__)
 
 
+def _lonlat_to_unit_vector(lon, lat):
+    """Cartesian unit vectors with shape ``(3,) + lon.shape``."""
+    cos_lat = np.cos(lat)
+    return np.array([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
 class EventListBase(object):
     """Event list.
 
@@ -356,13 +362,43 @@ class EventListBase(object):
         index_array : `numpy.ndarray`
             Index array of selected events
         """
-        position = self.radec
-        mask = np.array([], dtype=int)
-        for reg in region:
-            separation = reg.center.separation(position)
-            temp = np.where(separation < reg.radius)[0]
-            mask = np.union1d(mask, temp)
-        return mask
+        index = self.circular_region_indices(region)
+        if not index:
+            return np.array([], dtype=int)
+        return np.unique(np.concatenate(index))
+
+    def circular_region_indices(self, regions):
+        """Indices of the events contained in each of the given circular regions.
+
+        All regions are tested in one pass: the event positions are converted
+        to unit vectors once, and compared to the unit vectors of all region
+        centers with one matrix product. The event table isn't copied.
+
+        Parameters
+        ----------
+        regions : list of `~regions.CircleSkyRegion`
+            List of sky regions
+
+        Returns
+        -------
+        index : list of `numpy.ndarray`
+            Index arrays of the events in each region.
+        """
+        if len(regions) == 0:
+            return []
+
+        lon = np.radians(np.asarray(self.table["RA"], dtype=float))
+        lat = np.radians(np.asarray(self.table["DEC"], dtype=float))
+        events = _lonlat_to_unit_vector(lon, lat)
+
+        centers = SkyCoord([reg.center.icrs for reg in regions])
+        centers = _lonlat_to_unit_vector(centers.ra.rad, centers.dec.rad)
+        radius = Angle([reg.radius for reg in regions])
+
+        # cosine of the separation between region centers and events
+        cos_separation = np.dot(centers.T, events)
+        inside = cos_separation > np.cos(radius.rad)[:, np.newaxis]
+        return [np.nonzero(_)[0] for _ in inside]
 
     def plot_energy_hist(self, ax=None, ebounds=None, **kwargs):
         """Plot counts as a function of energy."""
@@ -492,27 +492,20 @@ class ObservationList(UserList):
         stacked_edisp : `~gammapy.irf.EnergyDispersion`
             Stacked EDISP for a set of observation
         """
-        list_aeff = []
-        list_edisp = []
-        list_livetime = []
-        list_low_threshold = [low_reco_threshold] * len(self)
-        list_high_threshold = [high_reco_threshold] * len(self)
+        irf_stack = IRFStacker()
 
         for obs in self:
             offset = position.separation(obs.pointing_radec)
-            list_aeff.append(obs.aeff.to_effective_area_table(offset, energy=e_true))
-            list_edisp.append(
-                obs.edisp.to_energy_dispersion(offset, e_reco=e_reco, e_true=e_true)
+            aeff = obs.aeff.to_effective_area_table(offset, energy=e_true)
+            edisp = obs.edisp.to_energy_dispersion(offset, e_reco=e_reco, e_true=e_true)
+            irf_stack.add(
+                aeff,
+                obs.observation_live_time_duration,
+                edisp,
+                low_reco_threshold,
+                high_reco_threshold,
             )
-            list_livetime.append(obs.observation_live_time_duration)
-
-        irf_stack = IRFStacker(
-            list_aeff=list_aeff,
-            list_edisp=list_edisp,
-            list_livetime=list_livetime,
-            list_low_threshold=list_low_threshold,
-            list_high_threshold=list_high_threshold,
-        )
+
         irf_stack.stack_edisp()
 
         return irf_stack.stacked_edisp
@@ -1,6 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
-from numpy.testing import assert_allclose
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from astropy.table import Table
+from astropy.coordinates import SkyCoord, Angle
+from regions import CircleSkyRegion
 from ...utils.testing import requires_dependency, requires_data, mpl_plot_check
 from ...data.event_list import EventList, EventListLAT
 
@@ -78,3 +82,27 @@ class TestEventListChecker:
     def test_check_all(self):
         records = list(self.event_list.check())
         assert len(records) == 3
+
+
+def test_event_list_circular_region_indices():
+    rng = np.random.RandomState(0)
+    table = Table()
+    table["RA"] = rng.uniform(82, 85, 10000)
+    table["DEC"] = rng.uniform(20, 23, 10000)
+    events = EventList(table)
+
+    regions = [
+        CircleSkyRegion(SkyCoord(83.6, 22.0, unit="deg"), Angle(0.3, "deg")),
+        CircleSkyRegion(SkyCoord(83.0, 21.0, unit="deg"), Angle(0.2, "deg")),
+        CircleSkyRegion(SkyCoord(83.6, 22.0, unit="deg").galactic, Angle(0.5, "deg")),
+    ]
+    index = events.circular_region_indices(regions)
+
+    assert len(index) == 3
+    for idx, region in zip(index, regions):
+        separation = region.center.separation(events.radec)
+        assert_equal(idx, np.where(separation < region.radius)[0])
+
+    mask = events.filter_circular_region(regions[:2])
+    assert_equal(mask, np.union1d(index[0], index[1]))
+    assert len(events.filter_circular_region([])) == 0
@@ -5,7 +5,11 @@ import logging
 import numpy as np
 from ..stats import significance, significance_on_off
 
-__all__ = ["compute_lima_image", "compute_lima_on_off_image"]
+__all__ = [
+    "compute_lima_image",
+    "compute_lima_on_off_image",
+    "RingSignificanceAccumulator",
+]
 
 log = logging.getLogger(__name__)
 
@@ -98,3 +102,254 @@ def compute_lima_on_off_image(n_on, n_off, a_on, a_off, kernel):
         "excess": n_on.copy(data=excess_conv),
         "alpha": n_on.copy(data=alpha_conv),
     }
+
+
+class RingSignificanceAccumulator(object):
+    """Incrementally updated ring background and Li & Ma significance images.
+
+    Accumulates counts and exposure, e.g. per event batch during an
+    observation, and keeps the ring background (see
+    `~gammapy.background.RingBackgroundEstimator`) and Li & Ma on-off
+    significance (see `compute_lima_on_off_image`) images up to date.
+
+    The convolved ON and OFF sums are linear in counts and exposure, so only
+    the contribution of the added data is convolved, tile by tile, and only
+    for tiles where the data changed. If more than ``max_tile_fraction`` of
+    the tiles changed, e.g. for exposure added over the whole field of view,
+    the added image is convolved at once instead. The derived images (alpha, background,
+    excess, significance) are re-evaluated on access, and only for pixels
+    that the changed tiles contribute to.
+
+    Pixels outside the map are treated as zero, the result corresponds to
+    ``RingBackgroundEstimator(..., use_fft_convolution=True)`` applied to the
+    accumulated images, followed by `compute_lima_on_off_image`.
+
+    Parameters
+    ----------
+    exclusion : `~gammapy.maps.WcsNDMap`
+        Exclusion mask image, defines the geometry
+    ring : `~gammapy.background.RingBackgroundEstimator`
+        Ring background estimator defining the ring kernel
+    kernel : `astropy.convolution.Kernel2D`
+        Convolution kernel for the ON region
+    tile_size : int
+        Size of the tiles in pixels
+    max_tile_fraction : float
+        Maximum fraction of changed tiles that are convolved one by one
+
+    Examples
+    --------
+    ::
+
+        from astropy.convolution import Tophat2DKernel
+        from gammapy.background import RingBackgroundEstimator
+        from gammapy.detect import RingSignificanceAccumulator
+
+        accumulator = RingSignificanceAccumulator(
+            exclusion=exclusion,
+            ring=RingBackgroundEstimator(r_in="0.5 deg", width="0.3 deg"),
+            kernel=Tophat2DKernel(5),
+        )
+        for events, exposure in batches:
+            accumulator.add(events=events, exposure=exposure)
+            accumulator.images["significance"].plot()
+    """
+
+    def __init__(self, exclusion, ring, kernel, tile_size=64, max_tile_fraction=0.2):
+        if not exclusion.geom.is_image:
+            raise ValueError("Only 2D maps are supported")
+
+        self.exclusion = exclusion
+        self.tile_size = tile_size
+        self.max_tile_fraction = max_tile_fraction
+
+        # Kernel is modified later make a copy here
+        kernel = deepcopy(kernel)
+        kernel.normalize("peak")
+        self._kernel = kernel.array
+        self._ring = ring.kernel(exclusion).array
+
+        shape = exclusion.data.shape
+        names = ["counts", "exposure_on", "off", "exposure_off", "n_on", "a_on"]
+        self._sums = {name: np.zeros(shape) for name in names}
+
+        names = ["off", "exposure_off", "alpha", "background", "excess"]
+        names += ["significance"]
+        self._derived = {name: np.zeros(shape) for name in names}
+        self._changed = np.ones(shape, dtype=bool)
+        self._ffts = None
+
+    def add(self, events=None, counts=None, exposure=None):
+        """Add events, counts or exposure.
+
+        Parameters
+        ----------
+        events : `~gammapy.data.EventList`, optional
+            Events, filled into a counts image with
+            `~gammapy.cube.fill_map_counts`
+        counts : `~gammapy.maps.WcsNDMap`, optional
+            Counts image
+        exposure : `~gammapy.maps.WcsNDMap`, optional
+            Exposure image
+        """
+        from ..cube import fill_map_counts
+
+        if events is not None:
+            counts_events = self.exclusion.copy(
+                data=np.zeros(self.exclusion.data.shape)
+            )
+            fill_map_counts(counts_events, events)
+            self.add(counts=counts_events)
+
+        exclusion = self.exclusion.data.astype(float)
+        if counts is not None:
+            self._add("counts", counts.data, "n_on", "off", exclusion)
+        if exposure is not None:
+            self._add("exposure_on", exposure.data, "a_on", "exposure_off", exclusion)
+
+    def _add(self, name, data, name_on, name_off, exclusion):
+        from scipy.signal import fftconvolve
+
+        self._sums[name] += data
+        ny, nx = data.shape
+        size = self.tile_size
+
+        tiles = []
+        for iy in range(0, ny, size):
+            for ix in range(0, nx, size):
+                tile = (slice(iy, iy + size), slice(ix, ix + size))
+                if data[tile].any():
+                    tiles.append(tile)
+
+        # Convolving many tiles one by one is slower than one convolution
+        # of the whole image
+        n_tiles = -(-ny // size) * -(-nx // size)
+        if len(tiles) > self.max_tile_fraction * n_tiles:
+            conv = self._convolve_image(np.stack([data, data * exclusion]))
+            for conv_, kernel, name_conv in zip(
+                conv, [self._kernel, self._ring], [name_on, name_off]
+            ):
+                scale = np.abs(data).sum() * np.abs(kernel).max()
+                conv_[np.abs(conv_) < 1e-12 * scale] = 0
+                self._sums[name_conv] += conv_
+            self._changed[...] = True
+            return
+
+        for tile in tiles:
+            block = data[tile]
+            for kernel, name_conv, weight in [
+                (self._kernel, name_on, 1),
+                (self._ring, name_off, exclusion[tile]),
+            ]:
+                conv = fftconvolve(block * weight, kernel, mode="full")
+                # Remove round-off errors of the FFT, so that pixels not
+                # reached by the kernel stay zero
+                scale = np.abs(block).sum() * np.abs(kernel).max()
+                conv[np.abs(conv) < 1e-12 * scale] = 0
+
+                window = self._window(data.shape, tile, kernel.shape)
+                conv_window = tuple(
+                    slice(w.start - t.start + (k - 1) // 2, None)
+                    for w, t, k in zip(window, tile, kernel.shape)
+                )
+                conv = conv[conv_window]
+                shape = tuple(w.stop - w.start for w in window)
+                self._sums[name_conv][window] += conv[: shape[0], : shape[1]]
+                self._changed[window] = True
+
+    def _kernel_ffts(self):
+        """Fourier transforms of the ON and ring kernels for whole images.
+
+        Computed on first use, the geometry doesn't change.
+        """
+        if self._ffts is not None:
+            return self._ffts
+
+        from scipy.fftpack import next_fast_len
+
+        arrays = [self._kernel, self._ring]
+
+        # Pad the kernels to the same shape, keeping the kernel centers
+        kshape = tuple(max(_.shape[axis] for _ in arrays) for axis in [0, 1])
+        stack = np.zeros((len(arrays),) + kshape)
+        for array, padded in zip(arrays, stack):
+            start = [(k - 1) // 2 - (n - 1) // 2 for k, n in zip(kshape, array.shape)]
+            padded[
+                start[0] : start[0] + array.shape[0],
+                start[1] : start[1] + array.shape[1],
+            ] = array
+
+        shape = self.exclusion.data.shape
+        fshape = tuple(next_fast_len(n + k - 1) for n, k in zip(shape, kshape))
+        ffts = np.fft.rfftn(stack, fshape, axes=(-2, -1))
+        self._ffts = {"kshape": kshape, "fshape": fshape, "ffts": ffts}
+        return self._ffts
+
+    def _convolve_image(self, data):
+        """Convolve two images with the ON and the ring kernel.
+
+        Same as `scipy.signal.fftconvolve` with ``mode="same"``, ``data``
+        has shape ``(2, ny, nx)``.
+        """
+        ffts = self._kernel_ffts()
+        fshape = ffts["fshape"]
+        data_fft = np.fft.rfftn(data, fshape, axes=(-2, -1))
+        conv = np.fft.irfftn(data_fft * ffts["ffts"], fshape, axes=(-2, -1))
+        start = [(k - 1) // 2 for k in ffts["kshape"]]
+        ny, nx = data.shape[1:]
+        return conv[:, start[0] : start[0] + ny, start[1] : start[1] + nx]
+
+    @staticmethod
+    def _window(shape, tile, kernel_shape):
+        """Pixels a tile contributes to when convolved with a kernel."""
+        window = []
+        for n, t, k in zip(shape, tile, kernel_shape):
+            start = max(t.start - (k - 1) // 2, 0)
+            stop = min(min(t.stop, n) + k // 2, n)
+            window.append(slice(start, stop))
+        return tuple(window)
+
+    def _update(self):
+        """Re-evaluate the derived images where the sums changed."""
+        changed = self._changed
+        if not changed.any():
+            return
+
+        sums = {name: data[changed] for name, data in self._sums.items()}
+        off, exposure_off = sums["off"], sums["exposure_off"]
+
+        # Same as `~gammapy.background.RingBackgroundEstimator`
+        not_has_off_exposure = ~(exposure_off > 0)
+        exposure_off[not_has_off_exposure] = np.nan
+        not_has_exposure = ~(sums["exposure_on"] > 0)
+        off[not_has_exposure] = 0
+        exposure_off[not_has_exposure] = 0
+
+        # Same as `compute_lima_on_off_image`
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha = sums["a_on"] / exposure_off
+            significance = significance_on_off(sums["n_on"], off, alpha, method="lima")
+            background = alpha * off
+
+        self._derived["off"][changed] = off
+        self._derived["exposure_off"][changed] = exposure_off
+        self._derived["alpha"][changed] = alpha
+        self._derived["background"][changed] = background
+        self._derived["excess"][changed] = sums["n_on"] - background
+        self._derived["significance"][changed] = significance
+        self._changed[...] = False
+
+    @property
+    def images(self):
+        """Current images (dict of `~gammapy.maps.WcsNDMap`).
+
+        Keys are: counts, exposure_on, off, exposure_off, n_on, alpha,
+        background, excess and significance.
+        """
+        self._update()
+        names = ["counts", "exposure_on", "n_on"]
+        images = {name: self._sums[name] for name in names}
+        images.update(self._derived)
+        return {
+            name: self.exclusion.copy(data=data.copy()) for name, data in images.items()
+        }
@@ -1,10 +1,17 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
 from numpy.testing.utils import assert_allclose
+import astropy.units as u
 from astropy.convolution import Tophat2DKernel
 from ...utils.testing import requires_dependency, requires_data
-from ...detect import compute_lima_image, compute_lima_on_off_image
-from ...maps import Map
+from ...background import RingBackgroundEstimator
+from ...detect import (
+    compute_lima_image,
+    compute_lima_on_off_image,
+    RingSignificanceAccumulator,
+)
+from ...maps import Map, WcsNDMap
 
 
 @requires_dependency("scipy")
@@ -55,3 +62,90 @@ def test_compute_lima_on_off_image():
 
     # Set boundary to NaN in reference image
     assert_allclose(actual, desired, atol=1e-5)
+
+
+@requires_dependency("scipy")
+def test_ring_significance_accumulator():
+    random_state = np.random.RandomState(0)
+    geom = WcsNDMap.create(binsz=0.05, npix=101, dtype=float).geom
+    in_fov = geom.get_coord().skycoord.separation(geom.center_skydir) < 2 * u.deg
+    exclusion = WcsNDMap(geom, data=np.ones(geom.data_shape))
+    exclusion.data[45:55, 45:55] = 0
+
+    ring = RingBackgroundEstimator(0.35 * u.deg, 0.3 * u.deg, use_fft_convolution=True)
+    kernel = Tophat2DKernel(3)
+    accumulator = RingSignificanceAccumulator(exclusion, ring, kernel, tile_size=16)
+
+    counts = WcsNDMap(geom, data=np.zeros(geom.data_shape))
+    exposure = WcsNDMap(geom, data=np.zeros(geom.data_shape))
+    for idx in range(3):
+        counts_batch = WcsNDMap(geom, data=random_state.poisson(2 * in_fov) * 1.)
+        exposure_batch = WcsNDMap(geom, data=1e3 * in_fov * (idx < 2))
+        accumulator.add(counts=counts_batch, exposure=exposure_batch)
+        counts.data += counts_batch.data
+        exposure.data += exposure_batch.data
+        images = accumulator.images
+
+    # A batch with counts in a few pixels only
+    significance = images["significance"].data
+    counts_batch = WcsNDMap(geom, data=np.zeros(geom.data_shape))
+    counts_batch.data[48:50, 50] = 10
+    accumulator.add(counts=counts_batch)
+    counts.data += counts_batch.data
+    images = accumulator.images
+
+    result = ring.run(dict(counts=counts, exposure_on=exposure, exclusion=exclusion))
+    desired = compute_lima_on_off_image(
+        counts, result["off"], exposure, result["exposure_off"], kernel
+    )
+
+    assert_allclose(images["counts"].data, counts.data)
+    assert_allclose(images["off"].data, result["off"].data, rtol=1e-10)
+    assert_allclose(images["exposure_off"].data, result["exposure_off"].data)
+    for name in ["n_on", "alpha", "excess", "significance"]:
+        actual = images[name].data[in_fov]
+        assert_allclose(actual, desired[name].data[in_fov], rtol=1e-5, atol=1e-4)
+    assert images["significance"].data[49, 50] > significance[49, 50]
+    assert images["significance"].data[50, 20] == significance[50, 20]
+
+
+@requires_dependency("scipy")
+def test_ring_significance_accumulator_full_fov():
+    random_state = np.random.RandomState(1)
+    geom = WcsNDMap.create(binsz=0.05, npix=101, dtype=float).geom
+    exclusion = WcsNDMap(geom, data=np.ones(geom.data_shape))
+    exclusion.data[45:55, 45:55] = 0
+    ring = RingBackgroundEstimator(0.35 * u.deg, 0.3 * u.deg, use_fft_convolution=True)
+    kernel = Tophat2DKernel(3)
+
+    # Batches with exposure over the whole field of view, convolved at once
+    # or, with max_tile_fraction=1, tile by tile
+    accumulator = RingSignificanceAccumulator(exclusion, ring, kernel, tile_size=16)
+    accumulator_tiles = RingSignificanceAccumulator(
+        exclusion, ring, kernel, tile_size=16, max_tile_fraction=1
+    )
+    counts = WcsNDMap(geom, data=np.zeros(geom.data_shape))
+    exposure = WcsNDMap(geom, data=np.zeros(geom.data_shape))
+    for idx in range(2):
+        counts_batch = WcsNDMap(
+            geom, data=random_state.poisson(2, geom.data_shape) * 1.
+        )
+        exposure_batch = WcsNDMap(geom, data=np.full(geom.data_shape, 1e3))
+        for acc in [accumulator, accumulator_tiles]:
+            acc.add(counts=counts_batch, exposure=exposure_batch)
+        counts.data += counts_batch.data
+        exposure.data += exposure_batch.data
+
+    images = accumulator.images
+    images_tiles = accumulator_tiles.images
+
+    result = ring.run(dict(counts=counts, exposure_on=exposure, exclusion=exclusion))
+    desired = compute_lima_on_off_image(
+        counts, result["off"], exposure, result["exposure_off"], kernel
+    )
+
+    assert_allclose(images["off"].data, result["off"].data, rtol=1e-10)
+    assert_allclose(images["exposure_off"].data, result["exposure_off"].data)
+    for name in ["n_on", "alpha", "excess", "significance"]:
+        assert_allclose(images[name].data, desired[name].data, rtol=1e-5, atol=1e-4)
+        assert_allclose(images[name].data, images_tiles[name].data, atol=1e-6)
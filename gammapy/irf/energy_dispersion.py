@@ -55,6 +55,10 @@ class EnergyDispersion(object):
     """Default Interpolation kwargs for `~NDDataArray`. Fill zeros and do not
     interpolate"""
 
+    SPARSE_DENSITY_MAX = 0.3
+    """Maximum fraction of non-zero entries for which a sparse PDF matrix is
+    used in `~gammapy.irf.EnergyDispersion.apply`"""
+
     def __init__(
         self,
         e_true_lo,
@@ -77,6 +81,7 @@ class EnergyDispersion(object):
         ]
         self.data = NDDataArray(axes=axes, data=data, interp_kwargs=interp_kwargs)
         self.meta = OrderedDict(meta) if meta else OrderedDict()
+        self._sparse_cache = None
 
     def __str__(self):
         ss = self.__class__.__name__
@@ -90,23 +95,39 @@ class EnergyDispersion(object):
         (which typically is model flux or counts in true energy bins)
         with the energy dispersion matrix.
 
+        If the matrix is sparse enough, a sparse representation is used, see
+        `~gammapy.irf.EnergyDispersion.pdf_matrix_sparse`.
+
         Parameters
         ----------
         data : array_like
-            1-dim data array.
+            Data array with true energy along the first axis, e.g. a 1-dim
+            spectrum or a ``(e_true, lat, lon)`` cube.
 
         Returns
         -------
-        convolved_data : array
-            1-dim data array after multiplication with the energy dispersion matrix
+        convolved_data : `~astropy.units.Quantity`
+            Data array after multiplication with the energy dispersion matrix,
+            with reconstructed energy along the first axis.
         """
-        if len(data) != self.e_true.nbins:
+        n_true, n_reco = self.data.data.shape
+        if len(data) != n_true:
             raise ValueError(
                 "Input size {} does not match true energy axis {}".format(
-                    len(data), self.e_true.nbins
+                    len(data), n_true
                 )
             )
-        return np.dot(data, self.data.data)
+        data = Quantity(data, copy=False)
+        values = data.value.reshape(len(data), -1)
+
+        matrix = self.pdf_matrix_sparse
+        if matrix is None:
+            convolved = np.dot(self.pdf_matrix.T, values)
+        else:
+            convolved = matrix.dot(values)
+
+        convolved = convolved.reshape((n_reco,) + data.shape[1:])
+        return Quantity(convolved, data.unit * self.data.data.unit, copy=False)
 
     @property
     def e_reco(self):
@@ -127,6 +148,34 @@ class EnergyDispersion(object):
         """
         return self.data.data.value
 
+    @property
+    def pdf_matrix_sparse(self):
+        """Transposed PDF matrix in sparse format (`~scipy.sparse.csr_matrix`).
+
+        Rows: Reco Energy, Columns: True Energy. ``None`` is returned if more
+        than ``SPARSE_DENSITY_MAX`` of the entries are non-zero, or if scipy
+        is not available.
+
+        The sparse matrix is computed once and reused as long as ``data`` is
+        not replaced by a new array. After modifying ``data.data`` in place,
+        assign it again (``edisp.data.data = edisp.data.data``) to update it.
+        """
+        data = self.data.data
+        if self._sparse_cache is None or self._sparse_cache[0] is not data:
+            self._sparse_cache = (data, self._make_sparse_matrix(data.value))
+        return self._sparse_cache[1]
+
+    def _make_sparse_matrix(self, pdf_matrix):
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError:
+            return None
+
+        if np.count_nonzero(pdf_matrix) > self.SPARSE_DENSITY_MAX * pdf_matrix.size:
+            return None
+
+        return csr_matrix(pdf_matrix.T)
+
     def pdf_in_safe_range(self, lo_threshold, hi_threshold):
         """PDF matrix with bins outside threshold set to 0.
 
@@ -831,12 +880,9 @@ class EnergyDispersion2D(object):
         e_true = EnergyBounds(e_true)
         e_reco = EnergyBounds(e_reco)
 
-        data = []
-        for energy in e_true.log_centers:
-            vec = self.get_response(offset=offset, e_true=energy, e_reco=e_reco)
-            data.append(vec)
-
-        data = np.asarray(data)
+        data = self._get_response(
+            offset=offset, e_true=e_true.log_centers, e_reco=e_reco
+        )
         e_lo, e_hi = e_true[:-1], e_true[1:]
         ereco_lo, ereco_hi = (e_reco[:-1], e_reco[1:])
 
@@ -883,20 +929,42 @@ class EnergyDispersion2D(object):
             # Translate given e_reco binning to migra at bin center
             e_reco = EnergyBounds(e_reco)
 
+        return self._get_response(offset, e_true, e_reco, migra_step)[0]
+
+    def _get_response(self, offset, e_true, e_reco, migra_step=5e-3):
+        """Detector response for an array of true energies.
+
+        Evaluates the migration probability once on the grid of true
+        energies and migration values, and integrates it for all true
+        energies at once.
+
+        Returns
+        -------
+        rv : `~numpy.ndarray`
+            Redistribution matrix with shape ``(len(e_true), len(e_reco) - 1)``
+        """
+        e_true = Energy(e_true).reshape(-1)
+
         # migration value of e_reco bounds
-        migra_e_reco = e_reco / e_true
+        migra_e_reco = (e_reco[np.newaxis, :] / e_true[:, np.newaxis]).to("").value
 
         # Define a vector of migration with mig_step step
         mrec_min = self.data.axis("migra").lo[0]
         mrec_max = self.data.axis("migra").hi[-1]
         mig_array = np.arange(mrec_min, mrec_max, migra_step)
 
-        # Compute energy dispersion probability dP/dm for each element of migration array
-        vals = self.data.evaluate(offset=offset, e_true=e_true, migra=mig_array)
+        # Compute energy dispersion probability dP/dm on the (e_true, migra) grid
+        points = dict(
+            e_true=e_true[:, np.newaxis],
+            migra=Quantity(mig_array[np.newaxis, :], ""),
+            offset=Angle(offset),
+        )
+        vals = self.data.evaluate_at_coord(points).value
 
         # Compute normalized cumulative sum to prepare integration
         with np.errstate(invalid="ignore"):
-            tmp = np.nan_to_num(np.cumsum(vals) / np.sum(vals))
+            tmp = np.cumsum(vals, axis=1) / np.sum(vals, axis=1, keepdims=True)
+            tmp = np.nan_to_num(tmp)
 
         # Determine positions (bin indices) of e_reco bounds in migration array
         pos_mig = np.digitize(migra_e_reco, mig_array) - 1
@@ -905,9 +973,8 @@ class EnergyDispersion2D(object):
 
         # We compute the difference between 2 successive bounds in e_reco
         # to get integral over reco energy bin
-        integral = np.diff(tmp[pos_mig])
-
-        return integral
+        idx_e_true = np.arange(len(e_true))[:, np.newaxis]
+        return np.diff(tmp[idx_e_true, pos_mig], axis=1)
 
     def plot_migration(self, ax=None, offset=None, e_true=None, migra=None, **kwargs):
         """Plot energy dispersion for given offset and true energy.
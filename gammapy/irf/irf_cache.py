@@ -0,0 +1,306 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import Angle
+from ..utils.cache import LRUCache
+from ..utils.energy import EnergyBounds
+from .effective_area import EffectiveAreaTable
+from .energy_dispersion import EnergyDispersion
+
+__all__ = ["IRFReductionCache"]
+
+log = logging.getLogger(__name__)
+
+
+class IRFReductionCache(object):
+    """Cache of IRFs reduced at a given offset.
+
+    Many observations share the same IRF (e.g. one IRF per zenith, azimuth
+    and optical efficiency bin), and the effective area table and energy
+    dispersion matrix extracted for a spectral analysis only depend on the
+    IRF content, the offset and the energy binning. This class caches these
+    reduced IRFs, keyed by a checksum of the IRF HDU content, the offset
+    rounded to a multiple of ``offset_step`` and the energy binning, so that
+    they are computed only once for all observations sharing an IRF.
+
+    The reduced IRFs are always evaluated at the rounded offset, so that the
+    result does not depend on which observation filled the cache.
+
+    Loaded IRF objects are cached as well, keyed by the file name, HDU name
+    and file modification time. The HDU checksums and the recommended energy
+    thresholds of the effective area are read together from the HDU and
+    cached with the same key, so that they are available without loading
+    the IRF.
+
+    Parameters
+    ----------
+    offset_step : `~astropy.coordinates.Angle`
+        Offset quantization step.
+    maxsize : int
+        Maximum number of reduced IRFs held in memory.
+    cache_dir : str or `~gammapy.extern.pathlib.Path`, optional
+        Directory used to persist reduced IRFs across sessions.
+
+    Examples
+    --------
+    ::
+
+        from gammapy.irf import IRFReductionCache
+        from gammapy.spectrum import SpectrumExtraction
+        irf_cache = IRFReductionCache(offset_step="0.01 deg", cache_dir="irf_cache")
+        extraction = SpectrumExtraction(obs_list, bkg_estimate, irf_cache=irf_cache)
+    """
+
+    def __init__(self, offset_step="0.01 deg", maxsize=256, cache_dir=None):
+        self.offset_step = Angle(offset_step)
+        self.reduced = LRUCache(maxsize=maxsize, cache_dir=cache_dir)
+        self.irfs = LRUCache(maxsize=16)
+        self._hdu_info = LRUCache(maxsize=1024)
+
+    def __repr__(self):
+        return "{}(offset_step={!r}, reduced={!r})".format(
+            self.__class__.__name__, self.offset_step, self.reduced
+        )
+
+    def update(self, other):
+        """Add the reduced IRFs and HDU information cached by another cache.
+
+        This is used to collect the reduced IRFs computed on copies of a
+        cache, e.g. in worker processes. Loaded IRF objects are not added.
+
+        Parameters
+        ----------
+        other : `IRFReductionCache`
+            Other cache
+        """
+        self.reduced.update(other.reduced)
+        self._hdu_info.update(other._hdu_info)
+
+    def group_key(self, obs, offset):
+        """Key shared by the observations with the same reduced IRFs.
+
+        Observations with the same key share the reduced IRFs for any energy
+        binning, so they can be processed together, e.g. in one worker
+        process.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        offset : `~astropy.coordinates.Angle`
+            Offset
+
+        Returns
+        -------
+        key : tuple
+            Effective area checksum, energy dispersion checksum and rounded
+            offset in deg
+        """
+        offset = float(self.quantize_offset(offset).to("deg").value)
+        return self.checksum(obs, "aeff"), self.checksum(obs, "edisp"), offset
+
+    def copy(self, group_keys=()):
+        """Copy of the cache for a set of observation groups.
+
+        The copy has the same settings and HDU checksums, but only holds the
+        reduced IRFs of the given groups (see `group_key`) and no loaded
+        IRFs, so that it is cheap to send to a worker process.
+
+        Parameters
+        ----------
+        group_keys : list
+            Keys of the observation groups
+
+        Returns
+        -------
+        cache : `IRFReductionCache`
+            Cache copy
+        """
+        cache = self.__class__(
+            offset_step=self.offset_step,
+            maxsize=self.reduced.maxsize,
+            cache_dir=self.reduced.cache_dir,
+        )
+        cache._hdu_info.update(self._hdu_info)
+
+        prefixes = set()
+        for aeff_checksum, edisp_checksum, offset in group_keys:
+            prefixes.add(("aeff", aeff_checksum, offset))
+            prefixes.add(("edisp", edisp_checksum, offset))
+        entries = [_ for _ in self.reduced.items() if _[0][:3] in prefixes]
+        cache.reduced.update(OrderedDict(entries))
+        return cache
+
+    @staticmethod
+    def _location_key(location):
+        path = location.path(abs_path=True)
+        stat = os.stat(str(path))
+        return str(path), location.hdu_name, stat.st_mtime, stat.st_size
+
+    def load(self, obs, hdu_type):
+        """Load IRF of an observation, reusing IRFs loaded from the same HDU.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        hdu_type : str
+            HDU type, e.g. "aeff" or "edisp"
+
+        Returns
+        -------
+        irf : object
+            IRF object, shared between observations. Don't modify it.
+        """
+        location = obs.location(hdu_type=hdu_type)
+        key = self._location_key(location)
+        return self.irfs.get_or_compute(key, location.load)
+
+    def _info(self, obs, hdu_type):
+        location = obs.location(hdu_type=hdu_type)
+
+        def compute():
+            hdu = location.get_hdu()
+            sha = hashlib.sha1(location.hdu_class.encode("utf-8"))
+            sha.update(repr(hdu.columns).encode("utf-8"))
+            sha.update(np.ascontiguousarray(hdu.data).tobytes())
+            thresholds = hdu.header.get("LO_THRES"), hdu.header.get("HI_THRES")
+            return sha.hexdigest(), thresholds
+
+        return self._hdu_info.get_or_compute(self._location_key(location), compute)
+
+    def checksum(self, obs, hdu_type):
+        """Checksum of the content of an IRF HDU.
+
+        Only the data and the column definitions enter the checksum, so that
+        identical IRFs stored in different files have the same checksum.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        hdu_type : str
+            HDU type, e.g. "aeff" or "edisp"
+
+        Returns
+        -------
+        checksum : str
+            SHA1 hex digest
+        """
+        return self._info(obs, hdu_type)[0]
+
+    def energy_thresholds(self, obs):
+        """Recommended energy thresholds of the effective area of an observation.
+
+        The thresholds are read from the ``LO_THRES`` and ``HI_THRES`` header
+        keywords of the effective area HDU, like
+        `~gammapy.irf.EffectiveAreaTable2D.low_threshold` and
+        `~gammapy.irf.EffectiveAreaTable2D.high_threshold`, but without
+        loading the effective area.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+
+        Returns
+        -------
+        lo_threshold, hi_threshold : `~astropy.units.Quantity`
+            Low and high energy threshold
+
+        Raises
+        ------
+        KeyError
+            If a threshold is not defined.
+        """
+        thresholds = self._info(obs, "aeff")[1]
+        for name, value in zip(["LO_THRES", "HI_THRES"], thresholds):
+            if value is None:
+                raise KeyError(name)
+        return thresholds[0] * u.TeV, thresholds[1] * u.TeV
+
+    def quantize_offset(self, offset):
+        """Round offset to a multiple of ``offset_step``."""
+        step = self.offset_step.to("deg").value
+        value = np.round(Angle(offset).to("deg").value / step) * step
+        return Angle(np.round(value, 10), "deg")
+
+    @staticmethod
+    def _binning_key(energy):
+        return tuple(np.round(energy.to("TeV").value, 10).tolist())
+
+    def _reduce(self, obs, hdu_type, offset, binning, func):
+        offset = self.quantize_offset(offset)
+        key = (hdu_type, self.checksum(obs, hdu_type), float(offset.to("deg").value))
+        key += binning
+        return self.reduced.get_or_compute(key, lambda: func(offset))
+
+    def effective_area_table(self, obs, offset, energy):
+        """Effective area table of an observation at a given offset.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        offset : `~astropy.coordinates.Angle`
+            Offset, rounded to a multiple of ``offset_step``
+        energy : `~astropy.units.Quantity`
+            Energy axis bin edges
+
+        Returns
+        -------
+        aeff : `~gammapy.irf.EffectiveAreaTable`
+            Effective area table, a new object for every call.
+        """
+        energy = EnergyBounds(energy)
+
+        def reduce(offset):
+            aeff = self.load(obs, "aeff").to_effective_area_table(offset, energy)
+            return aeff.data.data
+
+        binning = self._binning_key(energy)
+        data = self._reduce(obs, "aeff", offset, binning, reduce)
+        return EffectiveAreaTable(
+            energy_lo=energy.lower_bounds, energy_hi=energy.upper_bounds, data=data
+        )
+
+    def energy_dispersion(self, obs, offset, e_true, e_reco):
+        """Energy dispersion matrix of an observation at a given offset.
+
+        Parameters
+        ----------
+        obs : `~gammapy.data.DataStoreObservation`
+            Observation
+        offset : `~astropy.coordinates.Angle`
+            Offset, rounded to a multiple of ``offset_step``
+        e_true, e_reco : `~astropy.units.Quantity`
+            True and reconstructed energy axis bin edges
+
+        Returns
+        -------
+        edisp : `~gammapy.irf.EnergyDispersion`
+            Energy dispersion matrix, a new object for every call.
+        """
+        e_true = EnergyBounds(e_true)
+        e_reco = EnergyBounds(e_reco)
+
+        def reduce(offset):
+            edisp = self.load(obs, "edisp").to_energy_dispersion(
+                offset, e_true=e_true, e_reco=e_reco
+            )
+            return edisp.data.data
+
+        binning = self._binning_key(e_true) + (None,) + self._binning_key(e_reco)
+        data = self._reduce(obs, "edisp", offset, binning, reduce)
+        return EnergyDispersion(
+            e_true_lo=e_true.lower_bounds,
+            e_true_hi=e_true.upper_bounds,
+            e_reco_lo=e_reco.lower_bounds,
+            e_reco_hi=e_reco.upper_bounds,
+            data=data,
+        )
@@ -3,7 +3,9 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import logging
 import numpy as np
 from astropy.units import Quantity
-from ..irf import EffectiveAreaTable, EnergyDispersion
+from ..utils.energy import EnergyBounds
+from .effective_area import EffectiveAreaTable
+from .energy_dispersion import EnergyDispersion
 
 __all__ = ["IRFStacker"]
 
@@ -35,84 +37,225 @@ class IRFStacker(object):
             \cdot \mathrm{aeff}_{jl} \cdot t_j \cdot \epsilon_{jk}}{\sum_{j} \mathrm{aeff}_{jl}
             \cdot t_j}
 
+    Instead of passing lists, the IRFs can be added one at a time with
+    `~gammapy.irf.IRFStacker.add`, which only updates running sums of the
+    livetime-weighted effective area and energy dispersion. The memory usage
+    then doesn't depend on the number of stacked observations. Reduced IRFs
+    already stored in arrays can be added at once with
+    `~gammapy.irf.IRFStacker.add_arrays`.
+
     Parameters
     ----------
-    list_aeff : list
+    list_aeff : list, optional
         list of `~gammapy.irf.EffectiveAreaTable`
-    list_livetime : list
+    list_livetime : list, optional
         list of `~astropy.units.Quantity` (livetime)
-    list_edisp : list
+    list_edisp : list, optional
         list of `~gammapy.irf.EnergyDispersion`
-    list_low_threshold : list
+    list_low_threshold : list, optional
         list of low energy threshold, optional for effective area mean computation
-    list_high_threshold : list
+    list_high_threshold : list, optional
         list of high energy threshold, optional for effective area mean computation
+    e_true : `~astropy.units.Quantity`, optional
+        True energy bin edges, only needed if IRFs are added with
+        `~gammapy.irf.IRFStacker.add_arrays` before any IRF object
+    e_reco : `~astropy.units.Quantity`, optional
+        Reconstructed energy bin edges, see ``e_true``
+
+    Examples
+    --------
+    Stack the IRFs of a list of observations, reducing them one at a time::
+
+        from gammapy.irf import IRFStacker
+        stacker = IRFStacker()
+        for obs in obs_list:
+            offset = position.separation(obs.pointing_radec)
+            aeff = obs.aeff.to_effective_area_table(offset, energy=e_true)
+            edisp = obs.edisp.to_energy_dispersion(offset, e_true=e_true, e_reco=e_reco)
+            stacker.add(aeff, obs.observation_live_time_duration, edisp)
+        stacker.stack_edisp()
+        print(stacker.stacked_edisp)
     """
 
     def __init__(
         self,
-        list_aeff,
-        list_livetime,
+        list_aeff=None,
+        list_livetime=None,
         list_edisp=None,
         list_low_threshold=None,
         list_high_threshold=None,
+        e_true=None,
+        e_reco=None,
     ):
         self.list_aeff = list_aeff
-        self.list_livetime = Quantity(list_livetime)
+        self.list_livetime = None if list_livetime is None else Quantity(list_livetime)
         self.list_edisp = list_edisp
         self.list_low_threshold = list_low_threshold
         self.list_high_threshold = list_high_threshold
+        self.e_true = None if e_true is None else EnergyBounds(e_true)
+        self.e_reco = None if e_reco is None else EnergyBounds(e_reco)
         self.stacked_aeff = None
         self.stacked_edisp = None
+        self.reset()
+
+    def reset(self):
+        """Reset the running sums."""
+        self.n_obs = 0
+        self.n_obs_edisp = 0
+        self._livetime = 0.0
+        self._aefft = None
+        self._aefft_edisp = None
+
+    def add(self, aeff, livetime, edisp=None, low_threshold=None, high_threshold=None):
+        """Add the IRFs of one observation to the running sums.
+
+        Parameters
+        ----------
+        aeff : `~gammapy.irf.EffectiveAreaTable`
+            Effective area
+        livetime : `~astropy.units.Quantity`
+            Livetime
+        edisp : `~gammapy.irf.EnergyDispersion`, optional
+            Energy dispersion
+        low_threshold, high_threshold : `~astropy.units.Quantity`, optional
+            Reconstructed energy range, the energy dispersion outside this
+            range is set to zero.
+        """
+        if self.e_true is None:
+            self.e_true = EnergyBounds(aeff.energy.bins)
+
+        aeff_data = aeff.evaluate_fill_nan().to("cm2").value
+        livetime = Quantity(livetime).to("s").value
+
+        if edisp is None:
+            self.add_arrays(aeff_data[np.newaxis], [livetime])
+            return
+
+        if self.e_reco is None:
+            self.e_reco = EnergyBounds(edisp.e_reco.bins)
+
+        mask = np.ones(edisp.e_reco.nbins, dtype=bool)
+        if low_threshold is not None:
+            mask &= edisp.e_reco.lo >= low_threshold
+        if high_threshold is not None:
+            mask &= edisp.e_reco.hi <= high_threshold
+
+        self.add_arrays(
+            aeff_data[np.newaxis],
+            [livetime],
+            edisp.pdf_matrix[np.newaxis],
+            mask[np.newaxis],
+        )
+
+    def add_observation(self, obs):
+        """Add the IRFs of a `~gammapy.spectrum.SpectrumObservation`.
+
+        The energy dispersion is restricted to the safe energy range of the
+        observation.
+        """
+        self.add(
+            aeff=obs.aeff,
+            livetime=obs.livetime,
+            edisp=obs.edisp,
+            low_threshold=obs.lo_threshold,
+            high_threshold=obs.hi_threshold,
+        )
+
+    def add_arrays(self, aeff, livetime, edisp=None, mask=None):
+        """Add the reduced IRFs of a batch of observations to the running sums.
+
+        All observations are added with one `~numpy.einsum` call.
+
+        Parameters
+        ----------
+        aeff : `~numpy.ndarray`
+            Effective area in cm2, shape ``(n_obs, n_e_true)``
+        livetime : `~numpy.ndarray`
+            Livetime in s, shape ``(n_obs,)``
+        edisp : `~numpy.ndarray`, optional
+            Energy dispersion matrices, shape ``(n_obs, n_e_true, n_e_reco)``
+        mask : `~numpy.ndarray`, optional
+            Reconstructed energy bins inside the safe range, shape ``(n_obs, n_e_reco)``
+        """
+        aeff = np.asarray(aeff, dtype=np.float64)
+        livetime = np.asarray(livetime, dtype=np.float64)
+        aefft = aeff * livetime[:, np.newaxis]
+
+        if self._aefft is None:
+            self._aefft = np.zeros(aeff.shape[1])
+        self._aefft += aefft.sum(axis=0)
+        self._livetime += livetime.sum()
+        self.n_obs += len(livetime)
+
+        if edisp is None:
+            return
+
+        edisp = np.asarray(edisp, dtype=np.float64)
+        if mask is None:
+            mask = np.ones((edisp.shape[0], edisp.shape[2]))
+
+        if self._aefft_edisp is None:
+            self._aefft_edisp = np.zeros(edisp.shape[1:])
+        self._aefft_edisp += np.einsum("jl,jlk,jk->lk", aefft, edisp, mask)
+        self.n_obs_edisp += len(livetime)
+
+    def _add_lists(self):
+        self.reset()
+        n_obs = len(self.list_aeff)
+        list_edisp = self.list_edisp
+        list_low_threshold = self.list_low_threshold
+        list_high_threshold = self.list_high_threshold
+
+        if list_edisp is None:
+            list_edisp = [None] * n_obs
+        if list_low_threshold is None:
+            list_low_threshold = [None] * n_obs
+        if list_high_threshold is None:
+            list_high_threshold = [None] * n_obs
+
+        for args in zip(
+            self.list_aeff,
+            self.list_livetime,
+            list_edisp,
+            list_low_threshold,
+            list_high_threshold,
+        ):
+            self.add(*args)
 
     def stack_aeff(self):
         """
         Compute mean effective area (`~gammapy.irf.EffectiveAreaTable`).
         """
-        nbins = self.list_aeff[0].energy.nbins
-        aefft = Quantity(np.zeros(nbins), "cm2 s")
-        livetime_tot = np.sum(self.list_livetime)
+        if self.list_aeff is not None:
+            self._add_lists()
 
-        for i, aeff in enumerate(self.list_aeff):
-            aeff_data = aeff.evaluate_fill_nan()
-            aefft_current = aeff_data * self.list_livetime[i]
-            aefft += aefft_current
+        if self.n_obs == 0:
+            raise ValueError("No effective area to stack.")
 
-        stacked_data = aefft / livetime_tot
+        stacked_data = self._aefft / self._livetime
         self.stacked_aeff = EffectiveAreaTable(
-            energy_lo=self.list_aeff[0].energy.lo,
-            energy_hi=self.list_aeff[0].energy.hi,
-            data=stacked_data.to("cm2"),
+            energy_lo=self.e_true.lower_bounds,
+            energy_hi=self.e_true.upper_bounds,
+            data=Quantity(stacked_data, "cm2"),
         )
 
     def stack_edisp(self):
         """
         Compute mean energy dispersion (`~gammapy.irf.EnergyDispersion`).
         """
-        reco_bins = self.list_edisp[0].e_reco.nbins
-        true_bins = self.list_edisp[0].e_true.nbins
-
-        aefft = Quantity(np.zeros(true_bins), "cm2 s")
-        temp = np.zeros(shape=(reco_bins, true_bins))
-        aefftedisp = Quantity(temp, "cm2 s")
-
-        for i, edisp in enumerate(self.list_edisp):
-            aeff_data = self.list_aeff[i].evaluate_fill_nan()
-            aefft_current = aeff_data * self.list_livetime[i]
-            aefft += aefft_current
-            edisp_data = edisp.pdf_in_safe_range(
-                self.list_low_threshold[i], self.list_high_threshold[i]
-            )
+        if self.list_aeff is not None:
+            self._add_lists()
 
-            aefftedisp += edisp_data.transpose() * aefft_current
+        if self.n_obs_edisp == 0 or self.n_obs_edisp != self.n_obs:
+            raise ValueError("Energy dispersion missing for stacked observations.")
 
         with np.errstate(divide="ignore", invalid="ignore"):
-            stacked_edisp = np.nan_to_num(aefftedisp / aefft)
+            stacked_edisp = self._aefft_edisp / self._aefft[:, np.newaxis]
 
         self.stacked_edisp = EnergyDispersion(
-            e_true_lo=self.list_edisp[0].e_true.lo,
-            e_true_hi=self.list_edisp[0].e_true.hi,
-            e_reco_lo=self.list_edisp[0].e_reco.lo,
-            e_reco_hi=self.list_edisp[0].e_reco.hi,
-            data=stacked_edisp.transpose(),
+            e_true_lo=self.e_true.lower_bounds,
+            e_true_hi=self.e_true.upper_bounds,
+            e_reco_lo=self.e_reco.lower_bounds,
+            e_reco_hi=self.e_reco.upper_bounds,
+            data=np.nan_to_num(stacked_edisp),
         )
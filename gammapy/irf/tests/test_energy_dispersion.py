@@ -63,6 +63,26 @@ class TestEnergyDispersion:
         assert str(len(counts)) in str(exc.value)
         assert_allclose(actual[0], 1.8612999017723058, atol=1e-3)
 
+    def test_apply_sparse(self):
+        e_true = np.logspace(-1, 2, 201) * u.TeV
+        e_reco = np.logspace(-1, 2, 101) * u.TeV
+        edisp = EnergyDispersion.from_gauss(
+            e_true=e_true, e_reco=e_reco, sigma=0.1, bias=0
+        )
+        assert edisp.pdf_matrix_sparse.shape == (100, 200)
+
+        cube = np.random.RandomState(0).rand(200, 3, 4)
+        actual = edisp.apply(cube)
+        desired = np.einsum("ijk,il->ljk", cube, edisp.pdf_matrix)
+        assert actual.shape == (100, 3, 4)
+        assert_allclose(actual.value, desired)
+
+        # Replacing the data updates the sparse matrix
+        edisp.data.data = np.ones((200, 100))
+        assert edisp.pdf_matrix_sparse is None
+        desired = cube.sum(axis=0) * np.ones((100, 1, 1))
+        assert_allclose(edisp.apply(cube).value, desired)
+
     def test_get_bias(self):
         bias = self.edisp.get_bias(3.34 * u.TeV)
         assert_allclose(bias, self.bias, atol=1e-2)
@@ -205,3 +225,42 @@ class TestEnergyDispersion2D:
     def test_peek(self):
         with mpl_plot_check():
             self.edisp.peek()
+
+
+@requires_dependency("scipy")
+def test_edisp2d_to_energy_dispersion():
+    e_true = EnergyBounds.equal_log_spacing(0.1, 100, 30, "TeV")
+    migra = np.linspace(0, 3, 100)
+    offset = [0, 1, 2] * u.deg
+    edisp2d = EnergyDispersion2D.from_gauss(e_true, migra, 0, 0.2, offset)
+
+    offset = Angle(0.7, "deg")
+    e_true = EnergyBounds.equal_log_spacing(0.5, 50, 120, "TeV")
+    e_reco = EnergyBounds.equal_log_spacing(0.2, 80, 40, "TeV")
+    edisp = edisp2d.to_energy_dispersion(offset, e_true=e_true, e_reco=e_reco)
+
+    assert edisp.pdf_matrix.shape == (120, 40)
+    assert_allclose(edisp.pdf_matrix[60].sum(), 1, rtol=1e-3)
+    # Reference values of the implementation calling get_response per bin
+    assert_allclose(
+        edisp.pdf_matrix[0, 3:9],
+        [0.047609663, 0.119009895, 0.230976045, 0.295164104, 0.21323828, 0.060441672],
+        rtol=1e-6,
+    )
+    assert_allclose(edisp.pdf_matrix[0, 11:], 0)
+    assert_allclose(
+        edisp.pdf_matrix[57, 18:24],
+        [0.071735876, 0.16566918, 0.265688528, 0.28039412, 0.146677059, 0.026923303],
+        rtol=1e-6,
+    )
+    assert_allclose(
+        edisp.pdf_matrix[119, 33:39],
+        [0.029687232, 0.082130086, 0.176324379, 0.279237866, 0.265665262, 0.128057649],
+        rtol=1e-6,
+    )
+    assert_allclose(edisp.pdf_matrix[119, :16], 0)
+
+    edisp_gev = edisp2d.to_energy_dispersion(
+        offset, e_true=e_true, e_reco=e_reco.to("GeV")
+    )
+    assert_allclose(edisp_gev.pdf_matrix, edisp.pdf_matrix)
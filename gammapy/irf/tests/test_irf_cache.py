@@ -0,0 +1,128 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import astropy.units as u
+from astropy.io import fits
+from astropy.coordinates import Angle
+from ...utils.testing import requires_dependency
+from ...utils.energy import EnergyBounds
+from ...data.hdu_index_table import HDULocation
+from .. import EffectiveAreaTable2D, EnergyDispersion2D, IRFReductionCache
+
+
+class _Observation(object):
+    """Observation stub providing the IRF HDU locations."""
+
+    def __init__(self, obs_id, path):
+        self.obs_id = obs_id
+        self.path = path
+
+    def location(self, hdu_type):
+        hdu_class = dict(aeff="aeff_2d", edisp="edisp_2d")[hdu_type]
+        hdu_name = dict(aeff="EFFECTIVE AREA", edisp="ENERGY DISPERSION")[hdu_type]
+        return HDULocation(
+            self.obs_id,
+            hdu_type,
+            hdu_class,
+            str(self.path.dirpath()),
+            "",
+            self.path.basename,
+            hdu_name,
+        )
+
+
+def make_irf_file(filename, thresholds=True):
+    e_true = EnergyBounds.equal_log_spacing(0.1, 100, 20, "TeV")
+    offset = [0, 1, 2, 3] * u.deg
+    data = np.outer(np.linspace(1, 2, 20), [1, 0.9, 0.7, 0.4]) * 1e5 * u.m ** 2
+    aeff = EffectiveAreaTable2D(
+        energy_lo=e_true[:-1],
+        energy_hi=e_true[1:],
+        offset_lo=offset[:-1],
+        offset_hi=offset[1:],
+        data=data[:, :3],
+    )
+    if thresholds:
+        aeff.meta["LO_THRES"] = 0.3
+        aeff.meta["HI_THRES"] = 50.0
+    migra = np.linspace(0, 3, 100)
+    edisp = EnergyDispersion2D.from_gauss(e_true, migra, 0, 0.2, offset)
+    hdu_list = fits.HDUList([fits.PrimaryHDU(), aeff.to_fits(), edisp.to_fits()])
+    hdu_list.writeto(str(filename))
+
+
+@requires_dependency("scipy")
+def test_irf_reduction_cache(tmpdir):
+    make_irf_file(tmpdir / "irf_1.fits")
+    make_irf_file(tmpdir / "irf_2.fits")
+    obs_1 = _Observation(1, tmpdir / "irf_1.fits")
+    obs_2 = _Observation(2, tmpdir / "irf_2.fits")
+
+    cache = IRFReductionCache(offset_step="0.1 deg", cache_dir=tmpdir / "cache")
+    assert cache.checksum(obs_1, "aeff") == cache.checksum(obs_2, "aeff")
+    assert cache.checksum(obs_1, "aeff") != cache.checksum(obs_1, "edisp")
+    assert_allclose(cache.quantize_offset("0.53 deg").deg, 0.5)
+
+    e_true = EnergyBounds.equal_log_spacing(0.2, 50, 30, "TeV")
+    e_reco = EnergyBounds.equal_log_spacing(0.3, 30, 10, "TeV")
+    offset = Angle(0.52, "deg")
+
+    aeff_1 = cache.effective_area_table(obs_1, offset, e_true)
+    edisp_1 = cache.energy_dispersion(obs_1, offset, e_true, e_reco)
+    assert len(cache.reduced) == 2
+
+    aeff_2 = cache.effective_area_table(obs_2, Angle(0.48, "deg"), e_true)
+    edisp_2 = cache.energy_dispersion(obs_2, Angle(0.48, "deg"), e_true, e_reco)
+    assert len(cache.reduced) == 2
+
+    aeff = obs_1.location("aeff").load()
+    desired = aeff.to_effective_area_table(Angle(0.5, "deg"), e_true)
+    assert_allclose(aeff_1.data.data, desired.data.data)
+    assert_allclose(aeff_2.data.data, desired.data.data)
+
+    edisp = obs_1.location("edisp").load()
+    desired = edisp.to_energy_dispersion(Angle(0.5, "deg"), e_true, e_reco)
+    assert_allclose(edisp_1.pdf_matrix, desired.pdf_matrix)
+    assert_allclose(edisp_2.pdf_matrix, desired.pdf_matrix)
+
+    # Modifying a returned IRF must not modify the cache content
+    aeff_1.data.data *= 0
+    aeff_3 = cache.effective_area_table(obs_1, offset, e_true)
+    assert_allclose(aeff_3.data.data, aeff_2.data.data)
+
+    # Reduced IRFs are persisted on disk
+    cache_new = IRFReductionCache(offset_step="0.1 deg", cache_dir=tmpdir / "cache")
+    aeff_4 = cache_new.effective_area_table(obs_2, offset, e_true)
+    assert len(cache_new.irfs) == 0
+    assert_allclose(aeff_4.data.data, aeff_2.data.data)
+
+    # Reduced IRFs of another cache can be added
+    cache_other = IRFReductionCache(offset_step="0.1 deg")
+    cache_other.update(cache)
+    assert len(cache_other.reduced) == 2
+    assert len(cache_other.irfs) == 0
+    aeff_5 = cache_other.effective_area_table(obs_2, offset, e_true)
+    assert len(cache_other.irfs) == 0
+    assert_allclose(aeff_5.data.data, aeff_2.data.data)
+
+
+def test_irf_reduction_cache_energy_thresholds(tmpdir):
+    make_irf_file(tmpdir / "irf_1.fits")
+    make_irf_file(tmpdir / "irf_2.fits", thresholds=False)
+    obs_1 = _Observation(1, tmpdir / "irf_1.fits")
+    obs_2 = _Observation(2, tmpdir / "irf_2.fits")
+
+    cache = IRFReductionCache()
+    lo_threshold, hi_threshold = cache.energy_thresholds(obs_1)
+    assert len(cache.irfs) == 0
+
+    aeff = obs_1.location("aeff").load()
+    assert lo_threshold == aeff.low_threshold
+    assert hi_threshold == aeff.high_threshold
+
+    # Thresholds don't enter the checksum
+    assert cache.checksum(obs_1, "aeff") == cache.checksum(obs_2, "aeff")
+    with pytest.raises(KeyError):
+        cache.energy_thresholds(obs_2)
@@ -0,0 +1,80 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import astropy.units as u
+from ...utils.testing import requires_dependency
+from ...utils.energy import EnergyBounds
+from .. import EffectiveAreaTable, EnergyDispersion, IRFStacker
+
+
+def make_irfs(n_obs):
+    e_true = EnergyBounds.equal_log_spacing(0.1, 100, 30, "TeV")
+    e_reco = EnergyBounds.equal_log_spacing(0.2, 50, 20, "TeV")
+    list_aeff, list_edisp = [], []
+    for idx in range(n_obs):
+        aeff = EffectiveAreaTable.from_parametrization(e_true, "HESS")
+        aeff.data.data *= 1 + 0.1 * idx
+        edisp = EnergyDispersion.from_gauss(
+            e_true=e_true, e_reco=e_reco, sigma=0.1 + 0.05 * idx, bias=0
+        )
+        list_aeff.append(aeff)
+        list_edisp.append(edisp)
+    list_livetime = u.Quantity([1, 2, 0.5][:n_obs], "h")
+    list_low_threshold = u.Quantity([0.5, 1, 0.3][:n_obs], "TeV")
+    list_high_threshold = u.Quantity([30, 10, 50][:n_obs], "TeV")
+    return list_aeff, list_edisp, list_livetime, list_low_threshold, list_high_threshold
+
+
+@requires_dependency("scipy")
+def test_irf_stacker():
+    list_aeff, list_edisp, list_livetime, list_lo, list_hi = make_irfs(3)
+
+    stacker = IRFStacker(list_aeff, list_livetime, list_edisp, list_lo, list_hi)
+    stacker.stack_aeff()
+    stacker.stack_edisp()
+    aeff = stacker.stacked_aeff
+    edisp = stacker.stacked_edisp
+
+    expected = np.average(
+        [_.data.data.to("cm2").value for _ in list_aeff],
+        weights=list_livetime.value,
+        axis=0,
+    )
+    assert_allclose(aeff.data.data.to("cm2").value, expected)
+    assert aeff.data.data.unit == "cm2"
+    assert edisp.pdf_matrix.shape == (30, 20)
+    assert_allclose(edisp.pdf_matrix[:, edisp.e_reco.hi > 50 * u.TeV], 0)
+
+    # Streaming accumulation of one observation at a time
+    streaming = IRFStacker()
+    for args in zip(list_aeff, list_livetime, list_edisp, list_lo, list_hi):
+        streaming.add(*args)
+    streaming.stack_aeff()
+    streaming.stack_edisp()
+    assert streaming.n_obs == 3
+    assert_allclose(streaming.stacked_aeff.data.data, aeff.data.data)
+    assert_allclose(streaming.stacked_edisp.pdf_matrix, edisp.pdf_matrix)
+
+    # Batch of reduced IRFs stored in arrays
+    e_reco = list_edisp[0].e_reco
+    batch = IRFStacker(e_true=list_aeff[0].energy.bins, e_reco=e_reco.bins)
+    batch.add_arrays(
+        aeff=[_.data.data.to("cm2").value for _ in list_aeff],
+        livetime=list_livetime.to("s").value,
+        edisp=[_.pdf_matrix for _ in list_edisp],
+        mask=[
+            (e_reco.lo >= lo) & (e_reco.hi <= hi) for lo, hi in zip(list_lo, list_hi)
+        ],
+    )
+    batch.stack_edisp()
+    assert_allclose(batch.stacked_edisp.pdf_matrix, edisp.pdf_matrix)
+
+
+def test_irf_stacker_missing_edisp():
+    list_aeff = make_irfs(1)[0]
+    stacker = IRFStacker()
+    stacker.add(list_aeff[0], 1 * u.h)
+    with pytest.raises(ValueError):
+        stacker.stack_edisp()
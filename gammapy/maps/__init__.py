@@ -18,3 +18,4 @@ from .wcs import *
 from .wcsnd import *
 from .wcsmap import *
 from .sparse import *
+from .reproject import *
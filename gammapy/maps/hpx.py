@@ -4,13 +4,17 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 from collections import OrderedDict
 import re
 import copy
+import hashlib
 import numpy as np
 from ..extern import six
 from astropy.io import fits
 from astropy.coordinates import SkyCoord
 from astropy.units import Quantity
+from astropy.utils import lazyproperty
 from ..utils.scripts import make_path
+from ..utils.cache import LRUCache
 from .wcs import WcsGeom
+from .sparse import SparseArray
 from .geom import MapGeom, MapCoord, pix_tuple_to_idx
 from .geom import coordsys_to_frame, skycoord_to_lonlat
 from .geom import find_and_read_bands, make_axes
@@ -25,6 +29,11 @@ HPX_ORDER_TO_PIXSIZE = np.array(
     [32.0, 16.0, 8.0, 4.0, 2.0, 1.0, 0.50, 0.25, 0.1, 0.05, 0.025, 0.01, 0.005, 0.002]
 )
 
+# Process-level cache of HEALPIX to WCS pixel mappings used by
+# `HpxToWcsMapping.create`. Set ``HPX_TO_WCS_MAPPING_CACHE.cache_dir``
+# to persist the mappings on disk.
+HPX_TO_WCS_MAPPING_CACHE = LRUCache(maxsize=32)
+
 
 class HpxConv(object):
     """Data structure to define how a HEALPIX map is stored to FITS."""
@@ -309,6 +318,24 @@ def make_hpx_to_wcs_mapping(hpx, wcs):
     return ipix, mult_val, npix
 
 
+def _hpx_to_wcs_mapping_key(hpx, wcs):
+    """Cache key of the pixel mapping computed by `make_hpx_to_wcs_mapping`."""
+    npix = tuple([int(np.max(t)) for t in wcs.npix])
+    header = wcs.wcs.to_header_string()
+    header = hashlib.sha1(header.encode("utf-8")).hexdigest()
+    return tuple(hpx.nside.flat), bool(hpx.nest), header, npix
+
+
+def _sparse_image_planes(data):
+    """Convert a `SparseArray` to a CSR matrix with one row per image plane."""
+    from scipy.sparse import csr_matrix
+
+    npix = data.shape[-1]
+    nplanes = int(np.prod(data.shape[:-1]))
+    rows, cols = np.divmod(data.idx, npix)
+    return csr_matrix((data.data, (rows, cols)), shape=(nplanes, npix))
+
+
 def match_hpx_pix(nside, nest, nside_pix, ipix_ring):
     """TODO
     """
@@ -597,15 +624,9 @@ class HpxGeom(MapGeom):
         self._sparse = sparse
 
         self._ipix = None
-        self._rmap = None
         self._region = region
         self._create_lookup(region)
 
-        if self._ipix is not None:
-            self._rmap = {}
-            for i, ipix in enumerate(self._ipix.flat):
-                self._rmap[ipix] = i
-
         self._npix = self._npix * np.ones(self._shape, dtype=int)
         self._conv = conv
         self._center_skydir = self._get_ref_dir()
@@ -716,11 +737,8 @@ class HpxGeom(MapGeom):
         else:
             idx = ravel_hpx_index(idx_global, self._maxpix)
 
-        if self._rmap is not None:
-            retval = np.full(idx.size, -1, "i")
-            m = np.in1d(idx.flat, self._ipix)
-            retval[m] = np.searchsorted(self._ipix, idx.flat[m])
-            retval = retval.reshape(idx.shape)
+        if self._ipix is not None:
+            retval = self._lookup_local_index(idx, idx_global)
         else:
             retval = idx
 
@@ -738,6 +756,66 @@ class HpxGeom(MapGeom):
         else:
             return ravel_hpx_index(idx_local, self.npix)
 
+    @lazyproperty
+    def _global_to_local_table(self):
+        """Dense lookup table from global to local (raveled) pixel indices.
+
+        The table only spans the range of global indices of the region in
+        each band and contains -1 for pixels outside of the region. It is
+        None if it would be much larger than the number of region pixels,
+        in which case the lookup falls back to a binary search.
+
+        Returns
+        -------
+        table : tuple
+            Lookup table and first global index, last global index and
+            table offset for each band.
+        """
+        ipix = self._ipix
+        if self.nside.size == 1:
+            bounds = np.array([0, len(ipix)])
+        else:
+            bounds = np.concatenate(([0], np.cumsum(self._npix.flat)))
+
+        nonempty = bounds[1:] > bounds[:-1]
+        first = np.where(nonempty, ipix[np.minimum(bounds[:-1], len(ipix) - 1)], 0)
+        last = np.where(nonempty, ipix[bounds[1:] - 1], -1)
+        size = last - first + 1
+
+        if np.sum(size) > max(16 * len(ipix), 2 ** 22):
+            return None
+
+        offset = np.concatenate(([0], np.cumsum(size)[:-1]))
+        band = np.repeat(np.arange(len(size)), np.diff(bounds))
+        table = np.full(np.sum(size), -1, dtype="i")
+        table[offset[band] + ipix - first[band]] = np.arange(len(ipix))
+        return table, first, last, offset
+
+    def _lookup_local_index(self, idx, idx_global):
+        """Look up local (raveled) indices of global (raveled) indices ``idx``."""
+        if len(self._ipix) == 0:
+            return np.full(idx.shape, -1, "i")
+
+        lookup = self._global_to_local_table
+
+        if lookup is None:
+            pos = np.searchsorted(self._ipix, idx)
+            pos = np.clip(pos, 0, len(self._ipix) - 1)
+            return np.where(self._ipix[pos] == idx, pos, -1).astype("i")
+
+        table, first, last, offset = lookup
+        if self.nside.size == 1:
+            band = np.zeros(idx.shape, dtype=int)
+        else:
+            band = np.ravel_multi_index(idx_global[1:], self._shape, mode="clip")
+            band = np.broadcast_to(band, idx.shape)
+
+        pos = idx - first[band]
+        m = (pos >= 0) & (idx <= last[band])
+        retval = np.full(idx.shape, -1, "i")
+        retval[m] = table[offset[band][m] + pos[m]]
+        return retval
+
     def __getitem__(self, idx_global):
         """This implements the global-to-local index lookup.
 
@@ -1752,6 +1830,7 @@ class HpxToWcsMapping(object):
         self._npix = npix
         self._lmap = self._hpx[self._ipix]
         self._valid = self._lmap >= 0
+        self._matrices = {}
 
     @property
     def hpx(self):
@@ -1791,7 +1870,7 @@ class HpxToWcsMapping(object):
         return self._valid
 
     @classmethod
-    def create(cls, hpx, wcs):
+    def create(cls, hpx, wcs, cache=True):
         """Create an object that maps pixels from HEALPix geometry ``hpx`` to
         WCS geometry ``wcs``.
 
@@ -1801,15 +1880,50 @@ class HpxToWcsMapping(object):
             HEALPix geometry object.
         wcs : `~gammapy.maps.WcsGeom`
             WCS geometry object.
+        cache : bool
+            Look up the pixel mapping in ``HPX_TO_WCS_MAPPING_CACHE`` and
+            store it there if it has not been computed yet. The mapping
+            only depends on NSIDE, the pixel ordering and the WCS geometry.
 
         Returns
         -------
         hpx2wcs : `~HpxToWcsMapping`
 
         """
-        ipix, mult_val, npix = make_hpx_to_wcs_mapping(hpx, wcs)
+        if not cache:
+            ipix, mult_val, npix = make_hpx_to_wcs_mapping(hpx, wcs)
+            return cls(hpx, wcs, ipix, mult_val, npix)
+
+        def _make_mapping():
+            mapping = make_hpx_to_wcs_mapping(hpx, wcs)
+            # Cached arrays are shared between mapping objects
+            for arr in mapping[:2]:
+                arr.flags.writeable = False
+            return mapping
+
+        key = _hpx_to_wcs_mapping_key(hpx, wcs)
+        ipix, mult_val, npix = HPX_TO_WCS_MAPPING_CACHE.get_or_compute(
+            key, _make_mapping
+        )
         return cls(hpx, wcs, ipix, mult_val, npix)
 
+    def _make_matrix(self, normalize=True):
+        """Sparse matrix mapping local HEALPIX pixels to valid WCS pixels.
+
+        Only available if all image planes share the same NSIDE.
+        """
+        from scipy.sparse import csr_matrix
+
+        lmap = self._lmap[self._valid]
+        if normalize:
+            weights = self._mult_val[self._valid]
+        else:
+            weights = np.ones(lmap.shape)
+
+        rows = np.arange(len(lmap))
+        shape = (len(lmap), np.max(self._hpx.npix))
+        return csr_matrix((weights, (rows, lmap)), shape=shape)
+
     def fill_wcs_map_from_hpx_data(
         self, hpx_data, wcs_data, normalize=True, fill_nan=True
     ):
@@ -1817,8 +1931,9 @@ class HpxToWcsMapping(object):
 
         Parameters
         ----------
-        hpx_data : `~numpy.ndarray`
-            The input HEALPIX data
+        hpx_data : `~numpy.ndarray` or `~gammapy.maps.SparseArray`
+            The input HEALPIX data. Sparse data are only supported if all
+            image planes share the same NSIDE.
         wcs_data : `~numpy.ndarray`
             The data array being filled
         normalize : bool
@@ -1827,6 +1942,11 @@ class HpxToWcsMapping(object):
             Fill pixels outside the HPX geometry with NaN.
         """
         # FIXME: Do we want to flatten mapping arrays?
+        sparse = isinstance(hpx_data, SparseArray)
+        if sparse and self._valid.ndim != 1:
+            raise NotImplementedError(
+                "Sparse data are not supported for multi-resolution geometries."
+            )
 
         shape = tuple([t.flat[0] for t in self._npix])
         if self._valid.ndim != 1:
@@ -1842,7 +1962,18 @@ class HpxToWcsMapping(object):
         hpx_slice = [slice(None) for _ in range(wcs_data.ndim - 2)]
         hpx_slice = tuple(hpx_slice + [lmap])
 
-        if normalize:
+        if self._valid.ndim == 1:
+            if normalize not in self._matrices:
+                self._matrices[normalize] = self._make_matrix(normalize)
+
+            if sparse:
+                hpx_planes = _sparse_image_planes(hpx_data)
+                vals = self._matrices[normalize].dot(hpx_planes.T).T.toarray()
+            else:
+                hpx_planes = hpx_data.reshape((-1, hpx_data.shape[-1]))
+                vals = self._matrices[normalize].dot(hpx_planes.T).T
+            wcs_data[wcs_slice] = vals.reshape(hpx_data.shape[:-1] + (-1,))
+        elif normalize:
             wcs_data[wcs_slice] = mult_val * hpx_data[hpx_slice]
         else:
             wcs_data[wcs_slice] = hpx_data[hpx_slice]
@@ -5,7 +5,9 @@ from astropy.io import fits
 from .sparse import SparseArray
 from .geom import pix_tuple_to_idx
 from .hpxmap import HpxMap
-from .hpx import HpxGeom
+from .hpx import HpxGeom, HpxToWcsMapping, nside_to_order
+from .hpx import get_subpixels, get_superpixels
+from .utils import unpack_seq
 
 __all__ = ["HpxSparseMap"]
 
@@ -37,6 +39,10 @@ class HpxSparseMap(HpxMap):
 
         super(HpxSparseMap, self).__init__(geom, data, meta, unit)
 
+    def _init_copy(self, **kwargs):
+        kwargs.setdefault("map_type", "hpx-sparse")
+        return super(HpxSparseMap, self)._init_copy(**kwargs)
+
     @classmethod
     def from_hdu(cls, hdu, hdu_bands=None):
         """Create from a FITS HDU.
@@ -105,6 +111,9 @@ class HpxSparseMap(HpxMap):
         if weights is None:
             weights = np.ones(idx[0].shape)
         idx = self.geom.global_to_local(idx)
+        msk = np.all(np.stack([t != -1 for t in idx]), axis=0)
+        idx = tuple([t[msk] for t in idx])
+        weights = np.asarray(weights)[msk]
         idx_flat = np.ravel_multi_index(idx, self.data.shape[::-1])
         idx_flat, idx_inv = np.unique(idx_flat, return_inverse=True)
         idx = np.unravel_index(idx_flat, self.data.shape[::-1])
@@ -148,35 +157,216 @@ class HpxSparseMap(HpxMap):
 
         return cols
 
-    def iter_by_image(self):
-        raise NotImplementedError
+    def _get_nonzero(self):
+        """Global pixel indices and values of the allocated map elements."""
+        idx = np.unravel_index(self.data.idx, self.data.shape)
+        idx = self.geom.local_to_global(idx[::-1])
+        return tuple(idx), self.data.data
+
+    def _fill_subpixels(self, map_out, scale=1.0):
+        """Fill the subpixels in ``map_out`` of all non-zero pixels."""
+        idx, vals = self._get_nonzero()
+        if len(vals) == 0:
+            return
+
+        nside = self.geom._get_nside(idx)
+        nside_out = map_out.geom._get_nside(idx)
+        pix = get_subpixels(idx[0], nside, nside_out, nest=self.geom.nest)
+
+        m = pix != -1
+        idx_out = [pix[m]] + [
+            np.broadcast_to(t[:, None], pix.shape)[m] for t in idx[1:]
+        ]
+        vals = np.broadcast_to((vals * scale)[:, None], pix.shape)[m]
+        map_out.fill_by_idx(idx_out, vals)
+
+    def _fill_superpixels(self, map_out, scale=1.0):
+        """Fill the superpixels in ``map_out`` of all non-zero pixels."""
+        idx, vals = self._get_nonzero()
+        if len(vals) == 0:
+            return
+
+        nside = self.geom._get_nside(idx)
+        nside_out = map_out.geom._get_nside(idx)
+        pix = get_superpixels(idx[0], nside, nside_out, nest=self.geom.nest)
+        map_out.fill_by_idx((pix,) + idx[1:], vals * scale)
+
+    def iter_by_pix(self, buffersize=1):
+        """Iterate over the non-zero elements of the map returning a tuple
+        with values and pixel coordinates.
 
-    def iter_by_pix(self):
-        raise NotImplementedError
+        Parameters
+        ----------
+        buffersize : int
+            Set the size of the buffer.  The map will be returned in
+            chunks of the given size.
+
+        Returns
+        -------
+        val : `~numpy.ndarray`
+            Map values.
+        pix : tuple
+            Tuple of pixel coordinates.
+        """
+        idx, vals = self._get_nonzero()
+        x = [vals] + list(idx)
+        return unpack_seq(
+            np.nditer(x, flags=["external_loop", "buffered"], buffersize=buffersize)
+        )
 
-    def iter_by_coord(self):
-        raise NotImplementedError
+    def iter_by_coord(self, buffersize=1):
+        """Iterate over the non-zero elements of the map returning a tuple
+        with values and map coordinates.
+
+        Parameters
+        ----------
+        buffersize : int
+            Set the size of the buffer.  The map will be returned in
+            chunks of the given size.
+
+        Returns
+        -------
+        val : `~numpy.ndarray`
+            Map values.
+        coords : tuple
+            Tuple of map coordinates.
+        """
+        idx, vals = self._get_nonzero()
+        x = [vals] + list(self.geom.pix_to_coord(idx))
+        return unpack_seq(
+            np.nditer(x, flags=["external_loop", "buffered"], buffersize=buffersize)
+        )
 
     def sum_over_axes(self):
-        raise NotImplementedError
+        """Sum over all non-spatial dimensions.
 
-    def pad(self, pad_width):
-        raise NotImplementedError
+        Returns
+        -------
+        map_out : `~HpxSparseMap`
+            Summed map.
+        """
+        geom = self.geom.to_image()
+        axis = tuple(range(self.data.ndim - 1))
+        data = self.data.sum(axis=axis)
+        return self._init_copy(geom=geom, data=data)
+
+    def pad(self, pad_width, mode="constant", cval=0, order=1):
+        geom = self.geom.pad(pad_width)
+        map_out = self._init_copy(geom=geom, data=None)
+        idx, vals = self._get_nonzero()
+        map_out.fill_by_idx(idx, vals)
+
+        if mode == "constant":
+            if cval != 0:
+                coords = geom.get_coord(flat=True)
+                m = self.geom.contains(coords)
+                coords = tuple([c[~m] for c in coords])
+                map_out.set_by_coord(coords, cval)
+        elif mode == "interp":
+            raise NotImplementedError("Interpolation is not supported for sparse maps.")
+        else:
+            raise ValueError("Unrecognized pad mode: {!r}".format(mode))
+
+        return map_out
 
     def crop(self, crop_width):
-        raise NotImplementedError
+        geom = self.geom.crop(crop_width)
+        map_out = self._init_copy(geom=geom, data=None)
+        idx, vals = self._get_nonzero()
+        map_out.fill_by_idx(idx, vals)
+        return map_out
 
-    def upsample(self, factor):
-        raise NotImplementedError
+    def upsample(self, factor, preserve_counts=True):
+        geom = self.geom.upsample(factor)
+        map_out = self._init_copy(geom=geom, data=None)
+        scale = 1.0 / factor ** 2 if preserve_counts else 1.0
+        self._fill_subpixels(map_out, scale)
+        return map_out
 
-    def downsample(self, factor):
-        raise NotImplementedError
+    def downsample(self, factor, preserve_counts=True):
+        geom = self.geom.downsample(factor)
+        map_out = self._init_copy(geom=geom, data=None)
+        scale = 1.0 if preserve_counts else 1.0 / factor ** 2
+        self._fill_superpixels(map_out, scale)
+        return map_out
 
-    def to_wcs(self, sum_bands=False, normalize=True, proj="AIT", oversample=2):
-        raise NotImplementedError
+    def to_wcs(
+        self,
+        sum_bands=False,
+        normalize=True,
+        proj="AIT",
+        oversample=2,
+        width_pix=None,
+        hpx2wcs=None,
+    ):
+        from .wcsnd import WcsNDMap
+
+        if self.geom.nside.size > 1:
+            if not sum_bands:
+                raise NotImplementedError(
+                    "Multi-resolution sparse maps can only be converted "
+                    "with sum_bands=True."
+                )
+            map_sum = self.sum_over_axes()
+            return map_sum.to_wcs(
+                sum_bands=False,
+                normalize=normalize,
+                proj=proj,
+                oversample=oversample,
+                width_pix=width_pix,
+            )
+
+        if hpx2wcs is None:
+            wcs2d = self.geom.make_wcs(
+                proj=proj, oversample=oversample, width_pix=width_pix, drop_axes=True
+            )
+            hpx2wcs = HpxToWcsMapping.create(self.geom, wcs2d)
+
+        wcs_shape = tuple([t.flat[0] for t in hpx2wcs.npix])
+        if sum_bands:
+            axis = tuple(range(self.data.ndim - 1))
+            hpx_data = self.data.sum(axis=axis)
+            wcs = hpx2wcs.wcs.to_image()
+        else:
+            hpx_data = self.data
+            wcs_shape += self.geom.shape
+            wcs = hpx2wcs.wcs.to_cube(self.geom.axes)
+
+        wcs_data = np.zeros(wcs_shape).T
+        hpx2wcs.fill_wcs_map_from_hpx_data(hpx_data, wcs_data, normalize)
+        return WcsNDMap(wcs, wcs_data, unit=self.unit)
 
     def to_swapped(self):
-        raise NotImplementedError
+        import healpy as hp
 
-    def to_ud_graded(self):
-        raise NotImplementedError
+        hpx_out = self.geom.to_swapped()
+        map_out = self._init_copy(geom=hpx_out, data=None)
+        idx, vals = self._get_nonzero()
+        nside = self.geom._get_nside(idx)
+
+        if self.geom.nest:
+            idx_new = (hp.nest2ring(nside, idx[0]),) + idx[1:]
+        else:
+            idx_new = (hp.ring2nest(nside, idx[0]),) + idx[1:]
+
+        map_out.set_by_idx(idx_new, vals)
+        return map_out
+
+    def to_ud_graded(self, nside, preserve_counts=False):
+        order = nside_to_order(nside)
+        new_hpx = self.geom.to_ud_graded(order)
+        map_out = self._init_copy(geom=new_hpx, data=None)
+
+        # Same normalisation as `HpxNDMap.to_ud_graded`
+        idx, _ = self._get_nonzero()
+        scale = 1.0
+        if not preserve_counts:
+            order_in = nside_to_order(self.geom._get_nside(idx))
+            scale = (2 ** order) ** 2 / (2 ** order_in) ** 2
+
+        if np.all(order <= self.geom.order):
+            self._fill_superpixels(map_out, scale)
+        else:
+            self._fill_subpixels(map_out, scale)
+
+        return map_out
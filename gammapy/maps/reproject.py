@@ -2,8 +2,10 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
 import astropy.units as u
+from .geom import MapCoord
+from .utils import interp_to_order
 
-__all__ = ["reproject_car_to_hpx", "reproject_car_to_wcs"]
+__all__ = ["ReprojectionPlan", "reproject_car_to_hpx", "reproject_car_to_wcs"]
 
 
 def _get_input_pix_celestial(wcs_in, wcs_out, shape_out):
@@ -103,3 +105,156 @@ def reproject_car_to_wcs(input_data, wcs_out, shape_out, order=1):
     ).reshape(slice_out.shape)
 
     return array_new, (~np.isnan(array_new)).astype(float)
+
+
+class ReprojectionPlan(object):
+    """Precomputed reprojection of the spatial axes of a WCS map.
+
+    The mapping from the input to the output pixels, including the
+    interpolation weights, is computed once and stored as a sparse matrix.
+    Applying the plan to a map then amounts to a sparse matrix product,
+    which processes all image planes at once. Plans can be pickled and
+    reused for any number of maps with the same spatial geometry.
+
+    Pixels of the output geometry whose center falls outside the input
+    image are set to NaN. All-sky CAR input maps are wrapped in longitude.
+
+    Parameters
+    ----------
+    geom_in : `~gammapy.maps.WcsGeom`
+        Input geometry.
+    geom_out : `~gammapy.maps.MapGeom`
+        Output geometry, WCS or HEALPix.
+    order : {0, 1, 'nearest', 'linear'}
+        Order of interpolation (0 = nearest-neighbor, 1 = linear).
+
+    Examples
+    --------
+    ::
+
+        from gammapy.maps import Map, ReprojectionPlan
+
+        m = Map.create(binsz=0.1, width=10, coordsys="GAL", axes=[energy_axis])
+        geom = m.geom.to_image().pad(10)
+        plan = ReprojectionPlan(m.geom, geom)
+        m_reprojected = plan.reproject(m)
+    """
+
+    def __init__(self, geom_in, geom_out, order=1):
+        order = interp_to_order(order)
+        if order not in [0, 1]:
+            raise ValueError(
+                "Only nearest (0) or linear (1) interpolation is supported."
+                " Got: {!r}".format(order)
+            )
+
+        if geom_in.is_hpx:
+            raise TypeError("Input geometry must be a WcsGeom.")
+
+        if not (geom_in.is_regular and geom_out.is_regular):
+            raise ValueError("Only regular geometries are supported.")
+
+        self.geom_in = geom_in.to_image()
+        self.geom_out = geom_out.to_image()
+        self.order = order
+        self.matrix = self._make_matrix()
+        self.footprint = self._make_footprint()
+
+    def _get_input_pix(self):
+        coords = self.geom_out.get_coord()
+        coords = MapCoord.create(coords, coordsys=self.geom_in.coordsys)
+        with np.errstate(invalid="ignore"):
+            x, y = self.geom_in.coord_to_pix((coords.lon, coords.lat))
+        return np.ravel(x), np.ravel(y)
+
+    def _make_matrix(self):
+        from scipy.sparse import csr_matrix
+
+        ny, nx = self.geom_in.data_shape
+        x, y = self._get_input_pix()
+        wrap = self.geom_in.projection == "CAR" and self.geom_in.is_allsky
+
+        with np.errstate(invalid="ignore"):
+            valid = (y >= -0.5) & (y <= ny - 0.5)
+            if not wrap:
+                valid &= (x >= -0.5) & (x <= nx - 0.5)
+
+        rows = np.nonzero(valid)[0]
+        x, y = x[valid], y[valid]
+
+        if self.order == 0:
+            ix = [np.floor(x + 0.5).astype(int)]
+            iy = [np.clip(np.floor(y + 0.5).astype(int), 0, ny - 1)]
+            wx, wy = [np.ones_like(x)], [np.ones_like(y)]
+        else:
+            x0, y0 = np.floor(x), np.floor(y)
+            dx, dy = x - x0, y - y0
+            ix = [x0.astype(int), x0.astype(int) + 1]
+            iy = [y0.astype(int), y0.astype(int) + 1]
+            wx, wy = [1 - dx, dx], [1 - dy, dy]
+
+        row, col, weights = [], [], []
+        for ix_, wx_ in zip(ix, wx):
+            ix_ = np.mod(ix_, nx) if wrap else np.clip(ix_, 0, nx - 1)
+            for iy_, wy_ in zip(iy, wy):
+                iy_ = np.clip(iy_, 0, ny - 1)
+                row.append(rows)
+                col.append(iy_ * nx + ix_)
+                weights.append(wx_ * wy_)
+
+        row, col, weights = [np.concatenate(_) for _ in [row, col, weights]]
+        m = weights > 0
+        shape = (np.prod(self.geom_out.data_shape), ny * nx)
+        return csr_matrix((weights[m], (row[m], col[m])), shape=shape)
+
+    def _make_footprint(self):
+        footprint = np.diff(self.matrix.indptr) > 0
+        return footprint.reshape(self.geom_out.data_shape)
+
+    def apply(self, data):
+        """Reproject a data array.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data array, where the last two axes match the spatial shape of
+            the input geometry. Any leading axes are reprojected plane
+            by plane.
+
+        Returns
+        -------
+        data : `~numpy.ndarray`
+            Reprojected data array.
+        """
+        data = np.asarray(data)
+        shape_in = self.geom_in.data_shape
+        if data.shape[-2:] != shape_in:
+            raise ValueError(
+                "Data shape {!r} does not match input geometry shape {!r}"
+                "".format(data.shape[-2:], shape_in)
+            )
+
+        shape = data.shape[:-2]
+        planes = data.reshape((-1, np.prod(shape_in))).T
+        vals = self.matrix.dot(planes).T
+        vals = vals.reshape(shape + self.geom_out.data_shape)
+        vals[..., ~self.footprint] = np.nan
+        return vals
+
+    def reproject(self, map_in):
+        """Reproject a map.
+
+        Parameters
+        ----------
+        map_in : `~gammapy.maps.WcsNDMap`
+            Input map with the spatial geometry ``geom_in``.
+
+        Returns
+        -------
+        map_out : `~gammapy.maps.Map`
+            Reprojected map, with the non-spatial axes of ``map_in``.
+        """
+        axes = [ax.copy() for ax in map_in.geom.axes]
+        geom = self.geom_out.to_cube(axes)
+        data = self.apply(map_in.data)
+        return map_in._init_copy(geom=geom, data=data)
@@ -199,21 +199,61 @@ class SparseArray(object):
         """Get array values at indices ``idx_in``."""
         shape_out = idx_in[0].shape
         idx_flat_in, msk_in = self._to_flat_index(idx_in)
-        idx, msk = find_in_array(idx_flat_in, self.idx)
         val_out = np.full(shape_out, self._fill_value)
+        if len(idx_flat_in) == 0:
+            return np.squeeze(val_out)
+
+        idx, msk = find_in_array(idx_flat_in, self.idx)
         val_out.flat[np.flatnonzero(msk_in)[msk]] = self._data[idx[msk]]
         return np.squeeze(val_out)
 
     def sum(self, axis=None, dtype=None, out=None, keepdims=False, **unused_kwargs):
-        # FIXME: Figure out how to correctly support np.apply_over_axes
+        """Sum of array elements over the given axes.
 
+        Only the allocated elements are visited, so the cost scales with
+        the number of non-zero elements rather than with the array size.
+
+        Parameters
+        ----------
+        axis : None or int or tuple of ints
+            Axes along which the sum is performed. If None all elements
+            are summed and a scalar is returned.
+        dtype : data-type, optional
+            Type of the output array. Defaults to the type of this array.
+        keepdims : bool
+            Keep the summed axes with size one.
+
+        Returns
+        -------
+        out : `~SparseArray` or scalar
+            Summed array.
+        """
         if axis is None:
-            return np.sum(self._data)
+            return np.sum(self._data, dtype=dtype)
+
+        axis = (axis,) if np.isscalar(axis) else tuple(axis)
+        axis = [ax % self.ndim for ax in axis]
+        keep = [i for i in range(self.ndim) if i not in axis]
+
+        if not keep and not keepdims:
+            return np.sum(self._data, dtype=dtype)
+
+        if keepdims:
+            shape = [1 if i in axis else n for i, n in enumerate(self.shape)]
         else:
-            shape = list(self.shape)
-            if keepdims:
-                shape[axis] = 1
-            else:
-                del shape[axis]
-            out = SparseArray(shape)
-            return out
+            shape = [self.shape[i] for i in keep]
+
+        if keep:
+            idx = np.unravel_index(self.idx, self.shape)
+            idx = tuple([idx[i] for i in keep])
+            idx = np.ravel_multi_index(idx, [self.shape[i] for i in keep])
+        else:
+            idx = np.zeros(len(self.idx), dtype=np.int64)
+        idx, idx_inv = np.unique(idx, return_inverse=True)
+
+        dtype = self.dtype if dtype is None else dtype
+        data = np.bincount(idx_inv, weights=self.data, minlength=len(idx))
+        data = data.astype(dtype)
+
+        msk = data != self._fill_value
+        return SparseArray(shape, idx[msk], data[msk], fill_value=self._fill_value)
@@ -155,6 +155,32 @@ def test_get_subpixels(nside_superpix, nside_subpix, nest):
     assert np.all(superpix[..., None] == pix1)
 
 
+@pytest.mark.parametrize(
+    ("nside", "nested", "region"),
+    [
+        (64, True, "DISK(110.,75.,2.)"),
+        ([32, 64], False, "DISK(110.,75.,2.)"),
+        (8192, False, "DISK(110.,0.,1.)"),
+    ],
+)
+def test_hpx_global_to_local_lookup(nside, nested, region):
+    hpx = HpxGeom(nside, nested, "GAL", region=region, axes=[np.linspace(0., 1., 3)])
+    # For the RING scheme at high NSIDE the dense lookup table would be too large
+    assert (hpx._global_to_local_table is None) == (np.max(nside) == 8192)
+
+    ipix, band = hpx.get_idx(flat=True)
+    ipix_local = hpx.get_idx(local=True, flat=True)[0]
+    lookup = dict(zip(zip(ipix, band), ipix_local))
+
+    random_state = np.random.RandomState(0)
+    pix = np.concatenate([ipix, random_state.randint(-1, 12 * 32 ** 2, 1000)])
+    band = np.concatenate([band, random_state.randint(0, 2, 1000)])
+    expected = [lookup.get((p, b), -1) for p, b in zip(pix, band)]
+
+    idx_local = hpx.global_to_local((pix, band))
+    assert_allclose(idx_local[0], expected)
+
+
 def test_hpx_global_to_local():
     ax0 = np.linspace(0., 1., 3)
     ax1 = np.linspace(0., 1., 3)
@@ -9,7 +9,7 @@ from astropy import units as u
 from ..utils import fill_poisson
 from ..geom import MapAxis, coordsys_to_frame
 from ..base import Map
-from ..hpx import HpxGeom
+from ..hpx import HpxGeom, HPX_TO_WCS_MAPPING_CACHE
 from ..hpxmap import HpxMap
 from ..hpxnd import HpxNDMap
 from ..hpxsparse import HpxSparseMap
@@ -256,6 +256,33 @@ def test_hpxmap_to_wcs(nside, nested, coordsys, region, axes):
     m.to_wcs(sum_bands=True, oversample=2, normalize=False)
 
 
+def test_hpxmap_to_wcs_mapping_cache(tmpdir):
+    m = HpxNDMap(HpxGeom(nside=8, coordsys="GAL", region="DISK(110.,75.,10.)"))
+    fill_poisson(m, mu=1.0, random_state=0)
+
+    HPX_TO_WCS_MAPPING_CACHE.clear()
+    HPX_TO_WCS_MAPPING_CACHE.cache_dir = str(tmpdir)
+    try:
+        m_wcs = m.to_wcs(oversample=2)
+        assert len(HPX_TO_WCS_MAPPING_CACHE) == 1
+        assert len(tmpdir.listdir()) == 1
+
+        # Same spatial geometry with non-spatial axes: the mapping is reused
+        geom = HpxGeom(nside=8, coordsys="GAL", region="DISK(110.,75.,10.)", axes=axes1)
+        HpxNDMap(geom).to_wcs(oversample=2)
+        assert len(HPX_TO_WCS_MAPPING_CACHE) == 1
+
+        # The mapping is read back from disk
+        HPX_TO_WCS_MAPPING_CACHE.clear()
+        m_wcs2 = m.to_wcs(oversample=2)
+        assert len(HPX_TO_WCS_MAPPING_CACHE) == 1
+    finally:
+        HPX_TO_WCS_MAPPING_CACHE.cache_dir = None
+
+    assert_allclose(m_wcs.data, m_wcs2.data)
+    assert_allclose(np.nansum(m_wcs.data), np.nansum(m.data))
+
+
 @pytest.mark.parametrize(
     ("nside", "nested", "coordsys", "region", "axes"), hpx_test_geoms
 )
@@ -352,6 +379,57 @@ def test_hpxmap_sum_over_axes(nside, nested, coordsys, region, axes):
         assert_allclose(np.nansum(m.data), np.nansum(msum.data))
 
 
+@requires_dependency("scipy")
+@pytest.mark.parametrize(
+    ("nside", "nested", "coordsys", "region", "axes"), hpx_test_geoms
+)
+def test_hpxsparsemap_operations(nside, nested, coordsys, region, axes):
+    geom = HpxGeom(
+        nside=nside, nest=nested, coordsys=coordsys, region=region, axes=axes
+    )
+    m = HpxNDMap(geom)
+    idx = geom.get_idx(flat=True)
+    rng = np.random.RandomState(0)
+    m.set_by_idx(idx, rng.poisson(0.5, len(idx[0])))
+    m_sparse = HpxSparseMap(geom, data=m.data)
+
+    def assert_maps_equal(m_dense, m_sparse):
+        assert isinstance(m_sparse, HpxSparseMap)
+        assert_allclose(np.nan_to_num(m_dense.data), m_sparse.data[...])
+
+    assert_maps_equal(m.sum_over_axes(), m_sparse.sum_over_axes())
+    assert_maps_equal(m.to_swapped(), m_sparse.to_swapped())
+
+    vals = np.concatenate([t[0] for t in m_sparse.iter_by_pix(buffersize=16)])
+    assert_allclose(vals.sum(), np.nansum(m.data))
+
+    if geom.nside.size > 1:
+        return
+
+    for preserve_counts in [True, False]:
+        assert_maps_equal(
+            m.upsample(2, preserve_counts=preserve_counts),
+            m_sparse.upsample(2, preserve_counts=preserve_counts),
+        )
+        assert_maps_equal(
+            m.downsample(2, preserve_counts=preserve_counts),
+            m_sparse.downsample(2, preserve_counts=preserve_counts),
+        )
+        assert_maps_equal(
+            m.to_ud_graded(4, preserve_counts=preserve_counts),
+            m_sparse.to_ud_graded(4, preserve_counts=preserve_counts),
+        )
+
+    for sum_bands in [True, False]:
+        m_wcs = m.to_wcs(sum_bands=sum_bands)
+        m_sparse_wcs = m_sparse.to_wcs(sum_bands=sum_bands)
+        assert_allclose(m_wcs.data, m_sparse_wcs.data)
+
+    if region is not None:
+        assert_maps_equal(m.pad(1, cval=2.2), m_sparse.pad(1, cval=2.2))
+        assert_maps_equal(m.crop(1), m_sparse.crop(1))
+
+
 def test_coadd_unit():
     geom = HpxGeom.create(nside=128)
     m1 = HpxNDMap(geom, unit="m2")
@@ -0,0 +1,103 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pickle
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from astropy.coordinates import SkyCoord
+from ...utils.testing import requires_dependency
+from ..geom import MapAxis
+from ..wcs import WcsGeom
+from ..hpx import HpxGeom
+from ..wcsnd import WcsNDMap
+from ..reproject import ReprojectionPlan
+
+pytest.importorskip("scipy")
+
+
+@pytest.fixture(scope="session")
+def map_in():
+    axis = MapAxis.from_edges([1, 2, 3], name="energy")
+    geom = WcsGeom.create(
+        skydir=(0, 0), binsz=0.1, width=(4, 3), coordsys="GAL", axes=[axis]
+    )
+    m = WcsNDMap(geom)
+    coords = geom.get_coord()
+    m.data = (coords["lon"] + 10 * coords["lat"] + coords["energy"]).astype(float)
+    return m
+
+
+@requires_dependency("scipy")
+@pytest.mark.parametrize("order", [0, 1])
+def test_reprojection_plan_wcs(map_in, order):
+    skydir = SkyCoord(0.05, 0, unit="deg", frame="galactic").icrs
+    geom = WcsGeom.create(skydir=skydir, binsz=0.05, width=(2, 2), coordsys="CEL")
+    plan = ReprojectionPlan(map_in.geom, geom, order=order)
+
+    m = plan.reproject(map_in)
+    assert m.geom.data_shape == (2, 40, 40)
+    assert np.all(plan.footprint)
+
+    coords = m.geom.get_coord()
+    rtol = 1e-3 if order == 1 else 2e-2
+    expected = map_in.interp_by_coord(coords, interp=order)
+    assert_allclose(m.data, expected, rtol=rtol, atol=0.05)
+
+
+@requires_dependency("scipy")
+def test_reprojection_plan_footprint(map_in):
+    geom = WcsGeom.create(skydir=(2, 0), binsz=0.1, width=(2, 1), coordsys="GAL")
+    plan = ReprojectionPlan(map_in.geom, geom)
+    data = plan.apply(map_in.data)
+    # Only the pixels with lon < 2 deg overlap with the input map
+    assert_allclose(plan.footprint.sum(), 100)
+    assert np.all(np.isnan(data[:, ~plan.footprint]))
+    assert np.all(np.isfinite(data[:, plan.footprint]))
+
+
+@requires_dependency("scipy")
+@requires_dependency("reproject")
+@pytest.mark.parametrize("order", [0, 1])
+@pytest.mark.parametrize("skydir, width", [((0.03, 0.03), 2), ((-0.03, 0.03), 2.2)])
+def test_reprojection_plan_nan_mask(order, skydir, width):
+    m = WcsNDMap.create(binsz=0.1, width=2, coordsys="GAL")
+    m.data += 1
+    geom = WcsGeom.create(skydir=skydir, binsz=0.1, width=width, coordsys="GAL")
+
+    data = ReprojectionPlan(m.geom, geom, order=order).apply(m.data)
+    expected = m.reproject(geom, order=order).data
+    assert_allclose(np.isnan(data), np.isnan(expected))
+
+
+@requires_dependency("scipy")
+@requires_dependency("healpy")
+def test_reprojection_plan_hpx():
+    geom_in = WcsGeom.create(binsz=1, proj="CAR", coordsys="GAL")
+    data = np.ones(geom_in.data_shape)
+    geom = HpxGeom.create(nside=8, coordsys="GAL")
+    plan = ReprojectionPlan(geom_in, geom)
+    assert_allclose(plan.apply(data), 1)
+
+
+@requires_dependency("scipy")
+def test_reprojection_plan_pickle(map_in, tmpdir):
+    geom = WcsGeom.create(skydir=(0, 0), binsz=0.2, width=(2, 2), coordsys="GAL")
+    plan = ReprojectionPlan(map_in.geom, geom)
+
+    filename = str(tmpdir / "plan.pkl")
+    with open(filename, "wb") as fh:
+        pickle.dump(plan, fh)
+
+    with open(filename, "rb") as fh:
+        plan_read = pickle.load(fh)
+
+    assert_allclose(plan_read.apply(map_in.data), plan.apply(map_in.data))
+
+
+def test_reprojection_plan_errors(map_in):
+    with pytest.raises(ValueError):
+        ReprojectionPlan(map_in.geom, map_in.geom, order=3)
+
+    plan = ReprojectionPlan(map_in.geom, map_in.geom)
+    with pytest.raises(ValueError):
+        plan.apply(np.ones((3, 3)))
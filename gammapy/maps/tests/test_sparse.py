@@ -71,6 +71,20 @@ def test_sparse_setitem(shape):
     assert_allclose(v[...], data)
 
 
+def test_sparse_sum():
+    shape = (4, 8, 16)
+    data = np.random.RandomState(0).poisson(0.3 * np.ones(shape)).astype(float)
+    v = SparseArray.from_array(data)
+
+    assert_allclose(v.sum(), data.sum())
+    assert_allclose(v.sum(axis=(0, 1, 2)), data.sum())
+    for axis in [0, -1, (0, 1), (0, 2)]:
+        assert_allclose(v.sum(axis=axis)[...], data.sum(axis=axis))
+        vsum = v.sum(axis=axis, keepdims=True)
+        assert vsum.shape == data.sum(axis=axis, keepdims=True).shape
+        assert_allclose(vsum[...], np.squeeze(data.sum(axis=axis, keepdims=True)))
+
+
 @pytest.mark.parametrize(
     ("dtype_idx", "dtype_val"),
     [
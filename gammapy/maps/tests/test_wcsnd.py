@@ -438,6 +438,42 @@ def test_wcsndmap_upsample(npix, binsz, coordsys, proj, skydir, axes):
     assert m.unit == m2.unit
 
 
+@pytest.mark.parametrize(("chunksize", "n_jobs"), [(None, 1), (1, 1), (2, 3)])
+def test_wcsndmap_chunked_ops(chunksize, n_jobs):
+    axis = MapAxis.from_edges([1, 2, 3, 4, 5], name="energy")
+    geom = WcsGeom.create(npix=(8, 6), binsz=1, axes=[axis, axes1[0]])
+    m = WcsNDMap(geom)
+    m.data = np.random.RandomState(0).uniform(size=m.data.shape)
+    kwargs = dict(chunksize=chunksize, n_jobs=n_jobs)
+
+    msum = m.sum_over_axes(**kwargs)
+    assert_allclose(msum.data, m.data.sum(axis=(0, 1)), rtol=1e-5)
+
+    out = np.empty((6, 8), dtype=m.data.dtype)
+    m.sum_over_axes(out=out, **kwargs)
+    assert_allclose(out, msum.data)
+
+    out = np.empty((2, 4, 3, 4))
+    mdown = m.downsample(2, out=out, **kwargs)
+    assert mdown.data is out
+    assert_allclose(mdown.data[0, 0, 0, 0], m.data[0, 0, :2, :2].sum(), rtol=1e-5)
+
+    mup = m.upsample(2, order=0, **kwargs)
+    assert_allclose(mup.data.sum(), m.data.sum(), rtol=1e-5)
+    assert_allclose(mup.data[1, 2, :2, :2], m.data[1, 2, 0, 0] / 4)
+
+    mpad = m.pad(2, mode="constant", cval=3, **kwargs)
+    assert_allclose(mpad.data[:, :, 2:-2, 2:-2], m.data)
+    assert_allclose(mpad.data[:, :, :2], 3)
+
+    m2 = m.copy()
+    m2.coadd(m, **kwargs)
+    assert_allclose(m2.data, 2 * m.data)
+
+    with pytest.raises(ValueError):
+        m.sum_over_axes(out=np.empty((4, 4)))
+
+
 def test_coadd_unit():
     geom = WcsGeom.create(npix=(10, 10), binsz=1, proj="CAR", coordsys="GAL")
     m1 = WcsNDMap(geom, data=np.ones((10, 10)), unit="m2")
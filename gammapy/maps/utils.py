@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import contextlib
 from astropy.io import fits
 from ..utils.random import get_random_state
 
@@ -20,6 +21,11 @@ def fill_poisson(map_in, mu, random_state="random-seed"):
     random_state : {int, 'random-seed', 'global-rng', `~numpy.random.RandomState`}
         Defines random number generator initialisation.
         Passed to `~gammapy.utils.random.get_random_state`.
+
+    See Also
+    --------
+    gammapy.utils.random.sample_poisson : Draw many realisations at once,
+        e.g. ``sample_poisson(npred.data, size=1000)`` for a map ``npred``.
     """
     random_state = get_random_state(random_state)
     idx = map_in.geom.get_idx(flat=True)
@@ -73,6 +79,88 @@ def unpack_seq(seq, n=1):
         yield [e for e in row[:n]] + [row[n:]]
 
 
+def image_planes(data):
+    """View an N+2D data array as a stack of 2D image planes.
+
+    The non-spatial axes are flattened into the first axis of the returned
+    array, which shares memory with ``data``.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        Map data array with the two spatial axes last.
+
+    Returns
+    -------
+    planes : `~numpy.ndarray`
+        3D view of shape ``(n_planes, ny, nx)``.
+    """
+    planes = data.view()
+    try:
+        planes.shape = (-1,) + data.shape[-2:]
+    except AttributeError:
+        raise ValueError("Data array must allow a view as a stack of image planes.")
+    return planes
+
+
+def image_plane_chunks(n_planes, chunksize=None):
+    """Split a stack of image planes into chunks.
+
+    Parameters
+    ----------
+    n_planes : int
+        Number of image planes.
+    chunksize : int, optional
+        Number of image planes per chunk. By default all planes are
+        processed as a single chunk.
+
+    Returns
+    -------
+    chunks : list of slice
+        Slices into the first axis of the image plane stack.
+    """
+    if chunksize is None:
+        chunksize = n_planes
+
+    chunksize = max(int(chunksize), 1)
+    return [
+        slice(start, min(start + chunksize, n_planes))
+        for start in range(0, n_planes, chunksize)
+    ]
+
+
+def map_chunks(func, chunks, n_jobs=1):
+    """Apply a function to a sequence of chunks.
+
+    The results are yielded in the order of ``chunks``. For ``n_jobs > 1``
+    the chunks are processed in a thread pool, which speeds up operations
+    where numpy releases the GIL (reductions, resampling, copies).
+
+    Parameters
+    ----------
+    func : callable
+        Function called with a single chunk as argument.
+    chunks : list
+        Chunks to process.
+    n_jobs : int or None
+        Number of worker threads. `None` uses the number of CPUs.
+
+    Returns
+    -------
+    results : generator
+        Return values of ``func``.
+    """
+    if n_jobs == 1 or len(chunks) < 2:
+        for chunk in chunks:
+            yield func(chunk)
+    else:
+        from multiprocessing.pool import ThreadPool
+
+        with contextlib.closing(ThreadPool(processes=n_jobs)) as pool:
+            for result in pool.imap(func, chunks):
+                yield result
+
+
 def find_bands_hdu(hdu_list, hdu):
     """Discover the extension name of the BANDS HDU.
 
@@ -10,7 +10,7 @@ from ..extern.skimage import block_reduce
 from ..utils.units import unit_from_fits_image_hdu
 from .geom import pix_tuple_to_idx
 from .wcs import _check_width
-from .utils import interp_to_order
+from .utils import interp_to_order, image_planes, image_plane_chunks, map_chunks
 from .wcsmap import WcsGeom, WcsMap
 from .reproject import reproject_car_to_hpx, reproject_car_to_wcs
 
@@ -229,12 +229,82 @@ class WcsNDMap(WcsMap):
         idx = pix_tuple_to_idx(idx)
         self.data.T[idx] = vals
 
-    def sum_over_axes(self):
-        axis = tuple(range(self.data.ndim - 2))
-        data = np.nansum(self.data, axis=axis)
+    def sum_over_axes(self, out=None, chunksize=None, n_jobs=1):
+        """Reduce to a 2D image by summing over non-spatial dimensions.
+
+        The sum is accumulated over chunks of image planes, so that only
+        one partial sum per chunk has to be held in memory.
+
+        Parameters
+        ----------
+        out : `~numpy.ndarray`, optional
+            Array with the shape of the output image to store the result in.
+        chunksize : int, optional
+            Number of image planes summed per chunk. By default all planes
+            are summed at once.
+        n_jobs : int or None
+            Number of threads used to process the chunks.
+
+        Returns
+        -------
+        map : `WcsNDMap`
+            Summed image.
+        """
         geom = self.geom.to_image()
+        planes = image_planes(self.data)
+        chunks = image_plane_chunks(len(planes), chunksize)
+
+        def _nansum(chunk):
+            return np.nansum(planes[chunk], axis=0)
+
+        partial_sums = map_chunks(_nansum, chunks, n_jobs)
+
+        if out is None:
+            out = next(partial_sums)
+        else:
+            _check_out(out, geom.data_shape)
+            out[...] = next(partial_sums)
+
+        for partial_sum in partial_sums:
+            out += partial_sum
+
         # TODO: summing over the axis can change the unit, handle this correctly
-        return self._init_copy(geom=geom, data=data)
+        return self._init_copy(geom=geom, data=out)
+
+    def coadd(self, map_in, chunksize=None, n_jobs=1):
+        """Add the contents of ``map_in`` to this map.
+
+        If both maps share the same geometry the data arrays are summed
+        directly, in chunks of image planes. Otherwise the values of
+        ``map_in`` are filled in by coordinate.
+
+        Parameters
+        ----------
+        map_in : `Map`
+            Input map.
+        chunksize : int, optional
+            Number of image planes added per chunk, if the geometries
+            are aligned. By default all planes are added at once.
+        n_jobs : int or None
+            Number of threads used to process the chunks.
+        """
+        if not self.unit.is_equivalent(map_in.unit):
+            raise ValueError("Incompatible units")
+
+        if not _is_aligned(self.geom, map_in.geom):
+            return super(WcsNDMap, self).coadd(map_in)
+
+        scale = map_in.unit.to(self.unit)
+        planes_in = image_planes(map_in.data)
+        planes_out = image_planes(self.data)
+        chunks = image_plane_chunks(len(planes_in), chunksize)
+
+        def _add(chunk):
+            vals = planes_in[chunk] if scale == 1 else scale * planes_in[chunk]
+            np.add(planes_out[chunk], vals, out=planes_out[chunk], casting="unsafe")
+
+        for _ in map_chunks(_add, chunks, n_jobs):
+            pass
 
     def _reproject_to_wcs(self, geom, mode="interp", order=1):
         from reproject import reproject_interp, reproject_exact
@@ -296,18 +366,63 @@ class WcsNDMap(WcsMap):
 
         return self._init_copy(geom=geom, data=data)
 
-    def pad(self, pad_width, mode="constant", cval=0, order=1):
+    def pad(
+        self,
+        pad_width,
+        mode="constant",
+        cval=0,
+        order=1,
+        out=None,
+        chunksize=None,
+        n_jobs=1,
+    ):
+        """Pad the spatial dimension of the map by extending the edge of the
+        map by the given number of pixels.
+
+        Parameters
+        ----------
+        pad_width : {sequence, array_like, int}
+            Number of pixels padded to the edges of each axis.
+        mode : {'edge', 'constant', 'interp'}
+            Padding mode.  'edge' pads with the closest edge value.
+            'constant' pads with a constant value. 'interp' pads with
+            an extrapolated value.
+        cval : float
+            Padding value when mode='consant'.
+        order : int
+            Order of interpolation when mode='constant' (0 =
+            nearest-neighbor, 1 = linear, 2 = quadratic, 3 = cubic).
+        out : `~numpy.ndarray`, optional
+            Array with the shape of the padded map data to store the
+            result in. Only supported for regular geometries and
+            ``mode != 'interp'``.
+        chunksize : int, optional
+            Number of image planes padded per chunk. By default all planes
+            are padded at once.
+        n_jobs : int or None
+            Number of threads used to process the chunks.
+
+        Returns
+        -------
+        map : `Map`
+            Padded map.
+        """
         if np.isscalar(pad_width):
             pad_width = (pad_width, pad_width)
             pad_width += (0,) * (self.geom.ndim - 2)
 
         geom = self.geom.pad(pad_width[:2])
         if self.geom.is_regular and mode != "interp":
-            return self._pad_np(geom, pad_width, mode, cval)
+            return self._pad_np(geom, pad_width, mode, cval, out, chunksize, n_jobs)
         else:
+            if out is not None:
+                raise ValueError(
+                    "Option 'out' is only supported for regular geometries "
+                    "and mode != 'interp'."
+                )
             return self._pad_coadd(geom, pad_width, mode, cval, order)
 
-    def _pad_np(self, geom, pad_width, mode, cval):
+    def _pad_np(self, geom, pad_width, mode, cval, out=None, chunksize=None, n_jobs=1):
         """Pad a map with `~np.pad`.  This method only works for regular
         geometries but should be more efficient when working with
         large maps.
@@ -316,9 +431,23 @@ class WcsNDMap(WcsMap):
         if mode == "constant":
             kwargs["constant_values"] = cval
 
-        pad_width = [(t, t) for t in pad_width]
-        data = np.pad(self.data, pad_width[::-1], mode)
-        return self._init_copy(geom=geom, data=data)
+        if out is None:
+            out = np.empty(geom.data_shape, dtype=self.data.dtype)
+        else:
+            _check_out(out, geom.data_shape)
+
+        pad_width = [(0, 0)] + [(t, t) for t in pad_width[:2]][::-1]
+        planes_in = image_planes(self.data)
+        planes_out = image_planes(out)
+        chunks = image_plane_chunks(len(planes_in), chunksize)
+
+        def _pad(chunk):
+            planes_out[chunk] = np.pad(planes_in[chunk], pad_width, mode, **kwargs)
+
+        for _ in map_chunks(_pad, chunks, n_jobs):
+            pass
+
+        return self._init_copy(geom=geom, data=out)
 
     def _pad_coadd(self, geom, pad_width, mode, cval, order):
         """Pad a map manually by coadding the original map with the new
@@ -366,29 +495,135 @@ class WcsNDMap(WcsMap):
 
         return map_out
 
-    def upsample(self, factor, order=0, preserve_counts=True):
+    def upsample(
+        self, factor, order=0, preserve_counts=True, out=None, chunksize=None, n_jobs=1
+    ):
+        """Upsample the spatial dimension by a given factor.
+
+        Parameters
+        ----------
+        factor : int
+            Upsampling factor.
+        order : int
+            Order of the interpolation used for upsampling.
+        preserve_counts : bool
+            Preserve the integral over each bin.  This should be true
+            if the map is an integral quantity (e.g. counts) and false if
+            the map is a differential quantity (e.g. intensity).
+        out : `~numpy.ndarray`, optional
+            Array with the shape of the upsampled map data to store the
+            result in. Only supported for regular geometries.
+        chunksize : int, optional
+            Number of image planes upsampled per chunk. By default all planes
+            are upsampled at once.
+        n_jobs : int or None
+            Number of threads used to process the chunks.
+
+        Returns
+        -------
+        map : `Map`
+            Upsampled map.
+        """
         from scipy.ndimage import map_coordinates
 
         geom = self.geom.upsample(factor)
-        idx = geom.get_idx()
-        pix = (
-            (idx[0] - 0.5 * (factor - 1)) / factor,
-            (idx[1] - 0.5 * (factor - 1)) / factor,
-        ) + idx[2:]
-        data = map_coordinates(self.data.T, pix, order=order, mode="nearest")
-        if preserve_counts:
-            data /= factor ** 2
 
-        return self._init_copy(geom=geom, data=data)
+        if not self.geom.is_regular:
+            if out is not None:
+                raise ValueError(
+                    "Option 'out' is only supported for regular geometries."
+                )
+
+            idx = geom.get_idx()
+            pix = (
+                (idx[0] - 0.5 * (factor - 1)) / factor,
+                (idx[1] - 0.5 * (factor - 1)) / factor,
+            ) + idx[2:]
+            data = map_coordinates(self.data.T, pix, order=order, mode="nearest")
+            if preserve_counts:
+                data /= factor ** 2
+
+            return self._init_copy(geom=geom, data=data)
 
-    def downsample(self, factor, preserve_counts=True):
+        if out is None:
+            out = np.empty(geom.data_shape, dtype=self.data.dtype)
+        else:
+            _check_out(out, geom.data_shape)
+
+        # The pixel grid is the same for all image planes
+        pix = np.meshgrid(
+            *[np.arange(n, dtype=float) for n in geom.data_shape[-2:]], indexing="ij"
+        )
+        pix = [(p - 0.5 * (factor - 1)) / factor for p in pix]
+
+        planes_in = image_planes(self.data)
+        planes_out = image_planes(out)
+        chunks = image_plane_chunks(len(planes_in), chunksize)
+
+        def _upsample(chunk):
+            for plane_in, plane_out in zip(planes_in[chunk], planes_out[chunk]):
+                map_coordinates(
+                    plane_in, pix, output=plane_out, order=order, mode="nearest"
+                )
+            if preserve_counts:
+                planes_out[chunk] /= factor ** 2
+
+        for _ in map_chunks(_upsample, chunks, n_jobs):
+            pass
+
+        return self._init_copy(geom=geom, data=out)
+
+    def downsample(
+        self, factor, preserve_counts=True, out=None, chunksize=None, n_jobs=1
+    ):
+        """Downsample the spatial dimension by a given factor.
+
+        Parameters
+        ----------
+        factor : int
+            Downsampling factor.
+        preserve_counts : bool
+            Preserve the integral over each bin.  This should be true
+            if the map is an integral quantity (e.g. counts) and false if
+            the map is a differential quantity (e.g. intensity).
+        out : `~numpy.ndarray`, optional
+            Array with the shape of the downsampled map data to store the
+            result in.
+        chunksize : int, optional
+            Number of image planes downsampled per chunk. By default all
+            planes are downsampled at once.
+        n_jobs : int or None
+            Number of threads used to process the chunks.
+
+        Returns
+        -------
+        map : `Map`
+            Downsampled map.
+        """
         geom = self.geom.downsample(factor)
-        block_size = (factor, factor) + (1,) * len(self.geom.axes)
-        data = block_reduce(self.data, block_size[::-1], np.nansum)
-        if not preserve_counts:
-            data /= factor ** 2
 
-        return self._init_copy(geom=geom, data=data)
+        if out is None:
+            # The output dtype follows from the reduction, e.g. int64 for int32
+            dtype = np.nansum(np.zeros(1, dtype=self.data.dtype)).dtype
+            out = np.empty(geom.data_shape, dtype=dtype)
+        else:
+            _check_out(out, geom.data_shape)
+
+        planes_in = image_planes(self.data)
+        planes_out = image_planes(out)
+        chunks = image_plane_chunks(len(planes_in), chunksize)
+
+        def _downsample(chunk):
+            planes_out[chunk] = block_reduce(
+                planes_in[chunk], (1, factor, factor), np.nansum
+            )
+            if not preserve_counts:
+                planes_out[chunk] /= factor ** 2
+
+        for _ in map_chunks(_downsample, chunks, n_jobs):
+            pass
+
+        return self._init_copy(geom=geom, data=out)
 
     def plot(self, ax=None, fig=None, add_cbar=False, stretch="linear", **kwargs):
         """
@@ -624,3 +859,28 @@ class WcsNDMap(WcsMap):
         data = self.data[cutout_slices]
 
         return self._init_copy(geom=geom, data=data)
+
+
+def _check_out(out, shape):
+    if out.shape != shape:
+        raise ValueError(
+            "Shape {!r} of 'out' does not match map data shape {!r}"
+            "".format(out.shape, shape)
+        )
+
+
+def _is_aligned(geom, other):
+    """Check whether two WCS geometries have identical pixelisation."""
+    if not isinstance(other, WcsGeom):
+        return False
+
+    if not (geom.is_regular and other.is_regular):
+        return False
+
+    if geom.data_shape != other.data_shape:
+        return False
+
+    if not all(ax == ax_other for ax, ax_other in zip(geom.axes, other.axes)):
+        return False
+
+    return geom.wcs.wcs.compare(other.wcs.wcs)
@@ -29,7 +29,8 @@ class SpectrumAnalysisIACT(object):
     * background : dict
         Forwarded to `~gammapy.background.ReflectedRegionsBackgroundEstimator`
     * extraction : dict
-        Forwarded to `~gammapy.spectrum.SpectrumExtraction`
+        Forwarded to `~gammapy.spectrum.SpectrumExtraction`, e.g. set
+        ``n_jobs`` to process the observations in parallel
     * fit : dict
         Forwareded to `~gammapy.spectrum.SpectrumFit`
     * fp_binning : `~astropy.units.Quantity`
@@ -1,12 +1,16 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
 import logging
+import multiprocessing
+from collections import OrderedDict
 import numpy as np
 import astropy.units as u
 from regions import CircleSkyRegion
 from . import PHACountsSpectrum
 from . import SpectrumObservation, SpectrumObservationList
 from ..utils.scripts import make_path
+from ..utils.parallel import run_multiprocessing
 from ..irf import PSF3D
 
 __all__ = ["SpectrumExtraction"]
@@ -48,6 +52,17 @@ class SpectrumExtraction(object):
     use_recommended_erange : bool
         Extract spectrum only within the recommended valid energy range of the
         effective area table (default is True).
+    irf_cache : `~gammapy.irf.IRFReductionCache`, optional
+        Cache of reduced IRFs shared between observations. If given, the
+        IRFs are evaluated at the offset rounded to the cache offset step.
+    n_jobs : int
+        Number of processes used to process the observations in parallel.
+        If None, one process per CPU is used. The observations are sent to
+        the workers in chunks; with an ``irf_cache``, the observations of a
+        chunk share the same reduced IRFs (see
+        `~gammapy.irf.IRFReductionCache.group_key`), and the worker only
+        gets a copy of the cache holding these. The reduced IRFs computed by
+        the workers are added to ``irf_cache`` at the end of `run`.
     """
 
     DEFAULT_TRUE_ENERGY = np.logspace(-2, 2.5, 109) * u.TeV
@@ -64,6 +79,8 @@ class SpectrumExtraction(object):
         containment_correction=False,
         max_alpha=1,
         use_recommended_erange=True,
+        irf_cache=None,
+        n_jobs=1,
     ):
 
         self.obs_list = obs_list
@@ -73,6 +90,8 @@ class SpectrumExtraction(object):
         self.containment_correction = containment_correction
         self.max_alpha = max_alpha
         self.use_recommended_erange = use_recommended_erange
+        self.irf_cache = irf_cache
+        self.n_jobs = n_jobs
         self.observations = SpectrumObservationList()
 
         self.containment = None
@@ -85,10 +104,71 @@ class SpectrumExtraction(object):
         """Run all steps.
         """
         log.info("Running {}".format(self))
+        tasks = []
         for obs, bkg in zip(self.obs_list, self.bkg_estimate):
-            if not self._alpha_ok(obs, bkg):
-                continue
-            self.observations.append(self.process(obs, bkg))
+            if self._alpha_ok(obs, bkg):
+                tasks.append((obs, bkg))
+
+        if self.n_jobs == 1:
+            for obs, bkg in tasks:
+                self.observations.append(self.process(obs, bkg))
+            return
+
+        log.info("Using {} jobs to process observations.".format(self.n_jobs))
+        chunks = self._make_chunks(tasks)
+        inputs = []
+        for key, indices in chunks:
+            # Only send the settings to the worker processes, not all observations
+            worker = copy.copy(self)
+            worker.obs_list, worker.bkg_estimate = None, None
+            worker.observations = SpectrumObservationList()
+            if self.irf_cache is not None:
+                worker.irf_cache = self.irf_cache.copy([key])
+            inputs.append((worker, [tasks[idx] for idx in indices]))
+
+        results = run_multiprocessing(_process_observations, inputs, self.n_jobs)
+        processed = [None] * len(tasks)
+        for (key, indices), (outputs, reduced) in zip(chunks, results):
+            for idx, output in zip(indices, outputs):
+                processed[idx] = output
+            if self.irf_cache is not None:
+                self.irf_cache.reduced.update(reduced)
+
+        for spectrum_observation, containment in processed:
+            self.observations.append(spectrum_observation)
+
+        # Same state as after processing the last observation in this process
+        if processed:
+            self._on_vector = spectrum_observation.on_vector
+            self._off_vector = spectrum_observation.off_vector
+            self._aeff = spectrum_observation.aeff
+            self._edisp = spectrum_observation.edisp
+            self.containment = containment
+
+    def _make_chunks(self, tasks):
+        """Split the observations into chunks processed by one worker each.
+
+        With an IRF cache, observations sharing the reduced IRFs are put in
+        the same chunks, so that the IRFs are reduced once per chunk. A chunk
+        holds at most ``len(tasks) / n_jobs`` observations, so that all
+        processes get work.
+        """
+        n_jobs = self.n_jobs or multiprocessing.cpu_count()
+        size = max(1, int(np.ceil(len(tasks) / n_jobs)))
+
+        groups = OrderedDict()
+        for idx, (obs, bkg) in enumerate(tasks):
+            key = None
+            if self.irf_cache is not None:
+                offset = obs.pointing_radec.separation(bkg.on_region.center)
+                key = self.irf_cache.group_key(obs, offset)
+            groups.setdefault(key, []).append(idx)
+
+        chunks = []
+        for key, indices in groups.items():
+            for start in range(0, len(indices), size):
+                chunks.append((key, indices[start : start + size]))
+        return chunks
 
     def _alpha_ok(self, obs, bkg):
         """Check if observation fulfills alpha criterion"""
@@ -134,8 +214,13 @@ class SpectrumExtraction(object):
 
         if self.use_recommended_erange:
             try:
-                spectrum_observation.hi_threshold = obs.aeff.high_threshold
-                spectrum_observation.lo_threshold = obs.aeff.low_threshold
+                if self.irf_cache is not None:
+                    lo_threshold, hi_threshold = self.irf_cache.energy_thresholds(obs)
+                else:
+                    lo_threshold = obs.aeff.low_threshold
+                    hi_threshold = obs.aeff.high_threshold
+                spectrum_observation.hi_threshold = hi_threshold
+                spectrum_observation.lo_threshold = lo_threshold
             except KeyError:
                 log.warning("No thresholds defined for obs {}".format(obs))
 
@@ -193,6 +278,13 @@ class SpectrumExtraction(object):
         """
         log.info("Extract IRFs")
         offset = self._on_vector.offset
+        if self.irf_cache is not None:
+            self._aeff = self.irf_cache.effective_area_table(obs, offset, self.e_true)
+            self._edisp = self.irf_cache.energy_dispersion(
+                obs, offset, e_true=self.e_true, e_reco=self.e_reco
+            )
+            return
+
         self._aeff = obs.aeff.to_effective_area_table(offset, energy=self.e_true)
         self._edisp = obs.edisp.to_energy_dispersion(
             offset, e_reco=self.e_reco, e_true=self.e_true
@@ -271,3 +363,28 @@ class SpectrumExtraction(object):
         )
 
         # TODO : add more debug plots etc. here
+
+
+def _process_observations(args):
+    """Run `SpectrumExtraction.process` for a chunk of observations in a worker process.
+
+    The containment correction of every observation and the reduced IRFs
+    added to the IRF cache of the worker are returned as well, so that the
+    main process can collect them.
+    """
+    extraction, tasks = args
+    irf_cache = extraction.irf_cache
+    if irf_cache is not None:
+        known = set(key for key, _ in irf_cache.reduced.items())
+
+    results = []
+    for obs, bkg in tasks:
+        spectrum_observation = extraction.process(obs, bkg)
+        results.append((spectrum_observation, extraction.containment))
+
+    reduced = OrderedDict()
+    if irf_cache is not None:
+        for key, value in irf_cache.reduced.items():
+            if key not in known:
+                reduced[key] = value
+    return results, reduced
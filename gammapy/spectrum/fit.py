@@ -2,19 +2,109 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import logging
 import copy
+import multiprocessing
+from collections import OrderedDict
 import numpy as np
 import astropy.units as u
 from ..utils.scripts import make_path
 from ..utils.fitting import fit_iminuit
+from ..utils.parallel import run_multiprocessing
+from ..utils.table import table_from_row_data
 from .. import stats
-from .utils import CountsPredictor
+from .utils import _model_energy_unit, _BinnedIntegral
 from . import SpectrumObservationList, SpectrumObservation
 
-__all__ = ["SpectrumFit"]
+__all__ = ["SpectrumFit", "SpectrumBatchFit"]
 
 log = logging.getLogger(__name__)
 
 
+class _PackedObservations(object):
+    """Observations packed into contiguous arrays.
+
+    All per-bin quantities are stored in arrays of shape
+    ``(n_obs, n_bins_max)``, observations with fewer bins are padded with
+    zeros, and the energy dispersion matrices are stored in an array of
+    shape ``(n_obs, n_e_true_max, n_e_reco_max)``. Observations sharing
+    the same binning are grouped, so that the model is integrated only once
+    for every distinct binning (see `~gammapy.spectrum.utils._BinnedIntegral`).
+
+    Parameters
+    ----------
+    obs_list : `~gammapy.spectrum.SpectrumObservationList`
+        Observations
+    bins_in_fit_range : list of `~numpy.ndarray`
+        Bins participating in the fit for each observation
+    forward_folded : bool
+        Pack the IRFs
+    energy_unit : `~astropy.units.Unit`, optional
+        Unit of the true energy bin edges passed to the model
+    """
+
+    def __init__(
+        self, obs_list, bins_in_fit_range, forward_folded=True, energy_unit=None
+    ):
+        n_obs = len(obs_list)
+        self.n_bins = np.array([obs.e_reco.nbins for obs in obs_list])
+        shape = (n_obs, self.n_bins.max())
+
+        self.mask = np.zeros(shape, dtype=bool)
+        self.n_on = np.zeros(shape)
+        self.n_off = np.zeros(shape)
+        self.alpha = np.ones(shape)
+        self.areascal = np.zeros(shape)
+        self.livetime = np.zeros(n_obs)
+
+        for idx, obs in enumerate(obs_list):
+            n_bins = self.n_bins[idx]
+            self.mask[idx, :n_bins] = bins_in_fit_range[idx]
+            self.n_on[idx, :n_bins] = obs.on_vector.data.data.value
+            if obs.off_vector is not None:
+                self.n_off[idx, :n_bins] = obs.off_vector.data.data.value
+                self.alpha[idx, :n_bins] = obs.alpha
+            self.areascal[idx, :n_bins] = obs.on_vector.areascal
+            self.livetime[idx] = obs.livetime.to("s").value
+
+        self.aeff = None
+        self.edisp = None
+
+        if forward_folded:
+            edges = [obs.e_true.to(energy_unit) for obs in obs_list]
+            self._pack_irfs(obs_list)
+        else:
+            edges = [obs.e_reco for obs in obs_list]
+
+        self.groups = self._group(edges)
+
+    @staticmethod
+    def _group(edges_list):
+        groups = OrderedDict()
+        for idx, edges in enumerate(edges_list):
+            key = tuple(edges.to("TeV").value)
+            if key not in groups:
+                groups[key] = (_BinnedIntegral(edges), [])
+            groups[key][1].append(idx)
+        return list(groups.values())
+
+    def _pack_irfs(self, obs_list):
+        n_true = np.array([obs.aeff.energy.nbins for obs in obs_list])
+        self.aeff = np.zeros((len(obs_list), n_true.max()))
+        for idx, obs in enumerate(obs_list):
+            self.aeff[idx, : n_true[idx]] = obs.aeff.data.data.to("cm2").value
+
+        if all(obs.edisp is None for obs in obs_list):
+            return
+
+        shape = (len(obs_list), n_true.max(), self.n_bins.max())
+        self.edisp = np.zeros(shape)
+        for idx, obs in enumerate(obs_list):
+            if obs.edisp is None:
+                pdf_matrix = np.eye(n_true[idx])
+            else:
+                pdf_matrix = obs.edisp.pdf_matrix
+            self.edisp[idx, : n_true[idx], : self.n_bins[idx]] = pdf_matrix
+
+
 class SpectrumFit(object):
     """Orchestrate a 1D counts spectrum fit.
 
@@ -42,6 +132,10 @@ class SpectrumFit(object):
         Optimization backend for the fit
     """
 
+    # Maximum number of predicted counts evaluated in one pass for
+    # likelihood scans
+    BATCH_SIZE = 2 ** 22
+
     def __init__(
         self,
         obs_list,
@@ -60,6 +154,8 @@ class SpectrumFit(object):
 
         self._predicted_counts = None
         self._statval = None
+        self._arrays = None
+        self._counts_scale_cache = {}
 
         self._result = None
 
@@ -98,6 +194,7 @@ class SpectrumFit(object):
             obs_list = SpectrumObservationList([obs_list])
 
         self._obs_list = SpectrumObservationList(obs_list)
+        self._arrays = None
 
     @property
     def bins_in_fit_range(self):
@@ -108,10 +205,11 @@ class SpectrumFit(object):
     def predicted_counts(self):
         """Current value of predicted counts.
 
-        For each observation a tuple to counts for the on and off region is
-        returned.
+        For each observation an array of predicted counts is returned.
         """
-        return self._predicted_counts
+        if self._predicted_counts is None:
+            return None
+        return self._unpack(self._predicted_counts)
 
     @property
     def statval(self):
@@ -119,7 +217,9 @@ class SpectrumFit(object):
 
         For each observation the statval per bin is returned.
         """
-        return self._statval
+        if self._statval is None:
+            return None
+        return self._unpack(self._statval)
 
     @property
     def fit_range(self):
@@ -180,56 +280,117 @@ class SpectrumFit(object):
 
             self._bins_in_fit_range.append(intersection)
 
+        self._arrays = None
+
+    def _pack_observations(self):
+        """Pack observations into contiguous arrays.
+
+        This is done once before the likelihood is evaluated, so that every
+        evaluation is a single pass over all observations. Call it again if
+        the counts or IRFs of the observations are modified.
+        """
+        self._arrays = _PackedObservations(
+            self.obs_list,
+            self.bins_in_fit_range,
+            self.forward_folded,
+            energy_unit=_model_energy_unit(self._model),
+        )
+
+    def _unpack(self, data):
+        return [row[:n_bins] for row, n_bins in zip(data, self._arrays.n_bins)]
+
     def predict_counts(self):
         """Predict counts for all observations.
 
         The result is stored as ``predicted_counts`` attribute.
         """
-        predicted_counts = []
-        for obs in self.obs_list:
-            mu_sig = self._predict_counts_helper(obs, self._model, self.forward_folded)
-            predicted_counts.append(mu_sig)
-        self._predicted_counts = predicted_counts
+        self._predicted_counts = self._fold_model(
+            lambda binned_integral: binned_integral(self._model)
+        )
 
-    def _predict_counts_helper(self, obs, model, forward_folded=True):
-        """Predict counts for one observation.
+    def _fold_model(self, integrate, shape=()):
+        """Predict counts from the model integral in each bin.
 
         Parameters
         ----------
-        obs : `~gammapy.spectrum.SpectrumObservation`
-            Response functions
-        model : `~gammapy.spectrum.models.SpectralModel`
-            Source or background model
-        forward_folded : bool, default: True
-            Fold model with IRFs
+        integrate : callable
+            Function computing the model integral, with shape
+            ``shape + (n_bins,)``, for a `~gammapy.spectrum.utils._BinnedIntegral`
+        shape : tuple
+            Leading shape of the integrals, for several models at once
 
         Returns
-        ------
-        predicted_counts : `numpy.ndarray`
-            Predicted counts for one observation
+        -------
+        counts : `~numpy.ndarray`
+            Predicted counts with shape ``shape + (n_obs, n_bins_max)``
         """
-        predictor = CountsPredictor(model=model)
-        if forward_folded:
-            predictor.aeff = obs.aeff
-            predictor.edisp = obs.edisp
+        if self._arrays is None:
+            self._pack_observations()
+        arrays = self._arrays
+
+        if self.forward_folded:
+            flux = np.zeros(shape + arrays.aeff.shape)
         else:
-            predictor.e_true = obs.e_reco
+            flux = np.zeros(shape + arrays.n_on.shape)
+
+        # Integrate the model once per distinct true energy binning
+        unit = None
+        for binned_integral, idx in arrays.groups:
+            integral = integrate(binned_integral)
+            if unit is None:
+                unit = integral.unit
+                value = integral.value
+            else:
+                value = integral.to(unit).value
+            flux[..., idx, : value.shape[-1]] = value[..., np.newaxis, :]
+
+        if self.forward_folded:
+            flux *= arrays.aeff
+
+        scale, multiply_livetime = self._counts_scale(unit)
+        if multiply_livetime:
+            flux *= arrays.livetime[:, np.newaxis]
+        flux *= scale
+
+        if arrays.edisp is not None:
+            counts = np.einsum("...ij,ijk->...ik", flux, arrays.edisp)
+        else:
+            counts = flux
 
-        predictor.livetime = obs.livetime
+        # Apply AREASCAL column
+        return counts * arrays.areascal
 
-        predictor.run()
-        counts = predictor.npred.data.data
+    def _counts_scale(self, unit):
+        """Factor converting the folded model integral to counts.
 
-        # Check count unit (~unit of model amplitude)
-        if counts.unit.is_equivalent(""):
-            counts = counts.value
-        else:
-            raise ValueError("Predicted counts {}".format(counts))
+        The result only depends on the unit of the model integral, so it is
+        cached to avoid unit arithmetic in every likelihood evaluation.
 
-        # Apply AREASCAL column
-        counts *= obs.on_vector.areascal
+        Returns
+        -------
+        scale : float
+            Unit conversion factor
+        multiply_livetime : bool
+            Whether the livetime has to be applied
+        """
+        key = (unit, self.forward_folded)
+        if key in self._counts_scale_cache:
+            return self._counts_scale_cache[key]
 
-        return counts
+        if self.forward_folded:
+            unit = unit * u.cm ** 2
+
+        # Multiply with livetime if not already contained in aeff or model
+        multiply_livetime = unit.is_equivalent("s-1")
+        if multiply_livetime:
+            unit = unit * u.s
+
+        # Check count unit (~unit of model amplitude)
+        if not unit.is_equivalent(""):
+            raise ValueError("Predicted counts {}".format(unit))
+
+        self._counts_scale_cache[key] = unit.to(""), multiply_livetime
+        return self._counts_scale_cache[key]
 
     def calc_statval(self):
         """Calc statistic for all observations.
@@ -237,39 +398,37 @@ class SpectrumFit(object):
         The result is stored as attribute ``statval``, bin outside the fit
         range are set to 0.
         """
-        statval = []
-        for obs, npred in zip(self.obs_list, self.predicted_counts):
-            on_stat = self._calc_statval_helper(obs, npred)
-            statval.append(on_stat)
-        self._statval = statval
-        self._restrict_statval()
+        arrays = self._arrays
+        statval = self._calc_statval_helper(arrays, self._predicted_counts)
+        self._statval = np.where(arrays.mask, statval, 0)
 
-    def _calc_statval_helper(self, obs, prediction):
-        """Calculate ``statval`` for one observation.
+    def _calc_statval_helper(self, arrays, prediction):
+        """Calculate ``statval`` for all observations.
 
         Parameters
         ----------
-        obs : `~gammapy.spectrum.SpectrumObservation`
+        arrays : `_PackedObservations`
             Measured counts
-        prediction : tuple of `~numpy.ndarray`
+        prediction : `~numpy.ndarray`
             Predicted counts
 
         Returns
         ------
-        statsval : tuple of `~numpy.ndarray`
+        statsval : `~numpy.ndarray`
             Statval
         """
         if self.stat == "cash":
-            return stats.cash(n_on=obs.on_vector.data.data.value, mu_on=prediction)
+            return stats.cash(n_on=arrays.n_on, mu_on=prediction)
         elif self.stat == "cstat":
-            return stats.cstat(n_on=obs.on_vector.data.data.value, mu_on=prediction)
+            return stats.cstat(n_on=arrays.n_on, mu_on=prediction)
         elif self.stat == "wstat":
-            on_stat_ = stats.wstat(
-                n_on=obs.on_vector.data.data.value,
-                n_off=obs.off_vector.data.data.value,
-                alpha=obs.alpha,
-                mu_sig=prediction,
-            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                on_stat_ = stats.wstat(
+                    n_on=arrays.n_on,
+                    n_off=arrays.n_off,
+                    alpha=arrays.alpha,
+                    mu_sig=prediction,
+                )
             return np.nan_to_num(on_stat_)
         else:
             raise NotImplementedError("{}".format(self.stat))
@@ -287,16 +446,89 @@ class SpectrumFit(object):
         self._model.parameters = parameters
         self.predict_counts()
         self.calc_statval()
-        total_stat = np.sum([np.sum(v) for v in self.statval], dtype=np.float64)
-        return total_stat
+        return np.sum(self._statval, dtype=np.float64)
+
+    def _total_stat_scaled(self, parameters, scales):
+        """Statistic for the predicted counts multiplied by each of ``scales``.
+
+        This evaluates the likelihood profile of a parameter that the model
+        is proportional to (e.g. the amplitude) in a single pass.
+
+        Parameters
+        ----------
+        parameters : `~gammapy.utils.fitting.Parameters`
+            Model parameters
+        scales : `~numpy.ndarray`
+            Factors applied to the predicted counts
+
+        Returns
+        -------
+        stat : `~numpy.ndarray`
+            Statistic summed over all bins and all observations, for each
+            value in ``scales``
+        """
+        self._model.parameters = parameters
+        self.predict_counts()
+
+        scales = np.asarray(scales, dtype=np.float64)
+        prediction = scales[..., np.newaxis, np.newaxis] * self._predicted_counts
+        return self._total_stat_prediction(prediction)
+
+    def _total_stat_prediction(self, prediction):
+        """Statistic summed over all bins and observations.
 
-    def _restrict_statval(self):
-        """Apply valid fit range to statval.
+        ``prediction`` can have leading axes, the statistic is computed for
+        each of the leading indices.
         """
-        for statval, valid_range in zip(self.statval, self.bins_in_fit_range):
-            # Find bins outside safe range
-            idx = np.where(np.invert(valid_range))[0]
-            statval[idx] = 0
+        statval = self._calc_statval_helper(self._arrays, prediction)
+        statval = np.where(self._arrays.mask, statval, 0)
+        return statval.reshape(statval.shape[:-2] + (-1,)).sum(axis=-1)
+
+    def _total_stat_batch(self, values):
+        """Statistic for many parameter values at once.
+
+        The model is evaluated for all values in one broadcast pass (in
+        chunks, to limit the memory usage).
+
+        Parameters
+        ----------
+        values : dict
+            Parameter values (1-dim arrays of the same length) by parameter
+            name, the other parameters are taken from the model
+
+        Returns
+        -------
+        stat : `~numpy.ndarray`
+            Statistic summed over all bins and all observations, for each
+            set of parameter values
+        """
+        if self._arrays is None:
+            self._pack_observations()
+
+        n_values = len(next(iter(values.values())))
+        n_obs, n_bins = self._arrays.n_on.shape
+        if self._arrays.aeff is not None:
+            n_bins = max(n_bins, self._arrays.aeff.shape[1])
+        chunk_size = max(1, self.BATCH_SIZE // (n_obs * n_bins))
+
+        stat = np.empty(n_values)
+        for start in range(0, n_values, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            values_chunk = dict((k, v[chunk]) for k, v in values.items())
+            counts = self._fold_model(
+                lambda binned_integral: binned_integral.integrate_batch(
+                    self._model, values_chunk
+                ),
+                shape=(len(stat[chunk]),),
+            )
+            stat[chunk] = self._total_stat_prediction(counts)
+        return stat
+
+    def _parameter_values(self, parname, parvals):
+        """Parameter values as 1-dim float array in the parameter unit."""
+        if isinstance(parvals, u.Quantity):
+            parvals = parvals.to(self._model.parameters[parname].unit).value
+        return np.atleast_1d(np.asarray(parvals, dtype=np.float64))
 
     def _check_valid_fit(self):
         """Helper function to give useful error messages."""
@@ -315,22 +547,102 @@ class SpectrumFit(object):
     def likelihood_1d(self, model, parname, parvals):
         """Compute likelihood profile.
 
+        The statistic is evaluated for all parameter values in one pass, the
+        other parameters are kept at their values in ``model``. See
+        `likelihood_profile` for a profile where the other parameters are
+        re-optimised.
+
         Parameters
         ----------
         model : `~gammapy.spectrum.models.SpectralModel`
             Model to draw likelihood profile for
         parname : str
             Parameter to calculate profile for
-        parvals : `~astropy.units.Quantity`
+        parvals : `~numpy.ndarray` or `~astropy.units.Quantity`
+            Parameter values
+
+        Returns
+        -------
+        likelihood : `~numpy.ndarray`
+            Statistic for each parameter value
+        """
+        self._model = model
+        self._pack_observations()
+        values = self._parameter_values(parname, parvals)
+        return self._total_stat_batch({parname: values})
+
+    def likelihood_2d(self, model, parname_x, parvals_x, parname_y, parvals_y):
+        """Compute likelihood on a grid of two parameters.
+
+        The statistic is evaluated for all grid points in one pass, the
+        other parameters are kept at their values in ``model``.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Model to compute the likelihood for
+        parname_x, parname_y : str
+            Parameter names
+        parvals_x, parvals_y : `~numpy.ndarray` or `~astropy.units.Quantity`
             Parameter values
+
+        Returns
+        -------
+        likelihood : `~numpy.ndarray`
+            Statistic with shape ``(len(parvals_x), len(parvals_y))``
         """
-        likelihood = []
         self._model = model
-        for val in parvals:
-            self._model.parameters[parname].value = val
-            stat = self.total_stat(self._model.parameters)
-            likelihood.append(stat)
-        return np.array(likelihood)
+        self._pack_observations()
+        x, y = np.meshgrid(
+            self._parameter_values(parname_x, parvals_x),
+            self._parameter_values(parname_y, parvals_y),
+            indexing="ij",
+        )
+        stat = self._total_stat_batch({parname_x: x.ravel(), parname_y: y.ravel()})
+        return stat.reshape(x.shape)
+
+    def likelihood_profile(self, model, parname, parvals, opts_minuit=None, n_jobs=1):
+        """Compute likelihood profile with re-optimised parameters.
+
+        For each value the parameter is frozen and the other free parameters
+        of ``model`` are fitted, starting from the best fit values of the
+        previous point. The values are split in ``n_jobs`` consecutive chunks,
+        which are fitted in parallel (see
+        `~gammapy.utils.parallel.run_multiprocessing`). ``model`` itself is
+        not modified.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Model with start values, usually the best fit model
+        parname : str
+            Parameter to calculate profile for
+        parvals : `~numpy.ndarray` or `~astropy.units.Quantity`
+            Parameter values
+        opts_minuit : dict (optional)
+            Options passed to `iminuit.Minuit` constructor
+        n_jobs : int
+            Number of processes. If None, one process per CPU is used.
+
+        Returns
+        -------
+        profile : `~astropy.table.Table`
+            Table with the parameter values (column ``parname``), the
+            statistic (column ``stat``) and the best fit values of the other
+            free parameters
+        """
+        fit = copy.copy(self)
+        fit.__dict__.pop("_iminuit_fit", None)
+        fit._result = None
+        fit._model = model.copy()
+        fit._pack_observations()
+        values = fit._parameter_values(parname, parvals)
+
+        n_chunks = n_jobs or multiprocessing.cpu_count()
+        chunks = [_ for _ in np.array_split(values, n_chunks) if len(_) > 0]
+        tasks = [(fit, parname, chunk, opts_minuit) for chunk in chunks]
+        results = run_multiprocessing(_fit_likelihood_profile, tasks, n_jobs)
+        return table_from_row_data([row for rows in results for row in rows])
 
     def plot_likelihood_1d(self, ax=None, **kwargs):
         """Plot 1-dim likelihood profile.
@@ -355,6 +667,8 @@ class SpectrumFit(object):
         opts_minuit : dict (optional)
             Options passed to `iminuit.Minuit` constructor
         """
+        self._pack_observations()
+
         if self.method == "iminuit":
             self._fit_iminuit(opts_minuit)
         else:
@@ -387,12 +701,16 @@ class SpectrumFit(object):
 
         statname = self.stat
 
+        true_fit_range = self.true_fit_range
+        statvals = self.statval
+        predicted_counts = self.predicted_counts
+
         results = []
         for idx, obs in enumerate(self.obs_list):
-            fit_range = self.true_fit_range[idx]
-            statval = np.sum(self.statval[idx])
-            stat_per_bin = self.statval[idx]
-            npred = copy.deepcopy(self.predicted_counts[idx])
+            fit_range = true_fit_range[idx]
+            statval = np.sum(statvals[idx])
+            stat_per_bin = statvals[idx]
+            npred = copy.deepcopy(predicted_counts[idx])
 
             results.append(
                 SpectrumFitResult(
@@ -438,3 +756,166 @@ class SpectrumFit(object):
         filename = outdir / "fit_result_{}.yaml".format(modelname)
         log.info("Writing {}".format(filename))
         self.result[0].to_yaml(filename)
+
+
+class SpectrumBatchFit(SpectrumFit):
+    """Fit many counts realisations of the same observations.
+
+    Toy Monte Carlo studies fit one model to many simulated counts spectra
+    that share the binning and IRFs. This class packs the observations and
+    their IRFs once and only replaces the counts for every realisation, so
+    that the forward folding setup is not repeated. Each fit starts from the
+    best fit values of the previous realisation, or from the initial values
+    if that fit failed.
+
+    The parameters are the same as for `~gammapy.spectrum.SpectrumFit`, the
+    observations only define the binning, IRFs, livetime and exposure ratio
+    used for all realisations.
+
+    Examples
+    --------
+    ::
+
+        from gammapy.spectrum import SpectrumSimulation, SpectrumBatchFit
+        sim = SpectrumSimulation(aeff=aeff, edisp=edisp, source_model=model,
+                                 livetime=livetime, background_model=bkg_model,
+                                 alpha=0.2)
+        result = sim.run_batch(n_obs=1000, random_state=0)
+        fit = SpectrumBatchFit(result[0], model.copy())
+        table = fit.fit_batch(result.on_counts, result.off_counts, n_jobs=4)
+        print(table["index"].std())
+    """
+
+    def fit_batch(self, on_counts, off_counts=None, opts_minuit=None, n_jobs=1):
+        """Fit the model to every counts realisation.
+
+        The realisations are split in ``n_jobs`` consecutive chunks, which
+        are fitted in parallel (see
+        `~gammapy.utils.parallel.run_multiprocessing`). The model is not
+        modified.
+
+        Parameters
+        ----------
+        on_counts : `~numpy.ndarray`
+            ON counts with shape ``(n, n_bins)`` for a single observation, or
+            ``(n, n_obs, n_bins_max)`` for several observations (padded with
+            zeros like in `~gammapy.spectrum.SpectrumFit`)
+        off_counts : `~numpy.ndarray`, optional
+            OFF counts with the same shape. If not given, the OFF counts of
+            the observations are used.
+        opts_minuit : dict (optional)
+            Options passed to `iminuit.Minuit` constructor
+        n_jobs : int
+            Number of processes. If None, one process per CPU is used.
+
+        Returns
+        -------
+        result : `~numpy.ndarray`
+            Structured array with one entry per realisation. The fields are
+            the best fit value and error (``<name>_err``) of each free
+            parameter, the statistic (``stat``), the test statistic with
+            respect to no source counts (``ts``) and whether the fit
+            converged (``success``). The test statistic is only computed
+            for ``wstat``, where the background is profiled for zero source
+            counts as well. It is NaN for ``cash`` and ``cstat``.
+        """
+        fit = copy.copy(self)
+        fit.__dict__.pop("_iminuit_fit", None)
+        fit._result = None
+        fit._model = self._model.copy()
+        fit._pack_observations()
+
+        on_counts = self._batch_counts(fit._arrays, on_counts)
+        if off_counts is not None:
+            off_counts = self._batch_counts(fit._arrays, off_counts)
+
+        n_chunks = n_jobs or multiprocessing.cpu_count()
+        tasks = []
+        for idx in np.array_split(np.arange(len(on_counts)), n_chunks):
+            if len(idx) == 0:
+                continue
+            off = None if off_counts is None else off_counts[idx]
+            tasks.append((fit, on_counts[idx], off, opts_minuit))
+        results = run_multiprocessing(_fit_batch, tasks, n_jobs)
+
+        dtype = []
+        for par in fit._model.parameters.parameters:
+            if not par.frozen:
+                dtype += [(str(par.name), float), (str(par.name + "_err"), float)]
+        dtype += [(str("stat"), float), (str("ts"), float), (str("success"), bool)]
+        return np.array([row for rows in results for row in rows], dtype=dtype)
+
+    @staticmethod
+    def _batch_counts(arrays, counts):
+        counts = np.asarray(counts, dtype=np.float64)
+        if counts.ndim == 2:
+            counts = counts[:, np.newaxis, :]
+
+        if counts.shape[1:] != arrays.n_on.shape:
+            raise ValueError(
+                "Counts shape {} doesn't match observations {}".format(
+                    counts.shape[1:], arrays.n_on.shape
+                )
+            )
+        return counts
+
+
+def _fit_batch(args):
+    """Fit counts realisations, see `SpectrumBatchFit.fit_batch`."""
+    fit, on_counts, off_counts, opts_minuit = args
+    arrays = fit._arrays
+    parameters = fit._model.parameters
+    initial = [par.value for par in parameters.parameters]
+    free = [par.name for par in parameters.parameters if not par.frozen]
+
+    rows = []
+    for idx in range(len(on_counts)):
+        arrays.n_on = on_counts[idx]
+        if off_counts is not None:
+            arrays.n_off = off_counts[idx]
+
+        minuit = fit_iminuit(
+            parameters=parameters, function=fit.total_stat, opts_minuit=opts_minuit
+        )
+        stat = fit.total_stat(parameters)
+        if fit.stat == "wstat":
+            # WStat profiles the background, also for zero source counts
+            npred_null = np.zeros_like(fit._predicted_counts)
+            ts = fit._total_stat_prediction(npred_null) - stat
+        else:
+            ts = np.nan
+
+        row = []
+        for name in free:
+            if parameters.covariance is None:
+                error = np.nan
+            else:
+                error = parameters.error(name)
+            row += [parameters[name].value, error]
+        success = minuit.migrad_ok()
+        rows.append(tuple(row + [stat, ts, success]))
+
+        if not success:
+            for par, value in zip(parameters.parameters, initial):
+                par.value = value
+    return rows
+
+
+def _fit_likelihood_profile(args):
+    """Fit likelihood profile points, see `SpectrumFit.likelihood_profile`."""
+    fit, parname, parvals, opts_minuit = args
+    parameters = fit._model.parameters
+    parameters[parname].frozen = True
+    free = [par.name for par in parameters.parameters if not par.frozen]
+
+    rows = []
+    for value in parvals:
+        parameters[parname].value = value
+        fit_iminuit(
+            parameters=parameters, function=fit.total_stat, opts_minuit=opts_minuit
+        )
+        row = OrderedDict([(parname, value), ("stat", fit.total_stat(parameters))])
+        for name in free:
+            row[name] = parameters[name].value
+        rows.append(row)
+    return rows
@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import copy
 import logging
 from collections import OrderedDict
 import numpy as np
@@ -9,6 +10,7 @@ from astropy.io.registry import IORegistryError
 from ..utils.scripts import make_path
 from ..utils.table import table_standardise_units_copy, table_from_row_data
 from ..utils.fitting import fit_iminuit
+from ..utils.parallel import run_multiprocessing
 from .models import PowerLaw
 from .powerlaw import power_law_integral_flux
 from . import SpectrumObservationList, SpectrumObservation
@@ -622,12 +624,17 @@ class FluxPointEstimator(object):
         Energy groups (usually output of `~gammapy.spectrum.SpectrumEnergyGroupMaker`)
     model : `~gammapy.spectrum.models.SpectralModel`
         Global model (usually output of `~gammapy.spectrum.SpectrumFit`)
+    n_jobs : int
+        Number of processes used to fit the energy groups in parallel.
+        If None, one process per CPU is used. If ``n_jobs`` is not 1, the
+        ``fit`` attribute is not set by `compute_points`.
     """
 
-    def __init__(self, obs, groups, model):
+    def __init__(self, obs, groups, model, n_jobs=1):
         self.obs = obs
         self.groups = groups
         self.model = model
+        self.n_jobs = n_jobs
         self.flux_points = None
         self._fit = None
 
@@ -656,14 +663,20 @@ class FluxPointEstimator(object):
         self._obs = SpectrumObservationList(obs)
 
     def compute_points(self):
-        rows = []
+        groups = []
         for group in self.groups:
             if group.bin_type != "normal":
                 log.debug("Skipping energy group:\n{}".format(group))
                 continue
+            groups.append(group)
 
-            row = self.compute_flux_point(group)
-            rows.append(row)
+        if self.n_jobs == 1:
+            rows = [self.compute_flux_point(group) for group in groups]
+        else:
+            worker = copy.copy(self)
+            worker.groups, worker.flux_points, worker._fit = None, None, None
+            tasks = [(worker, group) for group in groups]
+            rows = run_multiprocessing(_compute_flux_point, tasks, self.n_jobs)
 
         meta = OrderedDict([("method", "TODO"), ("SED_TYPE", "dnde")])
         table = table_from_row_data(rows=rows, meta=meta)
@@ -722,37 +735,43 @@ class FluxPointEstimator(object):
         dnde_ul : `~astropy.units.Quantity`
             Flux point upper limit.
         """
-        from scipy.optimize import brentq
-
         model = fit.result[0].model.copy()
-        # this is a prototype for fast flux point upper limit
-        # calculation using brentq
-        amplitude = model.parameters["amplitude"].value / 1E-12
-        amplitude_err = model.parameters.error("amplitude") / 1E-12
-
-        if negative:
-            amplitude_max = amplitude
-            amplitude_min = amplitude_max - 1E3 * amplitude_err
-        else:
-            amplitude_max = amplitude + 1E3 * amplitude_err
-            amplitude_min = amplitude
-
-        def ts_diff(x):
-            model.parameters["amplitude"].value = x * 1E-12
-            stat = fit.total_stat(model.parameters)
-            return (stat_best_fit + delta_ts) - stat
+        amplitude = model.parameters["amplitude"].value
+        amplitude_err = model.parameters.error("amplitude")
+        sign = -1 if negative else 1
 
-        try:
-            result = brentq(
-                ts_diff, amplitude_min, amplitude_max, maxiter=100, rtol=1e-2
-            )
-            model.parameters["amplitude"].value = result * 1E-12
-            return model(model.parameters["reference"].quantity)
-        except (RuntimeError, ValueError):
-            # Where the root finding fails NaN is set as amplitude
+        if not amplitude_err > 0 or not np.isfinite(amplitude_err):
             log.debug("Flux point upper limit computation failed.")
             return np.nan * u.Unit(fit.model.parameters["amplitude"].unit)
 
+        # The predicted counts are proportional to the amplitude, so the
+        # likelihood profile is computed by scaling the counts predicted
+        # for an amplitude equal to its error
+        model.parameters["amplitude"].value = amplitude_err
+
+        def ts_diff(offsets):
+            scales = amplitude / amplitude_err + sign * offsets
+            stat = fit._total_stat_scaled(model.parameters, scales)
+            return (stat_best_fit + delta_ts) - stat
+
+        # Find the first crossing on a coarse grid of offsets from the best
+        # fit amplitude (in units of its error), then on a fine grid
+        offsets = np.append(0, np.logspace(-3, 3, 121))
+        for _ in range(2):
+            values = ts_diff(offsets)
+            idx = np.where(values <= 0)[0]
+            if values[0] <= 0 or len(idx) == 0:
+                log.debug("Flux point upper limit computation failed.")
+                return np.nan * u.Unit(fit.model.parameters["amplitude"].unit)
+            idx = idx[0]
+            lo, hi = offsets[idx - 1], offsets[idx]
+            offsets = np.linspace(lo, hi, 101)
+
+        # Interpolate linearly between the last two profile points
+        offset = lo + (hi - lo) * values[idx - 1] / (values[idx - 1] - values[idx])
+        model.parameters["amplitude"].value = amplitude + sign * offset * amplitude_err
+        return model(model.parameters["reference"].quantity)
+
     def compute_flux_point_sqrt_ts(self, fit, stat_best_fit):
         """
         Compute sqrt(TS) for flux point.
@@ -793,30 +812,24 @@ class FluxPointEstimator(object):
         energy_min = energy_group.energy_min
         energy_max = energy_group.energy_max
 
-        quality_orig = []
-
-        for index in range(len(self.obs)):
-            # Set quality bins to only bins in energy_group
-            quality_orig_unit = self.obs[index].on_vector.quality
-            quality_len = len(quality_orig_unit)
-            quality_orig.append(quality_orig_unit)
-            quality = np.zeros(quality_len, dtype=int)
-            for bin in range(quality_len):
-                if (
-                    (bin < energy_group.bin_idx_min)
-                    or (bin > energy_group.bin_idx_max)
-                    or (energy_group.bin_type != "normal")
-                ):
-                    quality[bin] = 1
-            self.obs[index].on_vector.quality = quality
+        # Set quality bins to only bins in energy_group
+        quality_orig = [obs.on_vector.quality for obs in self.obs]
+        for obs in self.obs:
+            bins = np.arange(len(obs.on_vector.quality))
+            quality = (bins < energy_group.bin_idx_min) | (
+                bins > energy_group.bin_idx_max
+            )
+            quality |= energy_group.bin_type != "normal"
+            obs.on_vector.quality = quality.astype(int)
 
         # Set reference and remove min amplitude
         model.parameters["reference"].value = energy_ref.to("TeV").value
 
-        self._fit = SpectrumFit(self.obs, model)
-
-        for index in range(len(quality_orig)):
-            self.obs[index].on_vector.quality = quality_orig[index]
+        try:
+            self._fit = SpectrumFit(self.obs, model)
+        finally:
+            for obs, quality in zip(self.obs, quality_orig):
+                obs.on_vector.quality = quality
 
         log.debug(
             "Calling Sherpa fit for flux point "
@@ -859,6 +872,12 @@ class FluxPointEstimator(object):
         )
 
 
+def _compute_flux_point(args):
+    """Run `FluxPointEstimator.compute_flux_point` in a worker process."""
+    estimator, energy_group = args
+    return estimator.compute_flux_point(energy_group)
+
+
 class FluxPointProfiles(object):
     """Flux point likelihood profiles.
 
@@ -890,10 +890,9 @@ class SpectrumObservationStacker(object):
 
         Calls `gammapy.irf.IRFStacker.stack_aeff`.
         """
-        irf_stacker = IRFStacker(
-            list_aeff=[obs.aeff for obs in self.obs_list],
-            list_livetime=[obs.livetime for obs in self.obs_list],
-        )
+        irf_stacker = IRFStacker()
+        for obs in self.obs_list:
+            irf_stacker.add(obs.aeff, obs.livetime)
         irf_stacker.stack_aeff()
         self.stacked_aeff = irf_stacker.stacked_aeff
 
@@ -902,13 +901,9 @@ class SpectrumObservationStacker(object):
 
         Calls `~gammapy.irf.IRFStacker.stack_edisp`
         """
-        irf_stacker = IRFStacker(
-            list_aeff=[obs.aeff for obs in self.obs_list],
-            list_livetime=[obs.livetime for obs in self.obs_list],
-            list_edisp=[obs.edisp for obs in self.obs_list],
-            list_low_threshold=[obs.lo_threshold for obs in self.obs_list],
-            list_high_threshold=[obs.hi_threshold for obs in self.obs_list],
-        )
+        irf_stacker = IRFStacker()
+        for obs in self.obs_list:
+            irf_stacker.add_observation(obs)
         irf_stacker.stack_edisp()
         self.stacked_edisp = irf_stacker.stacked_edisp
 
@@ -1,12 +1,12 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+import numpy as np
 from astropy.table import Table, Column
 import astropy.units as u
 from gammapy.stats import excess_matching_significance_on_off
-from gammapy.spectrum.models import PowerLaw
-from gammapy.spectrum.utils import CountsPredictor
 
-__all__ = ["SensitivityEstimator"]
+__all__ = ["SensitivityEstimator", "differential_sensitivity"]
 
 
 class SensitivityEstimator(object):
@@ -75,79 +75,166 @@ class SensitivityEstimator(object):
 
     def run(self):
         """Run the computation."""
-
-        # TODO: let the user decide on energy binning
-        # then integrate bkg model and gamma over those energy bins.
-        energy = self.irf.bkg.energy.log_center()
-
-        bkg_counts = (self.irf.bkg.data.data * self.livetime).value
-
-        excess_counts = excess_matching_significance_on_off(
-            n_off=bkg_counts / self.alpha, alpha=self.alpha, significance=self.sigma
-        )
-        is_gamma_limited = excess_counts < self.gamma_min
-        excess_counts[is_gamma_limited] = self.gamma_min
-
-        model = PowerLaw(
-            index=self.slope,
-            amplitude=1 * u.Unit("cm-2 s-1 TeV-1"),
-            reference=1 * u.TeV,
-        )
-
-        # TODO: simplify the following computation
-        predictor = CountsPredictor(
-            model, aeff=self.irf.aeff, edisp=self.irf.rmf, livetime=self.livetime
-        )
-        predictor.run()
-        counts = predictor.npred.data.data.value
-        phi_0 = excess_counts / counts * u.Unit("cm-2 s-1 TeV-1")
-        # TODO: should use model.__call__ here
-        dnde_model = model.evaluate(
-            energy=energy, index=self.slope, amplitude=1, reference=1 * u.TeV
+        result = differential_sensitivity(
+            irfs=[self.irf],
+            livetime=self.livetime,
+            slope=self.slope,
+            alpha=self.alpha,
+            sigma=self.sigma,
+            gamma_min=self.gamma_min,
         )
-        diff_flux = (phi_0 * dnde_model * energy ** 2).to("erg / (cm2 s)")
 
         # TODO: take self.bkg_sys into account
         # and add a criterion 'bkg sys'
-        criterion = []
-        for idx in range(len(energy)):
-            if is_gamma_limited[idx]:
-                c = "gamma"
-            else:
-                c = "significance"
-            criterion.append(c)
-
         table = Table(
             [
                 Column(
-                    data=energy,
+                    data=result["energy"],
                     name="energy",
                     format="5g",
                     description="Reconstructed Energy",
                 ),
                 Column(
-                    data=diff_flux,
+                    data=result["e2dnde"][0],
                     name="e2dnde",
                     format="5g",
                     description="Energy squared times differential flux",
                 ),
                 Column(
-                    data=excess_counts,
+                    data=result["excess"][0],
                     name="excess",
                     format="5g",
                     description="Number of excess counts in the bin",
                 ),
                 Column(
-                    data=bkg_counts,
+                    data=result["background"][0],
                     name="background",
                     format="5g",
                     description="Number of background counts in the bin",
                 ),
                 Column(
-                    data=criterion,
+                    data=result["criterion"][0],
                     name="criterion",
                     description="Sensitivity-limiting criterion",
                 ),
             ]
         )
         self._results_table = table
+
+
+def differential_sensitivity(
+    irfs, livetime, slope=2., alpha=0.2, sigma=5., gamma_min=10.
+):
+    """Differential sensitivity for many IRFs and observation parameters.
+
+    Vectorised version of `~gammapy.spectrum.SensitivityEstimator`:
+    ``livetime``, ``slope`` and ``alpha`` are broadcast against each other,
+    and the sensitivity is computed for every IRF and every combination in
+    one pass, without Python loops over IRFs, parameters or energy bins.
+
+    Parameters
+    ----------
+    irfs : list of `~gammapy.irf.CTAPerf`
+        IRFs, all with the same true and reconstructed energy binning
+    livetime : `~astropy.units.Quantity`
+        Livetime
+    slope : array_like
+        Index of the spectral shape (Power-law), should be positive (>0)
+    alpha : array_like
+        On/OFF normalisation
+    sigma : float
+        Minimum significance
+    gamma_min : float
+        Minimum number of gamma-rays
+
+    Returns
+    -------
+    result : `~collections.OrderedDict`
+        Reconstructed energy (``energy``) and, with shape
+        ``(n_irfs,) + shape + (n_energy,)`` where ``shape`` is the broadcast
+        shape of ``livetime``, ``slope`` and ``alpha``: energy squared times
+        differential flux (``e2dnde``), number of excess (``excess``) and
+        background (``background``) counts and sensitivity-limiting
+        criterion (``criterion``)
+
+    Examples
+    --------
+    Sensitivity for two IRFs, three livetimes and two values of alpha::
+
+        import numpy as np
+        import astropy.units as u
+        from gammapy.irf import CTAPerf
+        from gammapy.spectrum import differential_sensitivity
+
+        irfs = [CTAPerf.read(filename) for filename in filenames]
+        livetime = [0.5, 5, 50] * u.h
+        alpha = [[0.1], [0.2]]
+        result = differential_sensitivity(irfs, livetime=livetime, alpha=alpha)
+        print(result["e2dnde"].shape)  # (2, 2, 3, n_energy)
+    """
+    livetime, slope, alpha = np.broadcast_arrays(
+        u.Quantity(livetime).to("s").value,
+        np.asarray(slope, dtype=np.float64),
+        np.asarray(alpha, dtype=np.float64),
+    )
+    shape = livetime.shape
+    livetime, slope, alpha = livetime.ravel(), slope.ravel(), alpha.ravel()
+
+    # TODO: let the user decide on energy binning
+    # then integrate bkg model and gamma over those energy bins.
+    energy = irfs[0].bkg.energy.log_center().to("TeV")
+    e_true = irfs[0].aeff.energy.bins.to("TeV").value
+
+    # IRFs stacked along the first axis
+    aeff = np.array([irf.aeff.data.data.to("cm2").value for irf in irfs])
+    pdf_matrix = np.array([irf.rmf.pdf_matrix for irf in irfs])
+    bkg_rate = np.array([irf.bkg.data.data.to("s-1").value for irf in irfs])
+
+    # Counts for a power law with amplitude 1 cm-2 s-1 TeV-1 at 1 TeV,
+    # with shape (n_irfs, n_values, n_energy)
+    flux = _power_law_integral(e_true[:-1], e_true[1:], slope[:, np.newaxis])
+    counts = np.einsum("kt,it,itr->ikr", flux, aeff, pdf_matrix)
+    counts *= livetime[:, np.newaxis]
+
+    bkg_counts = bkg_rate[:, np.newaxis, :] * livetime[:, np.newaxis]
+    alpha = alpha[:, np.newaxis]
+    excess_counts = excess_matching_significance_on_off(
+        n_off=bkg_counts / alpha, alpha=alpha, significance=sigma
+    )
+    # Bins where the excess is not finite are also limited by ``gamma_min``
+    with np.errstate(invalid="ignore"):
+        is_gamma_limited = ~(excess_counts >= gamma_min)
+    excess_counts[is_gamma_limited] = gamma_min
+
+    phi_0 = excess_counts / counts * u.Unit("cm-2 s-1 TeV-1")
+    dnde_model = np.power(energy.value, -slope[:, np.newaxis])
+    diff_flux = (phi_0 * dnde_model * energy ** 2).to("erg / (cm2 s)")
+
+    # TODO: take bkg_sys into account and add a criterion 'bkg sys'
+    criterion = np.where(is_gamma_limited, "gamma", "significance")
+
+    shape = (len(irfs),) + shape + (len(energy),)
+    return OrderedDict(
+        [
+            ("energy", energy),
+            ("e2dnde", diff_flux.reshape(shape)),
+            ("excess", excess_counts.reshape(shape)),
+            ("background", bkg_counts.reshape(shape)),
+            ("criterion", criterion.reshape(shape)),
+        ]
+    )
+
+
+def _power_law_integral(emin, emax, index):
+    """Integral of a power law with amplitude 1 and reference energy 1.
+
+    See `~gammapy.spectrum.models.PowerLaw.integral`, ``index`` can be an
+    array.
+    """
+    val = 1 - index
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(
+            np.isclose(index, 1),
+            np.log(emax) - np.log(emin),
+            (np.power(emax, val) - np.power(emin, val)) / val,
+        )
@@ -2,13 +2,14 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 from collections import OrderedDict
 import logging
-from ..utils.random import get_random_state
+import numpy as np
+from ..utils.random import get_random_state, sample_poisson
 from ..utils.energy import EnergyBounds
 from .utils import CountsPredictor
 from .core import PHACountsSpectrum
 from .observation import SpectrumObservation, SpectrumObservationList
 
-__all__ = ["SpectrumSimulation"]
+__all__ = ["SpectrumSimulation", "SpectrumSimulationResult"]
 
 log = logging.getLogger(__name__)
 
@@ -124,6 +125,51 @@ class SpectrumSimulation(object):
             self.simulate_obs(seed=current_seed, obs_id=current_seed)
             self.result.append(self.obs)
 
+    def run_batch(self, n_obs, random_state="random-seed", n_jobs=1):
+        """Simulate many observations at once.
+
+        The counts of all observations are drawn in one vectorised call
+        (see `~gammapy.utils.random.sample_poisson`). ON counts are sampled
+        from the sum of the predicted source and background counts, which
+        has the same distribution as the sum of source and background counts
+        sampled separately in `simulate_obs`.
+
+        Parameters
+        ----------
+        n_obs : int
+            Number of observations
+        random_state : {int, 'random-seed', 'global-rng', `~numpy.random.RandomState`}
+            Defines random number generator initialisation.
+            Passed to `~gammapy.utils.random.get_random_state`.
+        n_jobs : int
+            Number of processes used to sample the counts
+
+        Returns
+        -------
+        result : `~gammapy.spectrum.SpectrumSimulationResult`
+            Simulated counts
+        """
+        log.info("Simulating {} observations".format(n_obs))
+        npred_source = self.npred_source.data.data.value
+        if self.background_model is None:
+            mu = npred_source[np.newaxis]
+        else:
+            npred_background = self.npred_background.data.data.value
+            mu = np.array(
+                [npred_source + npred_background, npred_background / self.alpha]
+            )
+
+        counts = sample_poisson(mu, n_obs, random_state=random_state, n_jobs=n_jobs)
+        return SpectrumSimulationResult(
+            on_counts=counts[:, 0],
+            off_counts=counts[:, 1] if self.background_model is not None else None,
+            e_reco=self.e_reco,
+            livetime=self.livetime,
+            alpha=self.alpha,
+            aeff=self.aeff,
+            edisp=self.edisp,
+        )
+
     def reset(self):
         """Clear all results."""
         self.result = SpectrumObservationList()
@@ -167,16 +213,7 @@ class SpectrumSimulation(object):
             random state
         """
         on_counts = rand.poisson(self.npred_source.data.data.value)
-
-        on_vector = PHACountsSpectrum(
-            energy_lo=self.e_reco.lower_bounds,
-            energy_hi=self.e_reco.upper_bounds,
-            data=on_counts,
-            backscal=1,
-            meta=self._get_meta(),
-        )
-        on_vector.livetime = self.livetime
-        self.on_vector = on_vector
+        self.on_vector = _make_on_vector(self.e_reco, on_counts, self.livetime)
 
     def simulate_background_counts(self, rand):
         """Simulate background `~gammapy.spectrum.PHACountsSpectrum`.
@@ -199,16 +236,111 @@ class SpectrumSimulation(object):
         self.on_vector.data.data += bkg_counts
 
         # Create off vector
-        off_vector = PHACountsSpectrum(
-            energy_lo=self.e_reco.lower_bounds,
-            energy_hi=self.e_reco.upper_bounds,
-            data=off_counts,
-            backscal=1. / self.alpha,
-            is_bkg=True,
-            meta=self._get_meta(),
+        self.off_vector = _make_off_vector(
+            self.e_reco, off_counts, self.livetime, self.alpha
+        )
+
+
+def _get_meta():
+    return OrderedDict([("CREATOR", SpectrumSimulation.__name__)])
+
+
+def _make_on_vector(e_reco, counts, livetime):
+    on_vector = PHACountsSpectrum(
+        energy_lo=e_reco.lower_bounds,
+        energy_hi=e_reco.upper_bounds,
+        data=counts,
+        backscal=1,
+        meta=_get_meta(),
+    )
+    on_vector.livetime = livetime
+    return on_vector
+
+
+def _make_off_vector(e_reco, counts, livetime, alpha):
+    off_vector = PHACountsSpectrum(
+        energy_lo=e_reco.lower_bounds,
+        energy_hi=e_reco.upper_bounds,
+        data=counts,
+        backscal=1. / alpha,
+        is_bkg=True,
+        meta=_get_meta(),
+    )
+    off_vector.livetime = livetime
+    return off_vector
+
+
+class SpectrumSimulationResult(object):
+    """Counts spectra of many simulated observations.
+
+    The counts of all observations are stored in two arrays, the
+    `~gammapy.spectrum.SpectrumObservation` objects are only created on
+    access, e.g. ``result[3]``.
+
+    Usually created with `~gammapy.spectrum.SpectrumSimulation.run_batch`.
+
+    Parameters
+    ----------
+    on_counts : `~numpy.ndarray`
+        ON counts with shape ``(n_obs, n_bins)``
+    off_counts : `~numpy.ndarray`, optional
+        OFF counts with shape ``(n_obs, n_bins)``
+    e_reco : `~gammapy.utils.energy.EnergyBounds`
+        Reconstructed energy binning
+    livetime : `~astropy.units.Quantity`
+        Livetime
+    alpha : float, optional
+        Exposure ratio between source and background
+    aeff : `~gammapy.irf.EffectiveAreaTable`, optional
+        Effective Area
+    edisp : `~gammapy.irf.EnergyDispersion`, optional
+        Energy Dispersion
+    """
+
+    def __init__(
+        self,
+        on_counts,
+        e_reco,
+        livetime,
+        off_counts=None,
+        alpha=None,
+        aeff=None,
+        edisp=None,
+    ):
+        self.on_counts = on_counts
+        self.off_counts = off_counts
+        self.e_reco = e_reco
+        self.livetime = livetime
+        self.alpha = alpha
+        self.aeff = aeff
+        self.edisp = edisp
+
+    def __repr__(self):
+        return "{}(n_obs={}, n_bins={})".format(
+            self.__class__.__name__, len(self), self.on_counts.shape[1]
+        )
+
+    def __len__(self):
+        return len(self.on_counts)
+
+    def __getitem__(self, idx):
+        """Simulated observation (`~gammapy.spectrum.SpectrumObservation`).
+
+        The observation ID is the index.
+        """
+        on_vector = _make_on_vector(self.e_reco, self.on_counts[idx], self.livetime)
+        off_vector = None
+        if self.off_counts is not None:
+            off_vector = _make_off_vector(
+                self.e_reco, self.off_counts[idx], self.livetime, self.alpha
+            )
+
+        obs = SpectrumObservation(
+            on_vector=on_vector, off_vector=off_vector, aeff=self.aeff, edisp=self.edisp
         )
-        off_vector.livetime = self.livetime
-        self.off_vector = off_vector
+        obs.obs_id = idx
+        return obs
 
-    def _get_meta(self):
-        return OrderedDict([("CREATOR", self.__class__.__name__)])
+    def to_observation_list(self):
+        """Simulated observations (`~gammapy.spectrum.SpectrumObservationList`)."""
+        return SpectrumObservationList([self[idx] for idx in range(len(self))])
@@ -4,9 +4,18 @@ import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
+from astropy.table import Table
+from astropy.coordinates import SkyCoord, Angle
+from regions import CircleSkyRegion
 from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency, requires_data
 from ...spectrum import SpectrumExtraction, SpectrumObservation
+from ...utils.energy import EnergyBounds
+from ...data import EventList
+from ...irf import EffectiveAreaTable2D, EnergyDispersion2D, IRFReductionCache
+from ...irf.tests.test_irf_cache import _Observation as _IRFObservation
+from ...irf.tests.test_irf_cache import make_irf_file
+from ...background import BackgroundEstimate
 from ...background.tests.test_reflected import bkg_estimator, obs_list
 
 
@@ -125,3 +134,126 @@ class TestSpectrumExtraction:
         extraction.compute_energy_threshold(method_lo="area_max", area_percent_lo=10)
         actual = extraction.observations[0].lo_threshold
         assert_quantity_allclose(actual, 0.879923 * u.TeV, rtol=1e-3)
+
+
+class _Observation(object):
+    """Minimal picklable observation for extraction tests without data files."""
+
+    def __init__(self, obs_id, aeff, edisp):
+        self.obs_id = obs_id
+        self.pointing_radec = SkyCoord(83.63, 22.51, unit="deg")
+        self.observation_live_time_duration = 1800 * u.s
+        self.aeff = aeff
+        self.edisp = edisp
+
+
+def make_extraction_inputs(n_obs):
+    e_true = EnergyBounds.equal_log_spacing(0.1, 100, 20, "TeV")
+    offset = [0, 1, 2, 3] * u.deg
+    aeff = EffectiveAreaTable2D(
+        energy_lo=e_true[:-1],
+        energy_hi=e_true[1:],
+        offset_lo=offset[:-1],
+        offset_hi=offset[1:],
+        data=np.ones((20, 3)) * 1e5 * u.m ** 2,
+    )
+    edisp = EnergyDispersion2D.from_gauss(
+        e_true, np.linspace(0, 3, 100), 0, 0.2, offset
+    )
+    on_region = CircleSkyRegion(SkyCoord(83.63, 22.01, unit="deg"), Angle(0.1, "deg"))
+
+    rng = np.random.RandomState(0)
+    obs_list, bkg_estimate = [], []
+    for obs_id in range(n_obs):
+        obs_list.append(_Observation(obs_id, aeff, edisp))
+        events = []
+        for n_events in [100 + obs_id, 300]:
+            table = Table()
+            table["ENERGY"] = 10 ** rng.uniform(-1, 1, n_events) * u.TeV
+            events.append(EventList(table))
+
+        bkg = BackgroundEstimate(
+            on_region=on_region,
+            on_events=events[0],
+            off_region=None,
+            off_events=events[1],
+            a_on=1,
+            a_off=3,
+            method="Test",
+        )
+        bkg_estimate.append(bkg)
+
+    return obs_list, bkg_estimate
+
+
+@requires_dependency("scipy")
+def test_extraction_n_jobs():
+    obs_list, bkg_estimate = make_extraction_inputs(n_obs=4)
+    kwargs = dict(
+        obs_list=obs_list, bkg_estimate=bkg_estimate, use_recommended_erange=False
+    )
+
+    extraction = SpectrumExtraction(**kwargs)
+    extraction.run()
+    extraction_parallel = SpectrumExtraction(n_jobs=2, **kwargs)
+    extraction_parallel.run()
+
+    assert len(extraction_parallel.observations) == 4
+    for obs, obs_parallel in zip(
+        extraction.observations, extraction_parallel.observations
+    ):
+        assert obs.obs_id == obs_parallel.obs_id
+        assert_allclose(obs.on_vector.data.data, obs_parallel.on_vector.data.data)
+        assert_allclose(obs.off_vector.data.data, obs_parallel.off_vector.data.data)
+        assert_allclose(obs.aeff.data.data, obs_parallel.aeff.data.data)
+        assert_allclose(obs.edisp.pdf_matrix, obs_parallel.edisp.pdf_matrix)
+
+    # The state of the last processed observation is available
+    assert extraction_parallel._aeff is extraction_parallel.observations[-1].aeff
+    assert_allclose(extraction_parallel.containment, extraction.containment)
+
+
+class _FileObservation(_IRFObservation):
+    """Picklable observation stub with IRFs stored in a file."""
+
+    def __init__(self, obs_id, path, pointing_radec):
+        super(_FileObservation, self).__init__(obs_id, path)
+        self.pointing_radec = pointing_radec
+        self.observation_live_time_duration = 1800 * u.s
+
+
+@requires_dependency("scipy")
+def test_extraction_n_jobs_irf_cache(tmpdir):
+    make_irf_file(tmpdir / "irf.fits")
+    _, bkg_estimate = make_extraction_inputs(n_obs=4)
+    # Two groups of observations at offsets 0.5 and 1 deg
+    obs_list = []
+    for obs_id, dec in enumerate([22.51, 23.01, 22.51, 23.01]):
+        pointing = SkyCoord(83.63, dec, unit="deg")
+        obs_list.append(_FileObservation(obs_id, tmpdir / "irf.fits", pointing))
+
+    kwargs = dict(obs_list=obs_list, bkg_estimate=bkg_estimate)
+    extraction = SpectrumExtraction(irf_cache=IRFReductionCache(), **kwargs)
+    extraction.run()
+
+    irf_cache = IRFReductionCache()
+    extraction_parallel = SpectrumExtraction(irf_cache=irf_cache, n_jobs=2, **kwargs)
+    chunks = extraction_parallel._make_chunks(list(zip(obs_list, bkg_estimate)))
+    assert [indices for _, indices in chunks] == [[0, 2], [1, 3]]
+
+    extraction_parallel.run()
+    assert len(irf_cache.reduced) == 4
+    assert len(irf_cache.irfs) == 0
+
+    assert len(extraction_parallel.observations) == 4
+    for obs, obs_parallel in zip(
+        extraction.observations, extraction_parallel.observations
+    ):
+        assert obs.obs_id == obs_parallel.obs_id
+        assert_allclose(obs.on_vector.data.data, obs_parallel.on_vector.data.data)
+        assert_allclose(obs.aeff.data.data, obs_parallel.aeff.data.data)
+        assert_allclose(obs.edisp.pdf_matrix, obs_parallel.edisp.pdf_matrix)
+        assert_quantity_allclose(obs.lo_threshold, obs_parallel.lo_threshold)
+        assert_quantity_allclose(obs.hi_threshold, obs_parallel.hi_threshold)
+
+    assert_quantity_allclose(obs_parallel.lo_threshold, 0.316228 * u.TeV, rtol=1e-5)
@@ -5,12 +5,13 @@ import numpy as np
 from numpy.testing import assert_allclose
 from ...utils.testing import requires_dependency, requires_data, mpl_plot_check
 from ...utils.random import get_random_state
-from ...irf import EffectiveAreaTable
+from ...irf import EffectiveAreaTable, EnergyDispersion
 from ...spectrum import (
     PHACountsSpectrum,
     SpectrumObservationList,
     SpectrumObservation,
     SpectrumFit,
+    SpectrumBatchFit,
     SpectrumFitResult,
     models,
 )
@@ -180,6 +181,62 @@ class TestFit:
         # TODO: add assert, see issue 294
 
 
+def make_observation(sigma, n_true, n_reco, random_state):
+    e_true = np.logspace(-1.5, 2, n_true + 1) * u.TeV
+    e_reco = np.logspace(-1, 1.5, n_reco + 1) * u.TeV
+    aeff = EffectiveAreaTable.from_parametrization(e_true, "HESS")
+    edisp = EnergyDispersion.from_gauss(
+        e_true=e_true, e_reco=e_reco, sigma=sigma, bias=0
+    )
+    on_vector = PHACountsSpectrum(
+        energy_lo=e_reco[:-1],
+        energy_hi=e_reco[1:],
+        data=random_state.poisson(20, n_reco),
+        backscal=1,
+    )
+    on_vector.livetime = 1 * u.h
+    on_vector.lo_threshold = 0.3 * u.TeV
+    off_vector = PHACountsSpectrum(
+        energy_lo=e_reco[:-1],
+        energy_hi=e_reco[1:],
+        data=random_state.poisson(40, n_reco),
+        backscal=5,
+    )
+    off_vector.livetime = 1 * u.h
+    return SpectrumObservation(
+        on_vector=on_vector, off_vector=off_vector, aeff=aeff, edisp=edisp
+    )
+
+
+@requires_dependency("scipy")
+def test_joint_stat_packed():
+    """Joint statistic of observations with different binnings"""
+    random_state = get_random_state(0)
+    obs_list = [
+        make_observation(0.1, 40, 20, random_state),
+        make_observation(0.2, 40, 20, random_state),
+        make_observation(0.1, 30, 15, random_state),
+    ]
+    model = models.PowerLaw(
+        index=2.3, amplitude=1e-11 * u.Unit("cm-2 s-1 TeV-1"), reference=1 * u.TeV
+    )
+    fit_range = [0.5, 20] * u.TeV
+    fit = SpectrumFit(obs_list, model, stat="wstat", fit_range=fit_range)
+    total_stat = fit.total_stat(model.parameters)
+
+    assert [len(_) for _ in fit.predicted_counts] == [20, 20, 15]
+    assert [len(_) for _ in fit.statval] == [20, 20, 15]
+
+    desired = 0
+    for idx, obs in enumerate(obs_list):
+        npred = obs.predicted_counts(model).data.data.value
+        assert_allclose(fit.predicted_counts[idx], npred)
+        fit_single = SpectrumFit(obs, model, stat="wstat", fit_range=fit_range)
+        desired += fit_single.total_stat(model.parameters)
+
+    assert_allclose(total_stat, desired)
+
+
 @requires_dependency("sherpa")
 @requires_dependency("scipy")
 @requires_data("gammapy-extra")
@@ -355,3 +412,96 @@ class TestSpectralFit:
         sau.fit()
         assert_allclose(model.pars[0].val, 2.0881699, rtol=1e-3)
         assert_allclose(model.pars[2].val, 1.6234222, rtol=1e-3)
+
+
+@requires_dependency("scipy")
+@requires_dependency("iminuit")
+def test_likelihood_scans():
+    random_state = get_random_state(0)
+    obs_list = [
+        make_observation(0.1, 40, 20, random_state),
+        make_observation(0.1, 30, 15, random_state),
+    ]
+    model = models.ExponentialCutoffPowerLaw(
+        index=2.3,
+        amplitude=1e-11 * u.Unit("cm-2 s-1 TeV-1"),
+        reference=1 * u.TeV,
+        lambda_=0.1 / u.TeV,
+    )
+    fit = SpectrumFit(obs_list, model, stat="wstat", fit_range=[0.5, 20] * u.TeV)
+
+    index = np.linspace(2, 2.6, 4)
+    lambda_ = [0.05, 0.2] / u.TeV
+    stat_2d = fit.likelihood_2d(model, "index", index, "lambda_", lambda_)
+    assert stat_2d.shape == (4, 2)
+
+    model_scan = model.copy()
+    fit_scan = SpectrumFit(
+        obs_list, model_scan, stat="wstat", fit_range=[0.5, 20] * u.TeV
+    )
+    for idx, value in enumerate(index):
+        model_scan.parameters["index"].value = value
+        model_scan.parameters["lambda_"].value = 0.2
+        assert_allclose(stat_2d[idx, 1], fit_scan.total_stat(model_scan.parameters))
+
+    stat_1d = fit.likelihood_1d(model, "index", index)
+    model_scan.parameters["lambda_"].value = 0.1
+    model_scan.parameters["index"].value = index[-1]
+    assert_allclose(stat_1d[-1], fit_scan.total_stat(model_scan.parameters))
+    assert model.parameters["index"].value == 2.3
+
+    model.parameters["lambda_"].frozen = True
+    profile = fit.likelihood_profile(model, "index", index)
+    profile_parallel = fit.likelihood_profile(model, "index", index, n_jobs=2)
+    assert profile.colnames == ["index", "stat", "amplitude"]
+    assert_allclose(profile["stat"], profile_parallel["stat"], rtol=1e-4)
+    # Re-optimising the amplitude can only improve the statistic
+    assert np.all(profile["stat"] <= stat_1d + 1e-6)
+    assert not model.parameters["index"].frozen
+
+
+@requires_dependency("scipy")
+@requires_dependency("iminuit")
+def test_batch_fit():
+    random_state = get_random_state(0)
+    obs = make_observation(0.1, 40, 20, random_state)
+    model = models.PowerLaw(
+        index=2.3, amplitude=1e-11 * u.Unit("cm-2 s-1 TeV-1"), reference=1 * u.TeV
+    )
+    fit_range = [0.5, 20] * u.TeV
+    npred = obs.predicted_counts(model).data.data.value
+    on_counts = random_state.poisson(npred + 8, (5, 20))
+    off_counts = random_state.poisson(40, (5, 20))
+
+    fit = SpectrumBatchFit(obs, model, fit_range=fit_range)
+    result = fit.fit_batch(on_counts, off_counts)
+    assert result.dtype.names == (
+        "index",
+        "index_err",
+        "amplitude",
+        "amplitude_err",
+        "stat",
+        "ts",
+        "success",
+    )
+    assert len(result) == 5
+    assert result["success"].all()
+    assert np.all(result["ts"] > 25)
+    assert model.parameters["index"].value == 2.3
+
+    obs.on_vector.data.data = on_counts[3] * u.ct
+    obs.off_vector.data.data = off_counts[3] * u.ct
+    fit_single = SpectrumFit(obs, model.copy(), fit_range=fit_range)
+    fit_single.fit()
+    parameters = fit_single.result[0].model.parameters
+    assert_allclose(result["index"][3], parameters["index"].value, rtol=1e-3)
+    assert_allclose(result["index_err"][3], parameters.error("index"), rtol=1e-2)
+    assert_allclose(result["stat"][3], fit_single.result[0].statval, rtol=1e-4)
+
+    result_parallel = fit.fit_batch(on_counts, off_counts, n_jobs=2)
+    assert_allclose(result_parallel["stat"], result["stat"], rtol=1e-4)
+
+    # The test statistic is only computed for wstat
+    fit_cash = SpectrumBatchFit(obs, model, fit_range=fit_range, stat="cash")
+    result_cash = fit_cash.fit_batch(on_counts[:2])
+    assert np.all(np.isnan(result_cash["ts"]))
@@ -13,6 +13,7 @@ from ...utils.testing import (
     mpl_plot_check,
 )
 from ...utils.modeling import Parameters
+from ...utils.random import get_random_state
 from ..results import SpectrumResult
 from ..fit import SpectrumFit
 from ..observation import SpectrumObservation
@@ -24,6 +25,7 @@ from ..flux_point import (
     FluxPointFitter,
     FluxPointEstimator,
 )
+from .test_fit import make_observation
 
 FLUX_POINTS_FILES = [
     "diff_flux_points.ecsv",
@@ -234,6 +236,43 @@ class TestFluxPointEstimator:
             result.plot(energy_range=[1, 10] * u.TeV)
 
 
+@requires_dependency("scipy")
+@requires_dependency("iminuit")
+@requires_dependency("uncertainties")
+def test_flux_point_estimator_n_jobs():
+    random_state = get_random_state(1)
+    obs_list = [make_observation(0.1, 40, 20, random_state) for _ in range(2)]
+    model = PowerLaw(
+        index=2.5, amplitude=1e-11 * u.Unit("cm-2 s-1 TeV-1"), reference=1 * u.TeV
+    )
+    segm = SpectrumEnergyGroupMaker(obs=obs_list[0])
+    segm.compute_groups_fixed(ebounds=[0.3, 1, 3, 30] * u.TeV)
+
+    fpe = FluxPointEstimator(obs=obs_list, groups=segm.groups, model=model)
+    group = fpe.groups[2]
+    point = fpe.compute_flux_point(group)
+
+    # The upper limit is at a TS difference of 4 from the best fit
+    fit = fpe.fit
+    stat_best_fit = np.sum([res.statval for res in fit.result])
+    model_ul = fit.result[0].model.copy()
+    model_ul.parameters["amplitude"].value *= (point["dnde_ul"] / point["dnde"]).value
+    assert_allclose(fit.total_stat(model_ul.parameters), stat_best_fit + 4, rtol=1e-6)
+
+    fpe.compute_points()
+    fpe_parallel = FluxPointEstimator(
+        obs=obs_list, groups=segm.groups, model=model, n_jobs=2
+    )
+    fpe_parallel.compute_points()
+
+    table = fpe.flux_points.table
+    table_parallel = fpe_parallel.flux_points.table
+    assert len(table) == 3
+    for name in ["dnde", "dnde_err", "dnde_ul", "dnde_errp", "dnde_errn", "sqrt_ts"]:
+        assert_allclose(table[name], table_parallel[name])
+    assert_allclose(table["dnde_ul"][1], point["dnde_ul"].value)
+
+
 @requires_data("gammapy-extra")
 class TestFluxPointProfiles:
     def setup(self):
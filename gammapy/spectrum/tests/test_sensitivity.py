@@ -1,11 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
 from gammapy.utils.testing import requires_data, requires_dependency
-from ...irf.io import CTAPerf
-from ..sensitivity import SensitivityEstimator
+from ...utils.energy import EnergyBounds
+from ...irf import EffectiveAreaTable, EnergyDispersion
+from ...irf.io import CTAPerf, BgRateTable
+from ..sensitivity import SensitivityEstimator, differential_sensitivity
 
 
 @pytest.fixture()
@@ -47,3 +50,68 @@ def test_cta_sensitivity_estimator(sens):
     assert_allclose(row["excess"], 10, rtol=1e-3)
     assert_allclose(row["background"], 0.00566093, rtol=1e-3)
     assert row["criterion"] == "gamma"
+
+
+def make_irf(scale):
+    e_true = EnergyBounds.equal_log_spacing(0.01, 300, 60, "TeV")
+    e_reco = EnergyBounds.equal_log_spacing(0.0125, 200, 21, "TeV")
+    aeff = EffectiveAreaTable.from_parametrization(e_true, "HESS")
+    aeff.data.data *= scale
+    rmf = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.2, bias=0)
+    rate = 10 * scale * np.power(e_reco.log_centers.value, -2.7) * u.Unit("s-1")
+    bkg = BgRateTable(e_reco.lower_bounds, e_reco.upper_bounds, rate)
+    return CTAPerf(aeff=aeff, bkg=bkg, rmf=rmf)
+
+
+@requires_dependency("scipy")
+def test_differential_sensitivity():
+    irfs = [make_irf(1), make_irf(3)]
+    livetime = [0.5, 5] * u.h
+    alpha = [[0.1], [0.2]]
+    result = differential_sensitivity(irfs, livetime=livetime, alpha=alpha, slope=2.5)
+    assert result["e2dnde"].shape == (2, 2, 2, 21)
+    assert result["e2dnde"].unit == "erg / (cm2 s)"
+    assert result["criterion"][0, 0, 0, 20] == "gamma"
+    assert result["criterion"][0, 0, 0, 0] == "significance"
+
+    # Reference values from SensitivityEstimator, before it used
+    # differential_sensitivity
+    idx = [0, 9, 20]
+    assert_allclose(
+        result["energy"][idx].value, [0.0157401, 0.997181, 158.83], rtol=1e-5
+    )
+
+    # irfs[1], alpha = 0.1, livetime = 5 h
+    assert_allclose(
+        result["e2dnde"][1, 0, 1, idx].value,
+        [6.36248e-02, 2.05074e-10, 7.73084e-11],
+        rtol=1e-5,
+    )
+    assert_allclose(result["excess"][1, 0, 1, idx], [1.0469e6, 3873.28, 10], rtol=1e-5)
+    assert_allclose(
+        result["background"][1, 0, 1, idx], [3.9854e10, 544132, 0.616421], rtol=1e-5
+    )
+
+    # irfs[0], alpha = 0.2, livetime = 0.5 h
+    assert_allclose(
+        result["e2dnde"][0, 1, 0, idx].value,
+        [0.363993, 1.18092e-09, 2.31925e-09],
+        rtol=1e-5,
+    )
+    assert_allclose(result["excess"][0, 1, 0, idx], [199640, 743.481, 10], rtol=1e-5)
+    assert_allclose(
+        result["background"][0, 1, 0, idx], [1.32847e9, 18137.7, 0.0205474], rtol=1e-5
+    )
+    assert list(result["criterion"][0, 1, 0, idx]) == ["significance"] * 2 + ["gamma"]
+
+
+@requires_dependency("scipy")
+def test_differential_sensitivity_no_background():
+    irf = make_irf(1)
+    irf.bkg.data.data[:2] = [0, np.nan] * u.Unit("s-1")
+    result = differential_sensitivity([irf], livetime=5 * u.h)
+
+    # Zero and NaN background are limited by the minimum number of gamma-rays
+    assert_allclose(result["excess"][0, :2], 10)
+    assert np.all(np.isfinite(result["e2dnde"][0, :2]))
+    assert list(result["criterion"][0, :2]) == ["gamma", "gamma"]
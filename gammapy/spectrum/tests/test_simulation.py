@@ -60,6 +60,29 @@ class TestSpectrumSimulation:
         assert self.sim.result[3].on_vector.total_counts == 168
         assert self.sim.result[4].on_vector.total_counts == 186
 
+    def test_run_batch(self):
+        self.sim.background_model = self.background_model
+        self.sim.alpha = self.alpha
+        result = self.sim.run_batch(n_obs=200, random_state=0)
+        assert len(result) == 200
+        assert result.on_counts.shape == (200, len(self.sim.e_reco) - 1)
+
+        npred_on = self.sim.npred_source.data.data + self.sim.npred_background.data.data
+        npred_off = self.sim.npred_background.data.data / self.alpha
+        assert_allclose(result.on_counts.sum(axis=1).mean(), npred_on.sum(), rtol=0.02)
+        assert_allclose(
+            result.off_counts.sum(axis=1).mean(), npred_off.sum(), rtol=0.02
+        )
+
+        obs = result[3]
+        assert obs.obs_id == 3
+        assert obs.on_vector.total_counts == result.on_counts[3].sum()
+        assert obs.off_vector.total_counts == result.off_counts[3].sum()
+        assert_allclose(obs.alpha, self.alpha)
+
+        obs_list = result.to_observation_list()
+        assert len(obs_list) == 200
+
     def test_without_edisp(self):
         sim = SpectrumSimulation(
             aeff=self.sim.aeff, source_model=self.sim.source_model, livetime=4 * u.h
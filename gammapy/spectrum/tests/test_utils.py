@@ -9,6 +9,7 @@ from ...utils.testing import assert_quantity_allclose
 from ...utils.testing import requires_dependency
 from ...irf import EffectiveAreaTable, EnergyDispersion
 from ...spectrum import integrate_spectrum, CountsPredictor
+from ..utils import _BinnedIntegral
 from ..powerlaw import power_law_energy_flux, power_law_evaluate, power_law_flux
 from ..models import ExponentialCutoffPowerLaw, PowerLaw, TableModel
 
@@ -152,3 +153,33 @@ def test_counts_predictor(case):
     predictor.run()
     actual = predictor.npred.total_counts.value
     assert_allclose(actual, desired)
+
+
+def test_binned_integral():
+    edges = Quantity(np.logspace(-1, 2, 31), "TeV")
+    binned_integral = _BinnedIntegral(edges)
+    assert binned_integral.has_edges(edges)
+    assert not binned_integral.has_edges(edges.to("GeV"))
+
+    ecpl = ExponentialCutoffPowerLaw(
+        index=2.3,
+        amplitude=1e-12 * u.Unit("cm-2 s-1 TeV-1"),
+        reference=1 * u.TeV,
+        lambda_=0.1 / u.TeV,
+    )
+    pwl = PowerLaw(index=2.3, amplitude=1e-12 * u.Unit("cm-2 s-1 TeV-1"))
+
+    for model in [ecpl, pwl]:
+        actual = binned_integral(model)
+        desired = model.integral(emin=edges[:-1], emax=edges[1:], intervals=True)
+        assert_quantity_allclose(actual, desired)
+
+    # Cached values are returned for unchanged parameters only
+    desired = ecpl.integral(emin=edges[:-1], emax=edges[1:], intervals=True)
+    actual = binned_integral(ecpl)
+    actual *= 0
+    assert_quantity_allclose(binned_integral(ecpl), desired)
+
+    ecpl.parameters["index"].value = 2
+    desired = ecpl.integral(emin=edges[:-1], emax=edges[1:], intervals=True)
+    assert_quantity_allclose(binned_integral(ecpl), desired)
@@ -1,7 +1,9 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
 import numpy as np
 from astropy.units import Quantity
+from ..utils.cache import LRUCache
 
 __all__ = ["CountsPredictor", "integrate_spectrum"]
 
@@ -70,6 +72,7 @@ class CountsPredictor(object):
         self.true_flux = None
         self.true_counts = None
         self.npred = None
+        self._binned_integral = None
 
     def run(self):
         self.integrate_model()
@@ -79,22 +82,18 @@ class CountsPredictor(object):
     def integrate_model(self):
         """Integrate model in true energy space"""
         if self.aeff is not None:
-            # TODO: True energy is converted to model amplitude unit. See issue 869
-            ref_unit = None
-            try:
-                for unit in self.model.parameters["amplitude"].quantity.unit.bases:
-                    if unit.is_equivalent("eV"):
-                        ref_unit = unit
-            except IndexError:
-                ref_unit = "TeV"
+            ref_unit = _model_energy_unit(self.model)
             self.e_true = self.aeff.energy.bins.to(ref_unit)
         else:
             if self.e_true is None:
                 raise ValueError("No true energy binning given")
 
-        self.true_flux = self.model.integral(
-            emin=self.e_true[:-1], emax=self.e_true[1:], intervals=True
-        )
+        integral = self._binned_integral
+        if integral is None or not integral.has_edges(self.e_true):
+            integral = _BinnedIntegral(self.e_true)
+            self._binned_integral = integral
+
+        self.true_flux = integral(self.model)
 
     def apply_aeff(self):
         if self.aeff is not None:
@@ -123,6 +122,178 @@ class CountsPredictor(object):
         )
 
 
+class _BinnedIntegral(object):
+    """Integral of spectral models in fixed energy bins.
+
+    Everything that only depends on the energy binning is computed once,
+    so that integrating a model takes one vectorised model evaluation at
+    the bin edges plus the log-log trapezoidal rule (see `_trapz_loglog`).
+    Models providing an analytical ``integral`` use it instead.
+
+    Results are cached, keyed by the model and its parameter values, so
+    that repeated integration of an unchanged model is free.
+
+    Parameters
+    ----------
+    edges : `~astropy.units.Quantity`
+        Energy bin edges
+    maxsize : int
+        Maximum number of cached integrals
+    """
+
+    def __init__(self, edges, maxsize=8):
+        self.edges = Quantity(edges)
+        x = self.edges.value
+        self._x_lo = x[:-1]
+        self._x_hi = x[1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._ratio = x[1:] / x[:-1]
+            self._log10_ratio = np.log10(self._ratio)
+            self._log_ratio = np.log(self._ratio)
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def has_edges(self, edges):
+        """Whether the integral is defined on the bin edges ``edges``."""
+        edges = Quantity(edges)
+        return (
+            edges.shape == self.edges.shape
+            and edges.unit == self.edges.unit
+            and np.array_equal(edges.value, self.edges.value)
+        )
+
+    @staticmethod
+    def _key(model):
+        pars = model.parameters.parameters
+        return (id(model),) + tuple((par.value, str(par.unit)) for par in pars)
+
+    def __call__(self, model):
+        """Integrate model in all bins.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Spectral model
+
+        Returns
+        -------
+        integral : `~astropy.units.Quantity`
+            Integral in each bin
+        """
+        key = self._key(model)
+        cached = self._cache.get(key)
+        # The model is stored with the value, so its id can't be reused
+        if cached is None or cached[0] is not model:
+            cached = (model, self._integrate(model))
+            self._cache[key] = cached
+        return cached[1].copy()
+
+    def _integrate(self, model):
+        from .models import SpectralModel
+
+        if type(model).integral != SpectralModel.integral:
+            return model.integral(
+                emin=self.edges[:-1], emax=self.edges[1:], intervals=True
+            )
+
+        y = model(self.edges)
+        if y.dtype == "O":
+            return _trapz_loglog(y, self.edges, intervals=True)
+        return self._trapz_loglog(y)
+
+    def _trapz_loglog(self, y):
+        """Log-log trapezoidal rule for model values ``y`` at the bin edges.
+
+        ``y`` can have leading axes, the edges are the last axis.
+        """
+        x_lo, x_hi = self._x_lo, self._x_hi
+        y_lo, y_hi = y.value[..., :-1], y.value[..., 1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            index = np.log10(y_hi / y_lo) / self._log10_ratio
+            trapzs = np.where(
+                np.abs(index + 1.) > 1e-10,
+                y_lo * (x_hi * self._ratio ** index - x_lo) / (index + 1),
+                x_lo * y_lo * self._log_ratio,
+            )
+
+        trapzs[(y_lo == 0.) | (y_hi == 0.) | (x_lo == x_hi)] = 0.
+        return Quantity(trapzs, y.unit * self.edges.unit, copy=False)
+
+    def integrate_batch(self, model, values):
+        """Integrate model in all bins for many parameter values at once.
+
+        The model is evaluated at the bin edges in one call, broadcasting
+        the parameter values, and integrated with the log-log trapezoidal
+        rule. For models with an analytical ``integral`` (power laws) the
+        result agrees with `__call__` up to rounding errors. Models which
+        can't be evaluated with array parameters are integrated for one
+        parameter set after the other.
+
+        Parameters
+        ----------
+        model : `~gammapy.spectrum.models.SpectralModel`
+            Spectral model
+        values : dict
+            Parameter values (1-dim arrays of the same length, in the
+            parameter unit) by parameter name. The other parameters are
+            taken from ``model``.
+
+        Returns
+        -------
+        integral : `~astropy.units.Quantity`
+            Integral in each bin, with shape ``(n_values, n_bins)``
+        """
+        from .models import SpectralModel
+
+        values = OrderedDict(
+            (k, np.asarray(v, dtype=np.float64)) for k, v in values.items()
+        )
+        n_values = len(next(iter(values.values())))
+        shape = (n_values, len(self.edges))
+
+        if type(model).__call__ is SpectralModel.__call__:
+            kwargs = dict()
+            for par in model.parameters.parameters:
+                if par.name in values:
+                    value = values[par.name][:, np.newaxis]
+                    kwargs[par.name] = Quantity(value, par.unit, copy=False)
+                else:
+                    kwargs[par.name] = par.quantity
+            try:
+                y = model.evaluate(self.edges, **kwargs)
+                y = Quantity(np.broadcast_to(y, shape), y.unit, copy=False)
+            except (TypeError, ValueError):
+                y = None
+            if y is not None and y.dtype != "O":
+                return self._trapz_loglog(y)
+
+        parameters = model.parameters
+        values_orig = {name: parameters[name].value for name in values}
+        integrals = []
+        try:
+            for idx in range(n_values):
+                for name in values:
+                    parameters[name].value = values[name][idx]
+                integrals.append(self(model))
+        finally:
+            for name, value in values_orig.items():
+                parameters[name].value = value
+        unit = integrals[0].unit
+        return Quantity([_.to(unit).value for _ in integrals], unit, copy=False)
+
+
+def _model_energy_unit(model):
+    """Energy unit of the model amplitude, used for the true energy axis."""
+    # TODO: True energy is converted to model amplitude unit. See issue 869
+    ref_unit = None
+    try:
+        for unit in model.parameters["amplitude"].quantity.unit.bases:
+            if unit.is_equivalent("eV"):
+                ref_unit = unit
+    except IndexError:
+        ref_unit = "TeV"
+    return ref_unit
+
+
 def integrate_spectrum(func, xmin, xmax, ndecade=100, intervals=False):
     """
     Integrate 1d function using the log-log trapezoidal rule. If scalar values
@@ -1,13 +1,16 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Feldman Cousins algorithm to compute parameter confidence limits."""
 from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
 import logging
 import numpy as np
+from ..utils.cache import LRUCache
 
 __all__ = [
     "fc_find_acceptance_interval_gauss",
     "fc_find_acceptance_interval_poisson",
     "fc_construct_acceptance_intervals_pdfs",
+    "fc_construct_acceptance_intervals_poisson",
     "fc_get_limits",
     "fc_fix_limits",
     "fc_find_limit",
@@ -44,61 +47,26 @@ def fc_find_acceptance_interval_gauss(mu, sigma, x_bins, alpha):
     """
     from scipy import stats
 
-    dist = stats.norm(loc=mu, scale=sigma)
-
+    x_bins = np.asarray(x_bins)
     x_bin_width = x_bins[1] - x_bins[0]
 
-    p = []
-    r = []
-
-    for x in x_bins:
-        p.append(dist.pdf(x) * x_bin_width)
-        # This is the formula from the FC paper
-        if mu == 0 and sigma == 1:
-            if x < 0:
-                r.append(np.exp(mu * (x - mu * 0.5)))
-            else:
-                r.append(np.exp(-0.5 * np.power((x - mu), 2)))
-        # This is the more general formula
-        else:
-            # Implementing the boundary condition at zero
-            mu_best = max(0, x)
-            prob_mu_best = stats.norm.pdf(x, loc=mu_best, scale=sigma)
-            # probMuBest should never be zero. Check it just in case.
-            if prob_mu_best == 0.0:
-                r.append(0.0)
-            else:
-                r.append(p[-1] / prob_mu_best)
-
-    p = np.asarray(p)
-    r = np.asarray(r)
-
-    if sum(p) < alpha:
-        raise ValueError(
-            "X bins don't contain enough probability to reach "
-            "desired confidence level for this mu!"
-        )
-
-    rank = stats.rankdata(-r, method="dense")
-
-    index_array = np.arange(x_bins.size)
-
-    rank_sorted, index_array_sorted = zip(*sorted(zip(rank, index_array)))
-
-    index_min = index_array_sorted[0]
-    index_max = index_array_sorted[0]
+    p = stats.norm.pdf(x_bins, loc=mu, scale=sigma) * x_bin_width
 
-    p_sum = 0
-
-    for i in range(len(rank_sorted)):
-        if index_array_sorted[i] < index_min:
-            index_min = index_array_sorted[i]
-        if index_array_sorted[i] > index_max:
-            index_max = index_array_sorted[i]
-        p_sum += p[index_array_sorted[i]]
-        if p_sum >= alpha:
-            break
+    # This is the formula from the FC paper
+    if mu == 0 and sigma == 1:
+        r = np.where(
+            x_bins < 0, np.exp(mu * (x_bins - mu * 0.5)), np.exp(-0.5 * x_bins ** 2)
+        )
+    # This is the more general formula
+    else:
+        # Implementing the boundary condition at zero
+        mu_best = np.maximum(0, x_bins)
+        prob_mu_best = stats.norm.pdf(x_bins, loc=mu_best, scale=sigma)
+        # probMuBest should never be zero. Check it just in case.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(prob_mu_best == 0, 0, p / prob_mu_best)
 
+    index_min, index_max = _fc_acceptance_interval_indices(p, r, alpha)
     return x_bins[index_min], x_bins[index_max] + x_bin_width
 
 
@@ -127,54 +95,36 @@ def fc_find_acceptance_interval_poisson(mu, background, x_bins, alpha):
     """
     from scipy import stats
 
-    dist = stats.poisson(mu=mu + background)
-
+    x_bins = np.asarray(x_bins)
     x_bin_width = x_bins[1] - x_bins[0]
 
-    p = []
-    r = []
+    p = stats.poisson.pmf(x_bins, mu=mu + background)
 
-    for x in x_bins:
-        p.append(dist.pmf(x))
-        # Implementing the boundary condition at zero
-        muBest = max(0, x - background)
-        probMuBest = stats.poisson.pmf(x, mu=muBest + background)
-        # probMuBest should never be zero. Check it just in case.
-        if probMuBest == 0.0:
-            r.append(0.0)
-        else:
-            r.append(p[-1] / probMuBest)
+    # Implementing the boundary condition at zero
+    mu_best = np.maximum(0, x_bins - background)
+    prob_mu_best = stats.poisson.pmf(x_bins, mu=mu_best + background)
+    # probMuBest should never be zero. Check it just in case.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(prob_mu_best == 0, 0, p / prob_mu_best)
+
+    index_min, index_max = _fc_acceptance_interval_indices(p, r, alpha)
+    return x_bins[index_min], x_bins[index_max] + x_bin_width
 
-    p = np.asarray(p)
-    r = np.asarray(r)
 
-    if sum(p) < alpha:
+def _fc_acceptance_interval_indices(p, r, alpha):
+    """Index range of the bins accepted in the order of decreasing ``r``."""
+    if np.sum(p) < alpha:
         raise ValueError(
             "X bins don't contain enough probability to reach "
             "desired confidence level for this mu!"
         )
 
-    rank = stats.rankdata(-r, method="dense")
-
-    index_array = np.arange(x_bins.size)
-
-    rank_sorted, index_array_sorted = zip(*sorted(zip(rank, index_array)))
-
-    index_min = index_array_sorted[0]
-    index_max = index_array_sorted[0]
-
-    p_sum = 0
-
-    for i in range(len(rank_sorted)):
-        if index_array_sorted[i] < index_min:
-            index_min = index_array_sorted[i]
-        if index_array_sorted[i] > index_max:
-            index_max = index_array_sorted[i]
-        p_sum += p[index_array_sorted[i]]
-        if p_sum >= alpha:
-            break
-
-    return x_bins[index_min], x_bins[index_max] + x_bin_width
+    # Stable sort, so that bins with equal rank are added in index order
+    index_array_sorted = np.argsort(-r, kind="mergesort")
+    p_sum = np.cumsum(p[index_array_sorted])
+    n_accepted = np.searchsorted(p_sum >= alpha, True) + 1
+    index_accepted = index_array_sorted[:n_accepted]
+    return index_accepted.min(), index_accepted.max()
 
 
 def fc_construct_acceptance_intervals_pdfs(matrix, alpha):
@@ -194,71 +144,121 @@ def fc_construct_acceptance_intervals_pdfs(matrix, alpha):
     distributions_scaled : ndarray
         Acceptance intervals (1 means inside, 0 means outside)
     """
-    number_mus = len(matrix)
-
-    distributions_scaled = np.asarray(matrix)
-    distributions_re_scaled = np.asarray(matrix)
-    summed_propability = np.zeros(number_mus)
+    distributions = np.array(matrix, dtype=np.float64)
+    number_mus, number_x = distributions.shape
 
     # Step 1:
     # For each x, find the greatest likelihood in the mu direction.
     # greatest_likelihood is an array of length number_x_bins.
-    greatest_likelihood = np.amax(distributions_scaled, axis=0)
+    greatest_likelihood = np.amax(distributions, axis=0)
 
     # Set to some value if none of the bins has an entry to avoid
     # division by zero
     greatest_likelihood[greatest_likelihood == 0] = 1
 
+    acceptance_intervals = np.empty_like(distributions)
+
+    # Process chunks of mu values, to limit the memory used by the sort
+    chunk_size = max(1, int(1e7) // number_x)
+    for start in range(0, number_mus, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        acceptance_intervals[chunk] = _fc_acceptance_intervals_ordered(
+            distributions[chunk], greatest_likelihood, alpha
+        )
+
+    return acceptance_intervals
+
+
+def _fc_acceptance_intervals_ordered(distributions, greatest_likelihood, alpha):
+    """Acceptance intervals for a set of mu values.
+
+    See `fc_construct_acceptance_intervals_pdfs`, all mu values are processed
+    at once by sorting along the x axis.
+    """
+    rows = np.arange(len(distributions))[:, np.newaxis]
+
     # Step 2:
     # Scale all entries by this value
-    distributions_re_scaled /= greatest_likelihood
+    distributions_re_scaled = distributions / greatest_likelihood
 
     # Step 3 (Feldman Cousins Ordering principle):
-    # For each mu, get the largest entry
+    # For each mu, the largest entry and the entries where mu has the
+    # greatest likelihood have the top rank and are always accepted.
     largest_entry = np.argmax(distributions_re_scaled, axis=1)
-    # Set the rank to 1 and add probability
-    for i in range(number_mus):
-        distributions_re_scaled[i][largest_entry[i]] = 1
-        summed_propability[i] += np.sum(
-            np.where(distributions_re_scaled[i] == 1, distributions_scaled[i], 0)
-        )
-        distributions_scaled[i] = np.where(
-            distributions_re_scaled[i] == 1, 1, distributions_scaled[i]
-        )
+    distributions_re_scaled[rows[:, 0], largest_entry] = 1
+    top_rank = distributions_re_scaled == 1
+    summed_probability = np.sum(np.where(top_rank, distributions, 0), axis=1)
+
+    # The other entries are ranked by decreasing scaled likelihood, the ones
+    # with equal value in index order, and accepted as long as the summed
+    # probability is below alpha. Top rank entries are sorted to the end.
+    order = np.argsort(
+        np.where(top_rank, np.inf, -distributions_re_scaled), axis=1, kind="mergesort"
+    )
+    probability_sorted = distributions[rows, order]
+    summed_sorted = np.cumsum(
+        np.column_stack([summed_probability, probability_sorted[:, :-1]]), axis=1
+    )
 
-    # Identify next largest entry not yet ranked. While there are entries
-    # smaller than 1, some bins don't have a rank yet.
-    while np.amin(distributions_re_scaled) < 1:
-        # For each mu, this is the largest rank attributed so far.
-        largest_rank = np.amax(distributions_re_scaled, axis=1)
-        # For each mu, this is the largest entry that is not yet a rank.
-        largest_entry = np.where(
-            distributions_re_scaled < 1, distributions_re_scaled, -1
-        )
-        # For each mu, this is the position of the largest entry that is not yet a rank.
-        largest_entry_position = np.argmax(largest_entry, axis=1)
-        # Invalidate indices where there is no maximum (every entry is already a rank)
-        largest_entry_position = [
-            largest_entry_position[i]
-            if largest_entry[i][largest_entry_position[i]] != -1
-            else -1
-            for i in range(len(largest_entry_position))
-        ]
-        # Replace the largest entry with the highest rank so far plus one
-        # Add the probability
-        for i in range(number_mus):
-            if largest_entry_position[i] == -1:
-                continue
-            distributions_re_scaled[i][largest_entry_position[i]] = largest_rank[i] + 1
-            if summed_propability[i] < alpha:
-                summed_propability[i] += distributions_scaled[i][
-                    largest_entry_position[i]
-                ]
-                distributions_scaled[i][largest_entry_position[i]] = 1
-            else:
-                distributions_scaled[i][largest_entry_position[i]] = 0
-
-    return distributions_scaled
+    accepted = np.empty_like(top_rank)
+    accepted[rows, order] = summed_sorted < alpha
+    accepted |= top_rank
+    return accepted.astype(np.float64)
+
+
+def fc_construct_acceptance_intervals_poisson(
+    mu_bins, background, x_bins, alpha, cache_dir=None
+):
+    r"""Acceptance intervals for a Poisson process with known background.
+
+    Computes the matrix of :math:`P(x|\mu)` for a Poisson process with mean
+    :math:`\mu + b` and passes it to
+    `~gammapy.stats.fc_construct_acceptance_intervals_pdfs`. If ``cache_dir``
+    is given, the result is stored there, keyed by the background, alpha and
+    the binning, and reused by later calls with the same inputs.
+
+    For more information see :ref:`documentation <feldman_cousins>`.
+
+    Parameters
+    ----------
+    mu_bins : array-like
+        The bins used in mue direction.
+    background : float
+        Mean of the background
+    x_bins : array-like
+        The bins of the x distribution
+    alpha : float
+        Desired confidence level
+    cache_dir : str or `~gammapy.extern.pathlib.Path`, optional
+        Directory used to persist the acceptance intervals.
+
+    Returns
+    -------
+    acceptance_intervals : ndarray
+        Acceptance intervals (1 means inside, 0 means outside)
+    """
+    from scipy import stats
+
+    mu_bins = np.asarray(mu_bins, dtype=np.float64)
+    x_bins = np.asarray(x_bins, dtype=np.float64)
+
+    def compute():
+        mu = mu_bins[:, np.newaxis] + background
+        matrix = stats.poisson.pmf(x_bins, mu=mu)
+        return fc_construct_acceptance_intervals_pdfs(matrix, alpha)
+
+    if cache_dir is None:
+        return compute()
+
+    key = (
+        "poisson",
+        float(background),
+        float(alpha),
+        hashlib.sha1(mu_bins.tobytes()).hexdigest(),
+        hashlib.sha1(x_bins.tobytes()).hexdigest(),
+    )
+    cache = LRUCache(maxsize=1, cache_dir=cache_dir)
+    return cache.get_or_compute(key, compute)
 
 
 def fc_get_limits(mu_bins, x_bins, acceptance_intervals):
@@ -284,33 +284,24 @@ def fc_get_limits(mu_bins, x_bins, acceptance_intervals):
     x_values : array-like
         All the points that are inside the acceptance intervals
     """
-    upper_limit = []
-    lower_limit = []
-    x_values = []
-
-    number_mu = len(mu_bins)
-    number_bins_x = len(x_bins)
-
-    for mu in range(number_mu):
-        upper_limit.append(-1)
-        lower_limit.append(-1)
-        x_values.append([])
-        acceptance_interval = acceptance_intervals[mu]
-        for x in range(number_bins_x):
-            # This point lies in the acceptance interval
-            if acceptance_interval[x] == 1:
-                x_value = x_bins[x]
-                x_values[-1].append(x_value)
-                # Upper limit is first point where this condition is true
-                if upper_limit[-1] == -1:
-                    upper_limit[-1] = x_value
-                # Lower limit is first point after this condition is not true
-                if x == number_bins_x - 1:
-                    lower_limit[-1] = x_value
-                else:
-                    lower_limit[-1] = x_bins[x + 1]
-
-    return lower_limit, upper_limit, x_values
+    x_bins = np.asarray(x_bins)
+    # This point lies in the acceptance interval
+    accepted = np.asarray(acceptance_intervals) == 1
+    number_bins_x = accepted.shape[1]
+
+    has_interval = accepted.any(axis=1)
+    index_first = np.argmax(accepted, axis=1)
+    index_last = number_bins_x - 1 - np.argmax(accepted[:, ::-1], axis=1)
+
+    # Upper limit is first point where this condition is true
+    upper_limit = np.where(has_interval, x_bins[index_first], -1)
+    # Lower limit is first point after this condition is not true
+    index_after = np.minimum(index_last + 1, number_bins_x - 1)
+    lower_limit = np.where(has_interval, x_bins[index_after], -1)
+
+    x_values = [list(x_bins[row]) for row in accepted]
+
+    return lower_limit.tolist(), upper_limit.tolist(), x_values
 
 
 def fc_fix_limits(lower_limit, upper_limit):
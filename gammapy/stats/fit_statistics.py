@@ -215,7 +215,7 @@ def get_wstat_gof_terms(n_on, n_off):
 
     see :ref:`wstat`.
     """
-    term = np.zeros(len(n_on))
+    term = np.zeros(np.shape(n_on))
 
     # suppress zero division warnings, they are corrected below
     with np.errstate(divide="ignore", invalid="ignore"):
@@ -593,64 +593,130 @@ def _excess_matching_significance_on_off_simple(n_off, alpha, significance):
     return n_on - background(n_off, alpha)
 
 
-# This is mostly a copy & paste from _excess_matching_significance_on_off_lima
-# TODO: simplify this, or avoid code duplication?
-# Looking at the formula for significance_lima_on_off, I don't think
-# it can be analytically inverted because the n_on appears inside and outside the log
-# So probably root finding is still needed here.
+# The Li & Ma formula can't be analytically inverted, because n_on appears
+# inside and outside the log, so the root is found numerically. The
+# significance is an increasing function of n_on, so the root is unique and
+# is found for all elements at once (see `_solve_increasing`).
 def _excess_matching_significance_lima(mu_bkg, significance):
-    from scipy.optimize import fsolve
+    mu_bkg, significance = np.broadcast_arrays(mu_bkg, significance)
+    shape = mu_bkg.shape
+    mu_bkg, significance = mu_bkg.ravel(), significance.ravel()
 
-    # Significance not well-defined for n_on < 0
-    # Return Nan if given significance can't be reached
-    s0 = _significance_lima(n_on=1e-5, mu_bkg=mu_bkg)
-    if s0 >= significance:
-        return np.nan
-
-    def target_significance(n_on):
-        if n_on >= 0:
-            return _significance_lima(n_on, mu_bkg) - significance
-        else:
-            # This high value is to tell the optimiser to stay n_on >= 0
-            return 1e10
+    def func(n_on, idx):
+        mu = mu_bkg[idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stat = _significance_lima(n_on, mu)
+            derivative = np.log(n_on / mu) / stat
+        return stat, derivative
 
     excess_guess = _excess_matching_significance_simple(mu_bkg, significance)
-    n_on_guess = excess_guess + mu_bkg
-
-    # solver options to control robustness / accuracy / speed
-    opts = dict(factor=0.1)
-    n_on = fsolve(target_significance, n_on_guess, **opts)
-    return n_on - mu_bkg
+    n_on = _solve_increasing(func, significance, excess_guess + mu_bkg)
+    return (n_on - mu_bkg).reshape(shape)
 
 
 def _excess_matching_significance_on_off_lima(n_off, alpha, significance):
-    from scipy.optimize import fsolve
-
-    # Significance not well-defined for n_on < 0
-    # Return Nan if given significance can't be reached
-    s0 = _significance_lima_on_off(n_on=1e-5, n_off=n_off, alpha=alpha)
-    if s0 >= significance:
-        return np.nan
-
-    def target_significance(n_on):
-        if n_on >= 0:
-            return _significance_lima_on_off(n_on, n_off, alpha) - significance
-        else:
-            # This high value is to tell the optimiser to stay n_on >= 0
-            return 1e10
+    n_off, alpha, significance = np.broadcast_arrays(n_off, alpha, significance)
+    shape = n_off.shape
+    n_off, alpha, significance = n_off.ravel(), alpha.ravel(), significance.ravel()
+
+    from scipy.special import xlogy
+
+    def func(n_on, idx):
+        # Same as `_significance_lima_on_off`, but with the n_off * log(n_off)
+        # term taken as zero for n_off = 0 (no background counts)
+        n_off_, alpha_ = n_off[idx], alpha[idx]
+        sign = np.sign(excess(n_on, n_off_, alpha_))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tt = (alpha_ + 1) / (n_on + n_off_)
+            ll = n_on * np.log(n_on * tt / alpha_)
+            mm = xlogy(n_off_, n_off_ * tt)
+            stat = sign * np.sqrt(np.abs(2 * (ll + mm)))
+            derivative = np.log(n_on * tt / alpha_) / stat
+        return stat, derivative
 
     excess_guess = _excess_matching_significance_on_off_simple(
         n_off, alpha, significance
     )
-    n_on_guess = excess_guess + background(n_off, alpha)
+    mu_bkg = background(n_off, alpha)
+    n_on = _solve_increasing(func, significance, excess_guess + mu_bkg)
+    return (n_on - mu_bkg).reshape(shape)
 
-    # solver options to control robustness / accuracy / speed
-    opts = dict(factor=0.1)
-    n_on = fsolve(target_significance, n_on_guess, **opts)
-    return n_on - background(n_off, alpha)
 
+def _solve_increasing(func, target, guess, lower=1e-5, rtol=1e-12, max_iter=200):
+    """Solve ``func(x) = target`` for an increasing function, element-wise.
 
-_excess_matching_significance_lima = np.vectorize(_excess_matching_significance_lima)
-_excess_matching_significance_on_off_lima = np.vectorize(
-    _excess_matching_significance_on_off_lima
-)
+    Newton iterations are used within a bracket of the root, with a
+    bisection step whenever the Newton step leaves the bracket. All
+    elements are iterated at once, converged elements are dropped.
+
+    Parameters
+    ----------
+    func : callable
+        Function ``func(x, idx)`` returning the function value and its
+        derivative at ``x`` for the elements ``idx``
+    target : `~numpy.ndarray`
+        Target function values, 1-dim
+    guess : `~numpy.ndarray`
+        Start values
+    lower : float
+        Lower bound of ``x``. NaN is returned if the function value at
+        ``lower`` is already larger than or equal to ``target``.
+    rtol : float
+        Relative tolerance of ``x``
+    max_iter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    x : `~numpy.ndarray`
+        Solution
+    """
+    idx = np.arange(len(target))
+    x_lo = np.full(len(target), lower, dtype=np.float64)
+    result = np.full(len(target), np.nan)
+
+    # Keep only the elements for which the target can be reached
+    with np.errstate(invalid="ignore"):
+        idx = idx[(func(x_lo, idx)[0] < target) & np.isfinite(target)]
+
+    # Move the upper bracket bound up until the target is exceeded
+    x = np.nan_to_num(np.asarray(guess, dtype=np.float64))
+    x_hi = np.maximum(x, 2 * lower)
+    active = idx
+    for _ in range(max_iter):
+        f_hi = func(x_hi[active], active)[0]
+        active = active[f_hi < target[active]]
+        if len(active) == 0:
+            break
+        x_lo[active] = x_hi[active]
+        x_hi[active] *= 2
+
+    x = np.where((x > x_lo) & (x <= x_hi), x, 0.5 * (x_lo + x_hi))
+
+    active = idx
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        x_active = x[active]
+        value, derivative = func(x_active, active)
+        diff = value - target[active]
+
+        below = diff < 0
+        x_lo[active[below]] = x_active[below]
+        x_hi[active[~below]] = x_active[~below]
+        lo, hi = x_lo[active], x_hi[active]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_new = x_active - diff / derivative
+            bisect = ~((x_new >= lo) & (x_new <= hi))
+        x_new[bisect] = 0.5 * (lo[bisect] + hi[bisect])
+        x_new[diff == 0] = x_active[diff == 0]
+
+        done = (diff == 0) | (np.abs(x_new - x_active) <= rtol * x_active)
+        done |= hi - lo <= rtol * hi
+        x[active] = x_new
+        result[active[done]] = x_new[done]
+        active = active[~done]
+
+    result[active] = x[active]
+    return result
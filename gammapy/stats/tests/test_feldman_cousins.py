@@ -8,6 +8,7 @@ from ...stats import (
     fc_find_acceptance_interval_gauss,
     fc_find_acceptance_interval_poisson,
     fc_construct_acceptance_intervals_pdfs,
+    fc_construct_acceptance_intervals_poisson,
     fc_get_limits,
     fc_fix_limits,
     fc_find_limit,
@@ -117,6 +118,40 @@ def test_numerical_confidence_interval_pdfs():
     assert_allclose(average_upper_limit, 4.42, atol=0.1)
 
 
+@requires_dependency("scipy")
+def test_acceptance_intervals_poisson_cache(tmpdir):
+    from scipy import stats
+
+    x_bins = np.arange(0, 50)
+    mu_bins = np.linspace(0, 15, 301)
+    matrix = [stats.poisson(mu + 3.0).pmf(x_bins) for mu in mu_bins]
+    desired = fc_construct_acceptance_intervals_pdfs(matrix, 0.9)
+
+    actual = fc_construct_acceptance_intervals_poisson(
+        mu_bins, 3.0, x_bins, 0.9, cache_dir=str(tmpdir)
+    )
+    assert_allclose(actual, desired)
+    assert len(tmpdir.listdir()) == 1
+
+    # The second call reads the belt from disk
+    actual = fc_construct_acceptance_intervals_poisson(
+        mu_bins, 3.0, x_bins, 0.9, cache_dir=str(tmpdir)
+    )
+    assert_allclose(actual, desired)
+    assert len(tmpdir.listdir()) == 1
+
+    fc_construct_acceptance_intervals_poisson(
+        mu_bins, 2.0, x_bins, 0.9, cache_dir=str(tmpdir)
+    )
+    assert len(tmpdir.listdir()) == 2
+
+    lower_limit, upper_limit, x_values = fc_get_limits(mu_bins, x_bins, actual)
+    # Acceptance interval for mu = 5
+    assert_allclose(upper_limit[100], 4)
+    assert_allclose(lower_limit[100], 14)
+    assert_allclose(x_values[100], np.arange(4, 14))
+
+
 @requires_dependency("scipy")
 def test_numerical_confidence_interval_values():
     from scipy import stats
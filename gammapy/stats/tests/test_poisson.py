@@ -153,6 +153,23 @@ def test_excess_matching_significance_on_off():
     )
     assert_allclose(excess, [[9.82966, 12.038423], [9.82966, 12.038423]], atol=1e-3)
 
+    # Broadcasting, with reachable and unreachable significances
+    excess = excess_matching_significance_on_off(
+        n_off=[1e-2, 10, 1e5], alpha=[[0.1], [2]], significance=[[5], [-2]]
+    )
+    assert excess.shape == (2, 3)
+    assert_allclose(excess[0], [5.241796, 9.82966, 529.391747], rtol=1e-6)
+    assert np.isnan(excess[1, 0])
+    n_on = excess[1, 1:] + background([10, 1e5], 2)
+    s = significance_on_off(n_on, [10, 1e5], 2, method="lima")
+    assert_allclose(s, -2, rtol=1e-8)
+
+    # Zero background: S ** 2 = 2 * n_on * ln((1 + alpha) / alpha)
+    excess = excess_matching_significance_on_off(
+        n_off=[0, 0, 10], alpha=[0.2, 0.5, 0.1], significance=5
+    )
+    assert_allclose(excess, [6.976383, 11.378, 9.82966], rtol=1e-5)
+
 
 @pytest.mark.parametrize("p", TEST_CASES)
 def test_excess_matching_significance_on_off_roundtrip(p):
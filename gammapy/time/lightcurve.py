@@ -7,6 +7,7 @@ from astropy.table import Table
 from astropy.time import Time
 from ..spectrum.utils import CountsPredictor
 from ..stats.poisson import excess_error, excess_ul_helene
+from ..utils.cache import LRUCache
 from ..utils.scripts import make_path
 from ..stats.poisson import significance_on_off
 
@@ -347,6 +348,73 @@ class LightCurve(object):
         return x, (xn, xp)
 
 
+class _EventTimeIndex(object):
+    """Time-sorted ON and OFF event times of a list of observations.
+
+    Helper class for `LightCurveEstimator`, so that the events of a time
+    interval are found with a binary search instead of filtering the event
+    lists for every interval.
+
+    Parameters
+    ----------
+    on_times, off_times : list of `~numpy.ndarray`
+        ON and OFF event times (MJD, TT) for each observation
+    obs_start, obs_stop : `~numpy.ndarray`
+        Observation start and stop times (MJD, TT)
+    """
+
+    def __init__(self, on_times, off_times, obs_start, obs_stop):
+        self.on_times = [np.sort(_) for _ in on_times]
+        self.off_times = [np.sort(_) for _ in off_times]
+        self.obs_start = np.asarray(obs_start, dtype=np.float64)
+        self.obs_stop = np.asarray(obs_stop, dtype=np.float64)
+
+        # observations sorted by start time, with the running maximum of
+        # the stop times to bound the observations overlapping a time
+        self._order = np.argsort(self.obs_start, kind="mergesort")
+        self._start_sorted = self.obs_start[self._order]
+        self._stop_max = np.maximum.accumulate(self.obs_stop[self._order])
+
+    def select_observations(self, tmin, tmax):
+        """Indices of the observations overlapping a time interval.
+
+        Parameters
+        ----------
+        tmin, tmax : float
+            Time interval (MJD, TT)
+
+        Returns
+        -------
+        idx : `~numpy.ndarray`
+            Sorted observation indices
+        """
+        lo = np.searchsorted(self._stop_max, tmin, side="left")
+        hi = np.searchsorted(self._start_sorted, max(tmin, tmax), side="right")
+        idx = self._order[lo:hi]
+        return np.sort(idx[self.obs_stop[idx] >= tmin])
+
+    def counts(self, t_index, tmin, tmax):
+        """Number of ON and OFF events of an observation in ``[tmin, tmax)``.
+
+        Parameters
+        ----------
+        t_index : int
+            Observation index
+        tmin, tmax : float
+            Time interval (MJD, TT)
+
+        Returns
+        -------
+        n_on, n_off : int
+            Number of ON and OFF events
+        """
+        counts = []
+        for times in [self.on_times[t_index], self.off_times[t_index]]:
+            lo, hi = np.searchsorted(times, [tmin, tmax], side="left")
+            counts.append(int(max(hi - lo, 0)))
+        return tuple(counts)
+
+
 class LightCurveEstimator(object):
     """Light curve estimator.
 
@@ -363,6 +431,8 @@ class LightCurveEstimator(object):
         self.obs_spec = spec_extract.observations
         self.off_evt_list = self._get_off_evt_list(spec_extract)
         self.on_evt_list = self._get_on_evt_list(spec_extract)
+        self._obs_times = None
+        self._event_index_cache = LRUCache(maxsize=4)
 
     @staticmethod
     def _get_off_evt_list(spec_extract):
@@ -385,6 +455,67 @@ class LightCurveEstimator(object):
 
         return on_evt_list
 
+    def _get_obs_times(self):
+        """Observation start and stop times and dead time fractions.
+
+        The event lists are only read once to get them.
+
+        Returns
+        -------
+        obs_times : list of tuple
+            ``(time_start, time_stop, deadtime)`` for each observation
+        """
+        if self._obs_times is None:
+            self._obs_times = []
+            for obs in self.obs_list:
+                events = obs.events
+                self._obs_times.append(
+                    (
+                        events.observation_time_start,
+                        events.observation_time_end,
+                        obs.observation_dead_time_fraction,
+                    )
+                )
+        return self._obs_times
+
+    def _event_index(self, energy_range=None):
+        """Time index of the ON and OFF events, filtered in energy.
+
+        The index is computed once for every energy range.
+
+        Parameters
+        ----------
+        energy_range : `~astropy.units.Quantity`
+            True energy range to filter the events
+
+        Returns
+        -------
+        index : `_EventTimeIndex`
+            Event time index
+        """
+        if energy_range is None:
+            key = None
+        else:
+            key = tuple(u.Quantity(energy_range).to("TeV").value.tolist())
+
+        def compute():
+            on_times, off_times = [], []
+            for t_index in range(len(self.obs_list)):
+                on, off = self._create_and_filter_onofflists(
+                    t_index=t_index, energy_range=energy_range
+                )
+                on_times.append(on.time.tt.mjd)
+                off_times.append(off.time.tt.mjd)
+            obs_times = self._get_obs_times()
+            return _EventTimeIndex(
+                on_times,
+                off_times,
+                obs_start=[_[0].tt.mjd for _ in obs_times],
+                obs_stop=[_[1].tt.mjd for _ in obs_times],
+            )
+
+        return self._event_index_cache.get_or_compute(key, compute)
+
     @staticmethod
     def make_time_intervals_fixes(time_step, spectrum_extraction):
         """Create time intervals of fixed size.
@@ -482,75 +613,49 @@ class LightCurveEstimator(object):
         return on, off
 
     @staticmethod
-    def _alpha(time_holder, obs_properties, n, istart, i):
+    def _alpha_terms(time, ends, obs_properties, n, istart):
         """ Helper function for make_time_intervals_min_significance
 
+        Sums of the livetime weights entering alpha for the observations
+        ending in an interval.
+
         Parameters
         ----------
-        time_holder : list of float and flag
-            Contains a list of a time and a flag in 2-element arrays
+        time : `~numpy.ndarray`
+            Sorted times of the events and observation markers
+        ends : `~numpy.ndarray`
+            Indices in ``time`` of the observation ends inside the interval
         obs_properties : `~astropy.table.Table`
             Contains the dead time fraction and ratio of the on/off region
         n : int
             First observation to use
         istart : int
             index of the first event of the interval
-        i : int
-            index of the last event of the interval
-        """
 
-        def in_list(item, L):
-            o, j = np.where(L == item)
-            for index in o:
-                yield index
+        Returns
+        -------
+        xm1 : int
+            Index of the start time of the last observation
+        time_sum, alpha_sum : float
+            Livetime and ``A_off`` weighted livetime of the ended observations
+        """
+        deadtime = obs_properties["deadtime"]
+        a_off = obs_properties["A_off"]
 
-        alpha = 0
-        tmp = 0
-        time = 0
+        alpha_sum = 0
+        time_sum = 0
         xm1 = istart
-        # loop over observations
-        for x in in_list("end", time_holder[istart : i + 1]):
+        # loop over observations, the observation ends are indexed
+        # relative to the interval start
+        for tmp, x in enumerate(ends - istart):
             if tmp == 0:
-                alpha += (
-                    (1 - obs_properties["deadtime"][n])
-                    * (
-                        float(time_holder[x][0])
-                        - (float(time_holder[xm1][0]) + float(time_holder[xm1 - 1][0]))
-                        / 2
-                    )
-                    * obs_properties["A_off"][n + tmp]
-                )
-                time += (1 - obs_properties["deadtime"][n]) * (
-                    float(time_holder[x][0])
-                    - (float(time_holder[xm1][0]) + float(time_holder[xm1 - 1][0])) / 2
-                )
-                xm1 = x + 1
-                tmp += 1
+                weight = (1 - deadtime[n]) * (time[x] - (time[xm1] + time[xm1 - 1]) / 2)
             else:
-                alpha += (
-                    (1 - obs_properties["deadtime"][n + tmp])
-                    * (float(time_holder[x][0]) - float(time_holder[xm1][0]))
-                    * obs_properties["A_off"][n + tmp]
-                )
-                time += (1 - obs_properties["deadtime"][n + tmp]) * (
-                    float(time_holder[x][0]) - float(time_holder[xm1][0])
-                )
-                xm1 = x + 1
-                tmp += 1
-        alpha += (
-            (1 - obs_properties["deadtime"][n + tmp])
-            * (
-                (float(time_holder[i][0]) + float(time_holder[i][0])) / 2
-                - float(time_holder[xm1][0])
-            )
-            * obs_properties["A_off"][n + tmp]
-        )
-        time += (1 - obs_properties["deadtime"][n + tmp]) * (
-            (float(time_holder[i][0]) + float(time_holder[i][0])) / 2
-            - float(time_holder[xm1][0])
-        )
-        alpha = time / alpha
-        return alpha
+                weight = (1 - deadtime[n + tmp]) * (time[x] - time[xm1])
+            alpha_sum += weight * a_off[n + tmp]
+            time_sum += weight
+            xm1 = x + 1
+        return xm1, time_sum, alpha_sum
 
     def make_time_intervals_min_significance(
         self,
@@ -589,97 +694,138 @@ class LightCurveEstimator(object):
         extract intervals for light curve :
             intervals = list(zip(table['t_start'], table['t_stop']))
         """
-        # The function create a list of time associated with identifiers called time_holder.
-        # The identifiers can be 'on' for the on events, 'off' for the off events, 'start' for the start of an
-        # observation, 'end for the end of an observation and 'break' for a separator.
-        # The function then loop other all the elements of this list
-
-        time_holder = []
+        # The function creates a sorted array of times associated with
+        # identifiers: ON and OFF for the on and off events, START for the
+        # start of an observation, END for the end of an observation and BREAK
+        # for a separator. Cumulative counts of the identifiers give the
+        # number of events in any interval, and the significance is evaluated
+        # at once for windows of events between two observation markers.
+        ON, OFF, START, END, BREAK = range(5)
+        times = []
+        kinds = []
         obs_properties = []
-        n_obs = 0
 
         # extract the separators
         if separators is not None:
-            for time in separators:
-                time_holder.append([time.tt.mjd, "break"])
+            times.append([time.tt.mjd for time in separators])
+            kinds.append(np.full(len(separators), BREAK))
 
         # recovers the starting and ending time of each observations and useful properties
-        for obs in spectrum_extraction.obs_list:
-            time_holder.append([obs.events.observation_time_start.tt.mjd, "start"])
-            time_holder.append([obs.events.observation_time_end.tt.mjd, "end"])
+        for n_obs, obs in enumerate(spectrum_extraction.obs_list):
+            times.append(
+                [
+                    obs.events.observation_time_start.tt.mjd,
+                    obs.events.observation_time_end.tt.mjd,
+                ]
+            )
+            kinds.append([START, END])
             obs_properties.append(
                 dict(
                     deadtime=obs.observation_dead_time_fraction,
                     A_off=spectrum_extraction.bkg_estimate[n_obs].a_off,
                 )
             )
-            n_obs += 1
         obs_properties = Table(rows=obs_properties)
 
-        # prepare the on and off photon list as in the flux point computation -> should be updated accordingly
-        for t_index, obs in enumerate(self.obs_list):
-            on, off = self._create_and_filter_onofflists(
-                t_index=t_index, energy_range=energy_range
-            )
-
-            for time in on.time.tt.mjd:
-                time_holder.append([time, "on"])
-            for time in off.time.tt.mjd:
-                time_holder.append([time, "off"])
-
-        # sort all elements in the table by time
-        time_holder = sorted(time_holder, key=lambda item: item[0])
-        time_holder = np.asarray(time_holder)
+        # prepare the on and off photon list as in the flux point computation
+        index = self._event_index(energy_range)
+        for on, off in zip(index.on_times, index.off_times):
+            for events, kind in [(on, ON), (off, OFF)]:
+                times.append(events)
+                kinds.append(np.full(len(events), kind))
+
+        # sort all elements by time, keeping the above order for equal times
+        time = np.concatenate([np.asarray(_, dtype=np.float64) for _ in times])
+        kind = np.concatenate([np.asarray(_, dtype=int) for _ in kinds])
+        order = np.argsort(time, kind="mergesort")
+        time, kind = time[order], kind[order]
+
+        is_event = (kind == ON) | (kind == OFF)
+        cum_on = np.append(0, np.cumsum(kind == ON))
+        cum_off = np.append(0, np.cumsum(kind == OFF))
+        cum_end = np.append(0, np.cumsum(kind == END))
+        idx_end = np.where(kind == END)[0]
+        # first marker at or after each index
+        idx_marker = np.append(np.where(~is_event)[0], len(time))
+        time_last = time[-1]
+        idx_last = np.searchsorted(time, time_last)
 
         rows = []
         istart = 1
         i = 1
         n = 0
-        while time_holder[i][0] < time_holder[-1][0]:
+        while time[i] < time_last:
             i += 1
-            if time_holder[i][1] == "break":
-                while time_holder[i + 1][1] != "on" and time_holder[i + 1][1] != "off":
+            if kind[i] == BREAK:
+                while not is_event[i + 1]:
                     i += 1
-                n += np.sum(time_holder[istart:i] == "end")
+                n += cum_end[i] - cum_end[istart]
                 istart = i
                 continue
-            if time_holder[i][1] != "on" and time_holder[i][1] != "off":
+            if not is_event[i]:
                 continue
 
-            # compute alpha
-            alpha = self._alpha(time_holder, obs_properties, n, istart, i)
-
-            non = np.sum(time_holder[istart : i + 1] == "on")
-            noff = np.sum(time_holder[istart : i + 1] == "off")
-
-            # check the significance
-            signif = significance_on_off(non, noff, alpha, method=significance_method)
-            if signif > significance:
-                rows.append(
-                    dict(
-                        t_start=(
-                            float(time_holder[istart - 1][0])
-                            + float(time_holder[istart][0])
-                        )
-                        / 2,
-                        t_stop=(float(time_holder[i][0]) + float(time_holder[i + 1][0]))
-                        / 2,
-                        n_on=non,
-                        n_off=noff,
-                        alpha=alpha,
-                        significance=signif,
-                    )
+            # all events up to the next observation marker share the
+            # observations entering alpha
+            stop = idx_marker[np.searchsorted(idx_marker, i)]
+            stop = min(stop, max(idx_last, i) + 1)
+
+            # alpha terms of the ended observations
+            ends = idx_end[
+                np.searchsorted(idx_end, istart) : np.searchsorted(idx_end, i)
+            ]
+            xm1, time_sum, alpha_sum = self._alpha_terms(
+                time, ends, obs_properties, n, istart
+            )
+            n_last = n + len(ends)
+            deadtime = obs_properties["deadtime"][n_last]
+            a_off = obs_properties["A_off"][n_last]
+
+            # check the significance in windows of doubling size, so that
+            # finding an interval costs about twice its number of events,
+            # however many events are left until the next marker
+            start, width, idx = i, 64, None
+            while start < stop:
+                window = np.arange(start, min(start + width, stop))
+                weight = (1 - deadtime) * (time[window] - time[xm1])
+                alpha = (time_sum + weight) / (alpha_sum + weight * a_off)
+
+                non = cum_on[window + 1] - cum_on[istart]
+                noff = cum_off[window + 1] - cum_off[istart]
+
+                signif = significance_on_off(
+                    non, noff, alpha, method=significance_method
                 )
-                # start the next interval
-                while (
-                    time_holder[i + 1][0] < time_holder[-1][0]
-                    and time_holder[i + 1][1] != "on"
-                    and time_holder[i + 1][1] != "off"
-                ):
-                    i += 1
-                n += np.sum(time_holder[istart : i + 1] == "end")
-                istart = i + 1
-                i = istart
+                with np.errstate(invalid="ignore"):
+                    above = np.where(signif > significance)[0]
+                if len(above) > 0:
+                    idx = window
+                    break
+                start += width
+                width *= 2
+
+            if idx is None:
+                i = stop - 1
+                continue
+
+            j = above[0]
+            i = idx[j]
+            rows.append(
+                dict(
+                    t_start=(time[istart - 1] + time[istart]) / 2,
+                    t_stop=(time[i] + time[i + 1]) / 2,
+                    n_on=non[j],
+                    n_off=noff[j],
+                    alpha=alpha[j],
+                    significance=signif[j],
+                )
+            )
+            # start the next interval
+            while time[i + 1] < time_last and not is_event[i + 1]:
+                i += 1
+            n += cum_end[i + 1] - cum_end[istart]
+            istart = i + 1
+            i = istart
         table = Table(rows=rows)
         table["t_start"] = Time(table["t_start"], format="mjd", scale="tt")
         table["t_stop"] = Time(table["t_stop"], format="mjd", scale="tt")
@@ -775,24 +921,17 @@ class LightCurveEstimator(object):
         n_off = 0
         useinterval = False
 
-        # Loop on observations
-        for t_index, obs in enumerate(self.obs_list):
+        index = self._event_index(energy_range)
+        tmin_mjd, tmax_mjd = Time(tmin).tt.mjd, Time(tmax).tt.mjd
 
-            # discard observations not matching the time interval
-            obs_start = obs.events.observation_time_start
-            obs_stop = obs.events.observation_time_end
-            if (tmin < obs_start and tmax < obs_start) or (tmin > obs_stop):
-                continue
+        # Loop on observations matching the time interval
+        for t_index in index.select_observations(tmin_mjd, tmax_mjd):
+            obs_start, obs_stop, deadtime = self._get_obs_times()[t_index]
             useinterval = True
-            # get ON and OFF evt list
-            on, off, spec, e_reco = self._create_and_filter_onofflists(
-                t_index=t_index,
-                energy_range=energy_range,
-                interval=[tmin, tmax],
-                extra=True,
-            )
-            n_on_obs = len(on.table)
-            n_off_obs = len(off.table)
+            # count ON and OFF events
+            n_on_obs, n_off_obs = index.counts(t_index, tmin_mjd, tmax_mjd)
+            spec = self.obs_spec[t_index]
+            e_reco = spec.e_reco
 
             # compute effective livetime (for the interval)
             if tmin >= obs_start and tmax <= obs_stop:
@@ -811,7 +950,7 @@ class LightCurveEstimator(object):
                 livetime_to_add = 0 * u.s
 
             # Take into account dead time
-            livetime_to_add *= 1. - obs.observation_dead_time_fraction
+            livetime_to_add *= 1. - deadtime
 
             # Compute excess
             obs_measured_excess = n_on_obs - spec.alpha * n_off_obs
@@ -17,7 +17,7 @@ from ...data import DataStore
 from ...spectrum import SpectrumExtraction
 from ...spectrum.models import PowerLaw
 from ...background import ReflectedRegionsBackgroundEstimator
-from ..lightcurve import LightCurve, LightCurveEstimator
+from ..lightcurve import LightCurve, LightCurveEstimator, _EventTimeIndex
 
 
 # time time_min time_max flux flux_err flux_ul
@@ -247,6 +247,24 @@ def test_lightcurve_estimator():
     # TODO: add asserts on all measured quantities
 
 
+def test_event_time_index():
+    on_times = [[3.5, 1.5, 2.5], [11, 12], [5.5]]
+    off_times = [[1.2, 1.8, 3.2, 3.9], [10.5], [5.1, 5.9]]
+    index = _EventTimeIndex(
+        on_times, off_times, obs_start=[1, 10, 4], obs_stop=[4, 13, 6]
+    )
+
+    assert_allclose(index.select_observations(0, 0.5), [])
+    assert_allclose(index.select_observations(0, 1), [0])
+    assert_allclose(index.select_observations(3, 5), [0, 2])
+    assert_allclose(index.select_observations(5, 20), [1, 2])
+    assert_allclose(index.select_observations(7, 8), [])
+
+    assert index.counts(0, 1.5, 3.5) == (2, 2)
+    assert index.counts(1, 0, 100) == (2, 1)
+    assert index.counts(2, 5.5, 5.9) == (1, 0)
+
+
 @requires_data("gammapy-extra")
 @requires_dependency("scipy")
 def test_lightcurve_interval_maker():
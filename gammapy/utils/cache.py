@@ -0,0 +1,190 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Bounded in-memory cache with optional persistence on disk."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from .scripts import make_path
+
+__all__ = ["LRUCache"]
+
+log = logging.getLogger(__name__)
+
+
+class LRUCache(object):
+    """Least-recently-used cache, optionally persisted on disk.
+
+    At most ``maxsize`` entries are kept in memory; when the cache is full
+    the least recently used entry is dropped. If ``cache_dir`` is set, every
+    entry is additionally pickled to a file in that directory, and entries
+    missing in memory are looked up there, so that they can be shared across
+    processes and sessions.
+
+    Keys must be hashable and have a ``repr`` that is stable across
+    sessions (e.g. tuples of strings and numbers), because the file name of
+    a persisted entry is derived from it.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries held in memory.
+    cache_dir : str or `~gammapy.extern.pathlib.Path`, optional
+        Directory used to persist entries.
+
+    Examples
+    --------
+    >>> from gammapy.utils.cache import LRUCache
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.get_or_compute(("spam", 1), lambda: 42)
+    42
+    >>> ("spam", 1) in cache
+    True
+    """
+
+    def __init__(self, maxsize=128, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "{}(maxsize={!r}, cache_dir={!r}, size={})".format(
+            self.__class__.__name__, self.maxsize, self.cache_dir, len(self)
+        )
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        if key in self._data:
+            return True
+        filename = self._filename(key)
+        return filename is not None and filename.is_file()
+
+    @property
+    def cache_dir(self):
+        """Directory used to persist entries (`~gammapy.extern.pathlib.Path` or None)."""
+        return self._cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, val):
+        self._cache_dir = None if val is None else make_path(val)
+
+    def _filename(self, key):
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.cache_dir / (digest + ".pkl")
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._data:
+                value = self._data.pop(key)
+                self._data[key] = value
+                return value
+
+        filename = self._filename(key)
+        if filename is None or not filename.is_file():
+            raise KeyError(key)
+
+        log.debug("Reading cache entry {}".format(filename))
+        with filename.open("rb") as fh:
+            value = pickle.load(fh)
+
+        self._store(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._store(key, value)
+
+        filename = self._filename(key)
+        if filename is not None:
+            self._write(filename, value)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    @staticmethod
+    def _write(filename, value):
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written entry
+        fd, tmpname = tempfile.mkstemp(dir=str(filename.parent), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(tmpname, str(filename))
+        log.debug("Wrote cache entry {}".format(filename))
+
+    def get(self, key, default=None):
+        """Get cached value or ``default`` if ``key`` is not cached."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_or_compute(self, key, func):
+        """Get cached value, or compute and cache it with ``func()``.
+
+        Parameters
+        ----------
+        key : hashable
+            Cache key.
+        func : callable
+            Function without arguments computing the value.
+
+        Returns
+        -------
+        value : object
+            Cached or computed value.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            value = func()
+            self[key] = value
+            return value
+
+    def items(self):
+        """Entries held in memory, as a list of ``(key, value)`` pairs."""
+        with self._lock:
+            return list(self._data.items())
+
+    def update(self, other):
+        """Add the entries held in memory by another cache.
+
+        This is used to collect the entries computed on copies of a cache,
+        e.g. in worker processes. The entries are not written to disk,
+        because the other cache already did that.
+
+        Parameters
+        ----------
+        other : `LRUCache` or dict
+            Other cache, or dict of entries
+        """
+        for key, value in list(other.items()):
+            self._store(key, value)
+
+    def clear(self):
+        """Remove all entries held in memory.
+
+        Entries persisted on disk are kept.
+        """
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,89 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Utilities to run computations in a process pool."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import contextlib
+import logging
+from multiprocessing import Pool
+
+__all__ = ["run_multiprocessing"]
+
+log = logging.getLogger(__name__)
+
+
+class _RecordingHandler(logging.Handler):
+    """Logging handler keeping the (picklable) records."""
+
+    def __init__(self):
+        super(_RecordingHandler, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg, record.args = record.getMessage(), None
+        self.records.append(record)
+
+
+class _RecordingFunction(object):
+    """Call a function in a worker process, recording the log records.
+
+    The log records are returned instead of emitted, so that the main
+    process can emit them in the order of the inputs.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, args):
+        root = logging.getLogger()
+        handler = _RecordingHandler()
+        handlers, root.handlers = root.handlers, [handler]
+        try:
+            return self.func(args), handler.records
+        finally:
+            root.handlers = handlers
+
+
+def run_multiprocessing(func, inputs, n_jobs=None):
+    """Apply a function to each input, using a process pool.
+
+    The results are returned in the order of the inputs. Log records
+    emitted by ``func`` in the worker processes are emitted again in the
+    main process, also in the order of the inputs.
+
+    If ``n_jobs`` is 1, ``func`` is called in the main process.
+
+    Parameters
+    ----------
+    func : callable
+        Function called with one input as argument. It has to be picklable,
+        e.g. a function defined at module level.
+    inputs : list
+        Function inputs
+    n_jobs : int, optional
+        Number of processes. If None, one process per CPU is used.
+
+    Returns
+    -------
+    results : list
+        Function results
+
+    Examples
+    --------
+    >>> from gammapy.utils.parallel import run_multiprocessing
+    >>> run_multiprocessing(abs, [-1, 2, -3], n_jobs=2)
+    [1, 2, 3]
+    """
+    inputs = list(inputs)
+    if n_jobs == 1:
+        return [func(_) for _ in inputs]
+
+    with contextlib.closing(Pool(processes=n_jobs)) as pool:
+        results = pool.map(_RecordingFunction(func), inputs)
+
+    for _, records in results:
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+
+    return [result for result, _ in results]
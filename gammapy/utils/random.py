@@ -10,6 +10,7 @@ __all__ = [
     "sample_sphere",
     "sample_sphere_distance",
     "sample_powerlaw",
+    "sample_poisson",
 ]
 
 
@@ -181,3 +182,64 @@ def sample_sphere_distance(
     distance = ((u - b) / a) ** (1. / 3)
 
     return distance
+
+
+def sample_poisson(mu, size, random_state="random-seed", chunk_size=10000, n_jobs=1):
+    """Sample many realisations of Poisson distributed counts.
+
+    The realisations are drawn in chunks of ``chunk_size``, each chunk with
+    its own random number generator, seeded with the key ``(seed, index)``
+    where ``seed`` is derived from ``random_state`` and ``index`` is the
+    chunk index. The chunks can therefore be drawn in parallel, and the
+    result only depends on ``random_state`` and ``chunk_size``, not on
+    ``n_jobs``.
+
+    Parameters
+    ----------
+    mu : array_like
+        Expectation value, e.g. predicted counts in each bin or map data
+    size : int
+        Number of realisations
+    random_state : {int, 'random-seed', 'global-rng', `~numpy.random.RandomState`}
+        Defines random number generator initialisation.
+        Passed to `~gammapy.utils.random.get_random_state`.
+    chunk_size : int
+        Number of realisations drawn with one random number generator
+    n_jobs : int
+        Number of processes (see `~gammapy.utils.parallel.run_multiprocessing`).
+
+    Returns
+    -------
+    counts : `~numpy.ndarray`
+        Counts, with shape ``(size,) + mu.shape``
+
+    Examples
+    --------
+    >>> from gammapy.utils.random import sample_poisson
+    >>> counts = sample_poisson([1, 10, 100], size=1000, random_state=0)
+    >>> counts.shape
+    (1000, 3)
+    """
+    from .parallel import run_multiprocessing
+
+    mu = np.asarray(mu, dtype=np.float64)
+    if isinstance(random_state, (numbers.Integral, np.integer)):
+        seed = int(random_state)
+    else:
+        seed = get_random_state(random_state).randint(np.iinfo(np.int32).max)
+
+    tasks = []
+    for index, start in enumerate(range(0, size, chunk_size)):
+        tasks.append((mu, seed, index, min(chunk_size, size - start)))
+
+    chunks = run_multiprocessing(_sample_poisson_chunk, tasks, n_jobs)
+    if len(chunks) == 0:
+        return np.zeros((0,) + mu.shape, dtype=int)
+    return np.concatenate(chunks)
+
+
+def _sample_poisson_chunk(args):
+    """Sample one chunk of realisations, see `sample_poisson`."""
+    mu, seed, index, size = args
+    random_state = np.random.RandomState([seed, index])
+    return random_state.poisson(mu, (size,) + mu.shape)
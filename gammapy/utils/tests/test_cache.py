@@ -0,0 +1,48 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ..cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+
+    # "b" is the least recently used entry now
+    cache["c"] = 3
+    assert len(cache) == 2
+    assert "b" not in cache
+    assert "a" in cache
+
+    with pytest.raises(KeyError):
+        cache["b"]
+
+    assert cache.get("b") is None
+    assert cache.get_or_compute("b", lambda: 42) == 42
+    assert cache["b"] == 42
+
+    cache_other = LRUCache()
+    cache_other["d"] = 4
+    cache.update(cache_other)
+    assert cache["d"] == 4
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_persistence(tmpdir):
+    cache = LRUCache(maxsize=1, cache_dir=str(tmpdir))
+    cache[("spam", 1.5)] = np.arange(3)
+    cache[("ham", 2)] = np.arange(4)
+    assert len(cache) == 1
+    assert len(tmpdir.listdir()) == 2
+
+    cache_new = LRUCache(cache_dir=str(tmpdir))
+    assert ("spam", 1.5) in cache_new
+    assert_allclose(cache_new[("spam", 1.5)], [0, 1, 2])
+    assert len(cache_new) == 1
@@ -0,0 +1,21 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import logging
+from ..parallel import run_multiprocessing
+
+log = logging.getLogger(__name__)
+
+
+def square(x):
+    log.warning("Computing square of {}".format(x))
+    return x ** 2
+
+
+def test_run_multiprocessing(caplog):
+    inputs = [3, 1, 4, 1, 5]
+    assert run_multiprocessing(square, inputs, n_jobs=1) == [9, 1, 16, 1, 25]
+
+    caplog.clear()
+    assert run_multiprocessing(square, inputs, n_jobs=2) == [9, 1, 16, 1, 25]
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == ["Computing square of {}".format(_) for _ in inputs]
@@ -4,7 +4,12 @@ import numpy as np
 from numpy.testing import assert_allclose
 from astropy.coordinates import Angle
 from ...utils.testing import assert_quantity_allclose
-from ..random import sample_sphere, sample_powerlaw, sample_sphere_distance
+from ..random import (
+    sample_sphere,
+    sample_powerlaw,
+    sample_sphere_distance,
+    sample_poisson,
+)
 
 
 def test_sample_sphere():
@@ -118,3 +123,16 @@ def test_sample_sphere_distance():
     )
     assert x.min() >= 0.1
     assert x.max() <= 42
+
+
+def test_sample_poisson():
+    mu = np.array([0.5, 10, 100])
+    counts = sample_poisson(mu, size=3000, random_state=0, chunk_size=1000)
+    assert counts.shape == (3000, 3)
+    assert_allclose(counts.mean(axis=0), mu, rtol=0.01, atol=0.05)
+
+    # The result doesn't depend on the number of processes
+    counts_parallel = sample_poisson(
+        mu, size=3000, random_state=0, chunk_size=1000, n_jobs=2
+    )
+    assert (counts == counts_parallel).all()